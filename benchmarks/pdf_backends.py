@@ -0,0 +1,224 @@
+"""
+Benchmark for the resume PDF text backends (fast, layout, auto).
+
+For each backend, in a fresh interpreter process, extracts every PDF of a corpus and reports:
+  * pages/sec over the whole corpus
+  * peak RSS of the process, and its growth over the post-import baseline
+  * field-extraction accuracy against ground truth (name, email, phone, skills)
+
+A corpus is a directory of PDFs, each with a `<name>.json` sidecar holding the expected
+fields, e.g. {"name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555 010 0000",
+"skills": ["Python", "SQL"]}. Without --corpus, a synthetic corpus of single-column,
+two-column, word-positioned and out-of-order resumes is generated.
+
+Usage:
+    python benchmarks/pdf_backends.py
+    python benchmarks/pdf_backends.py --corpus path/to/resumes --repeat 3 --output report.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKENDS = ("fast", "layout", "auto")
+FIELDS = ("name", "email", "phone", "skills")
+
+
+# --- Synthetic corpus ---
+
+def _pdf(pages: List[List[Tuple[float, float, str]]]) -> bytes:
+    """Minimal PDF with Helvetica text runs at (x, y); each run is one Tj, in the given order."""
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    page_count = len(pages)
+    font_ref = 3 + 2 * page_count
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [" + " ".join(f"{3 + 2 * i} 0 R" for i in range(page_count)) + f"] /Count {page_count} >>",
+    ]
+    for index, runs in enumerate(pages):
+        content = " ".join(f"BT /F1 10 Tf {x:.1f} {y:.1f} Td ({escape(text)}) Tj ET" for x, y, text in runs)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * index} 0 R "
+            f"/Resources << /Font << /F1 {font_ref} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(f"{offset:010d} 00000 n \n".encode("latin-1") for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+
+_FIRST = ["Jane", "Omar", "Li", "Priya", "Carlos", "Anna", "Kwame", "Sofia"]
+_LAST = ["Doe", "Haddad", "Wei", "Raman", "Ortiz", "Novak", "Mensah", "Rossi"]
+_SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "React", "Go", "Rust", "Terraform", "Spark", "Kafka", "Django", "AWS"]
+_FILLER = ("Designed and shipped services used by millions of customers while mentoring engineers "
+           "and improving reliability across the platform with careful measurement").split()
+
+
+def _resume_lines(rng: random.Random, truth: Dict, pages: int) -> Tuple[List[str], List[str]]:
+    main = [truth["name"], truth["email"], truth["phone"], "", "Experience"]
+    for _ in range(pages * 40):
+        main.append(" ".join(rng.sample(_FILLER, 8)))
+    main += ["", "Education", "BSc Computer Science"]
+    side = ["Skills: " + ", ".join(truth["skills"]), "Projects", "Open source contributor"]
+    return main, side
+
+
+def _layout(rng: random.Random, template: str, main: List[str], side: List[str]) -> List[List[Tuple[float, float, str]]]:
+    pages: List[List[Tuple[float, float, str]]] = [[]]
+    y = 760.0
+    x_main = 50.0 if template != "two_column" else 200.0
+    if template == "two_column":
+        # Sidebar drawn first, down the left edge, then the main column
+        for offset, line in enumerate(side):
+            pages[0].append((40.0, 760.0 - 14 * offset, line))
+    else:
+        main = main[:5] + side + main[5:]
+    for line in main:
+        if y < 50:
+            pages.append([])
+            y = 760.0
+        if template == "word_positioned":
+            # Each word placed on its own, as some generators do: no space characters in the stream
+            x = x_main
+            for word in line.split():
+                pages[-1].append((x, y, word))
+                x += 6.0 * len(word) + 4.0
+        elif line:
+            pages[-1].append((x_main, y, line))
+        y -= 14
+    if template == "out_of_order":
+        for runs in pages:
+            rng.shuffle(runs)
+    return pages
+
+
+def generate_corpus(directory: str, count: int = 40, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    templates = ("single_column", "two_column", "word_positioned", "out_of_order")
+    for index in range(count):
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        truth = {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+            "phone": f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            "skills": rng.sample(_SKILLS, 4),
+        }
+        template = templates[index % len(templates)]
+        main, side = _resume_lines(rng, truth, pages=1 + index % 3)
+        stem = os.path.join(directory, f"{index:03d}-{template}")
+        with open(f"{stem}.pdf", "wb") as f:
+            f.write(_pdf(_layout(rng, template, main, side)))
+        with open(f"{stem}.json", "w", encoding="utf-8") as f:
+            json.dump(truth, f)
+
+
+# --- Measurement (runs in a child process per backend) ---
+
+def _field_matches(field: str, expected, actual) -> bool:
+    if field == "skills":
+        return {s.lower() for s in expected or []} == {s.lower() for s in actual or []}
+    return (expected or "").strip().lower() == (actual or "").strip().lower()
+
+
+def run_worker(backend: str, corpus: str, repeat: int) -> Dict:
+    sys.path.insert(0, PROJECT_ROOT)
+    os.environ["RESUME_CACHE_ENABLED"] = "0"
+    from src.orchestrator.pipeline import ResumeOrchestrator
+
+    orchestrator = ResumeOrchestrator(pdf_backend=backend)
+    paths = sorted(os.path.join(corpus, name) for name in os.listdir(corpus) if name.endswith(".pdf"))
+    baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    pages = 0
+    chosen: Dict[str, int] = {}
+    correct = {field: 0 for field in FIELDS}
+    started = time.perf_counter()
+    for iteration in range(repeat):
+        for path in paths:
+            resume_data = orchestrator.extract_resume_data(path)
+            if iteration:
+                pages += resume_data["pages_read"]
+                continue
+            pages += resume_data["pages_read"]
+            chosen[resume_data["pdf_backend"]] = chosen.get(resume_data["pdf_backend"], 0) + 1
+            truth_path = path[:-4] + ".json"
+            if os.path.exists(truth_path):
+                with open(truth_path, encoding="utf-8") as f:
+                    truth = json.load(f)
+                actual = {**resume_data, "skills": orchestrator.generate_nlp_query(resume_data).get("skills")}
+                for field in FIELDS:
+                    correct[field] += _field_matches(field, truth.get(field), actual.get(field))
+    elapsed = time.perf_counter() - started
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "backend": backend,
+        "documents": len(paths),
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "rss_growth_mb": round((peak_rss_kb - baseline_rss_kb) / 1024, 1),
+        "accuracy": {field: round(correct[field] / len(paths), 3) if paths else None for field in FIELDS},
+        "backends_chosen": chosen,
+    }
+
+
+def measure(backend: str, corpus: str, repeat: int) -> Dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", backend, "--corpus", corpus, "--repeat", str(repeat)],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of PDFs with .json ground-truth sidecars (default: synthetic).")
+    parser.add_argument("--documents", type=int, default=40, help="Size of the synthetic corpus.")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per backend.")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--output", help="Also write the report as JSON to this path.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.corpus, args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="pdf-corpus-") as scratch:
+        corpus = args.corpus
+        if not corpus:
+            corpus = scratch
+            generate_corpus(corpus, args.documents)
+        report = [measure(backend, corpus, args.repeat) for backend in args.backends.split(",")]
+
+    print(f"{'backend':<8} {'pages/s':>9} {'peak MB':>8} {'+MB':>6}  accuracy (name/email/phone/skills)  chosen")
+    for row in report:
+        accuracy = "/".join(f"{row['accuracy'][field]:.2f}" for field in FIELDS)
+        print(f"{row['backend']:<8} {row['pages_per_second']:>9} {row['peak_rss_mb']:>8} {row['rss_growth_mb']:>6}  {accuracy:<35} {row['backends_chosen']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+End-to-end benchmark of the search and resume pipelines, run offline.
+
+Scenarios (each in a fresh interpreter process, so memory numbers don't bleed across):
+  * talent_search     POST /talent_search (NLP parse, then GitHub and LinkedIn concurrently)
+  * github_search     POST /github/search
+  * linkedin_search   POST /linkedin/search
+  * run_github_search the GitHub CLI entry point
+  * resume_batch      ResumeOrchestrator.process_resume_batch over a synthetic PDF corpus
+
+Upstreams (GitHub, Proxycurl, OpenRouter) never go over the network:
+  * --upstream synthetic (default) answers from deterministic generated responses, with a fixed
+    latency per service (HTTP_REPLAY_<SERVICE>_LATENCY_MS, defaults below);
+  * --upstream replay answers from fixtures recorded with HTTP_REPLAY_MODE=record (--fixtures).
+
+Per scenario it reports p50/p95/p99 latency, throughput, upstream calls per returned candidate,
+upstream and response bytes per operation, and peak RSS. The report is written as JSON and
+compared against a stored baseline.
+
+Usage:
+    python benchmarks/pipelines.py                    # report and compare against the baseline
+    python benchmarks/pipelines.py --update-baseline  # record the current numbers as the baseline
+    python benchmarks/pipelines.py --scenarios github_search,resume_batch --iterations 20
+    python benchmarks/pipelines.py --upstream replay --fixtures fixtures/http
+
+Exits with status 1 if a gated metric regressed by more than --tolerance.
+"""
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pdf_backends import generate_corpus
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "pipelines_baseline.json")
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "pipelines_report.json")
+SCENARIOS = ("talent_search", "github_search", "linkedin_search", "run_github_search", "resume_batch")
+SERVICES = ("github", "proxycurl", "openrouter")
+# Synthetic upstream latency per service (ms), unless HTTP_REPLAY_<SERVICE>_LATENCY_MS is set
+SYNTHETIC_LATENCY_MS = {"github": 10, "proxycurl": 25, "openrouter": 100}
+# Gated metrics, and whether a higher value is worse
+GATED_METRICS = {
+    "latency_p50_ms": True,
+    "latency_p95_ms": True,
+    "ops_per_second": False,
+    "upstream_calls_per_candidate": True,
+    "peak_rss_mb": True,
+}
+
+QUERY = "Senior Python engineers in Berlin with Django and PostgreSQL experience"
+PARSED_QUERY = {
+    "intent": "find_candidates",
+    "title": "Backend Engineer",
+    "skills": ["Python", "Django", "PostgreSQL"],
+    "experience_level": "senior",
+    "location": "Berlin",
+    "work_type": "full-time",
+}
+JOB_DESCRIPTION = "Backend engineer: Python, SQL, Docker, Kubernetes and AWS; Kafka or Spark a plus."
+
+
+# --- Synthetic upstreams ---
+
+_REPOS_PER_SEARCH = 12
+_REPOS_PER_USER = 3
+_PEOPLE_PER_PAGE = 5
+_PEOPLE_PAGES = 3
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:8]
+
+
+def _iso_days_ago(days: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - days * 86400))
+
+
+def _repo(owner: str, index: int) -> Dict:
+    return {
+        "name": f"project-{index}",
+        "html_url": f"https://github.com/{owner}/project-{index}",
+        "language": ("Python", "Go", "TypeScript")[index % 3],
+        "stargazers_count": 10 * (index + 1),
+        "forks_count": index,
+        "topics": ["django", "postgresql"] if index % 2 == 0 else ["api"],
+        "description": "Python service for machine learning pipelines",
+        "updated_at": _iso_days_ago(index + 1),
+        "owner": {"login": owner},
+    }
+
+
+def _github(path: str, query: Dict) -> Optional[object]:
+    if path.endswith("/search/repositories"):
+        if int(query.get("page", 1)) > 1:
+            return {"total_count": _REPOS_PER_SEARCH, "items": []}
+        seed = _digest(query.get("q"))
+        # Two repositories per owner, as a repository search typically returns
+        items = [_repo(f"dev-{seed}-{index // 2}", index) for index in range(_REPOS_PER_SEARCH)]
+        return {"total_count": len(items), "incomplete_results": False, "items": items}
+    parts = path.strip("/").split("/")
+    if len(parts) == 3 and parts[0] == "users" and parts[2] == "repos":
+        return [] if int(query.get("page", 1)) > 1 else [_repo(parts[1], index) for index in range(_REPOS_PER_USER)]
+    if len(parts) == 2 and parts[0] == "users":
+        login = parts[1]
+        return {
+            "login": login, "html_url": f"https://github.com/{login}", "name": login.replace("-", " ").title(),
+            "bio": "Python and ML engineer", "location": "Berlin", "public_repos": _REPOS_PER_USER, "followers": 42,
+        }
+    return None
+
+
+# Where every synthetic person lives; the search honours country/city filters against it
+_PEOPLE_LOCATION = {"country": "de", "city": "berlin"}
+
+
+def _proxycurl(url: str, path: str, query: Dict) -> Optional[object]:
+    if path.endswith("/search/people"):
+        if any(query.get(name, value).lower() != value for name, value in _PEOPLE_LOCATION.items()):
+            return {"results": [], "next_page": None, "total_result_count": 0}
+        page = int(query.get("page", 1))
+        seed = _digest(sorted((k, v) for k, v in query.items() if k != "page"))
+        next_page = None
+        if page < _PEOPLE_PAGES:
+            parts = urlsplit(url)
+            next_page = urlunsplit(parts._replace(query=urlencode({**query, "page": page + 1})))
+        return {
+            "results": [
+                {
+                    "linkedin_profile_url": f"https://www.linkedin.com/in/person-{seed}-{page}-{index}",
+                    "full_name": f"Person {seed} {page}-{index}",
+                    "headline": "Senior Backend Engineer",
+                    "location": "Berlin, Germany",
+                }
+                for index in range(_PEOPLE_PER_PAGE)
+            ],
+            "next_page": next_page,
+            "total_result_count": _PEOPLE_PER_PAGE * _PEOPLE_PAGES,
+        }
+    if path.endswith("/linkedin"):
+        slug = query.get("url", "").rstrip("/").rsplit("/", 1)[-1]
+        return {
+            "full_name": slug.replace("-", " ").title(),
+            "headline": "Senior Backend Engineer",
+            "location": "Berlin, Germany",
+            "industry": "Computer Software",
+            "summary": "Builds Python services and data pipelines.",
+            "experiences": [{"title": "Backend Engineer", "company": "Example GmbH", "starts_at": {"year": 2019}}],
+            "education": [{"school": "TU Berlin", "degree_name": "MSc Computer Science"}],
+            "skills": ["Python", "Django", "PostgreSQL", "Docker"],
+            "extra": {"website": f"https://{slug}.dev"} if query.get("extra") == "include" else None,
+        }
+    return None
+
+
+def _openrouter(path: str, body: bytes) -> Optional[object]:
+    if not path.endswith("/chat/completions"):
+        return None
+    model = json.loads(body or b"{}").get("model", "synthetic")
+    return {
+        "id": "gen-synthetic", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(PARSED_QUERY)}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 300, "completion_tokens": 60, "total_tokens": 360},
+    }
+
+
+def synthetic_upstream(service: str):
+    """A ServiceReplay for the service that generates plausible responses instead of reading fixtures."""
+    from src.core.replay import ServiceReplay
+
+    class SyntheticUpstream(ServiceReplay):
+        def load_fixture(self, method: str, url: str, body=None) -> Optional[Dict]:
+            parts = urlsplit(url)
+            query = dict(parse_qsl(parts.query, keep_blank_values=True))
+            if self.service == "github":
+                data = _github(parts.path, query)
+            elif self.service == "proxycurl":
+                data = _proxycurl(url, parts.path, query)
+            else:
+                data = _openrouter(parts.path, body.encode("utf-8") if isinstance(body, str) else body)
+            if data is None:
+                return {"status": 404, "headers": {"Content-Type": "application/json"}, "body": '{"message": "Not Found"}'}
+            headers = {"Content-Type": "application/json"}
+            if self.service == "proxycurl":
+                headers["X-Proxycurl-Credit-Cost"] = "3" if parts.path.endswith("/search/people") else "1"
+            return {"status": 200, "headers": headers, "body": json.dumps(data)}
+
+    return SyntheticUpstream(service, mode="replay")
+
+
+# --- Scenarios (run in the worker process) ---
+
+def _api_client():
+    import main_app
+    from fastapi.testclient import TestClient
+
+    return TestClient(main_app.app)
+
+
+def _scenario(name: str, corpus: Optional[str]):
+    """Setup for a scenario; returns (run, teardown), where run() returns (candidates, response bytes)."""
+    if name in ("talent_search", "github_search", "linkedin_search"):
+        client = _api_client().__enter__()
+        path, body = {
+            "talent_search": ("/talent_search", {"query": QUERY}),
+            "github_search": ("/github/search", PARSED_QUERY),
+            "linkedin_search": ("/linkedin/search", PARSED_QUERY),
+        }[name]
+
+        def run():
+            response = client.post(path, json=body)
+            if response.status_code != 200:
+                return 0, len(response.content)
+            data = response.json()
+            candidates = len(data) if isinstance(data, list) else data.get("total", len(data.get("candidates", [])))
+            return candidates, len(response.content)
+
+        return run, lambda: client.__exit__(None, None, None)
+
+    if name == "run_github_search":
+        from src.connectors.github_agent.cli import run_github_search
+
+        def run():
+            candidates = run_github_search(PARSED_QUERY)
+            return len(candidates), sum(len(c.json()) for c in candidates)
+
+        return run, lambda: None
+
+    if name == "resume_batch":
+        from src.orchestrator.pipeline import ResumeOrchestrator
+
+        orchestrator = ResumeOrchestrator()
+        paths = sorted(os.path.join(corpus, n) for n in os.listdir(corpus) if n.endswith(".pdf"))
+
+        def run():
+            results = orchestrator.process_resume_batch(paths, JOB_DESCRIPTION)
+            candidates = sum(bool(r.get("linkedin_profile")) + bool(r.get("github_profile")) for r in results)
+            return candidates, len(json.dumps(results, default=str))
+
+        return run, lambda: None
+
+    raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+
+
+def _upstream_totals() -> Dict[str, int]:
+    from src.core.replay import get_service_replay
+
+    totals = {"requests": 0, "request_bytes": 0, "response_bytes": 0}
+    for service in SERVICES:
+        replay = get_service_replay(service)
+        if replay is not None:
+            for key in totals:
+                totals[key] += replay.stats[key]
+    return totals
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_worker(scenario: str, upstream: str, iterations: int, warmup: int, corpus: Optional[str]) -> Dict:
+    sys.path.insert(0, PROJECT_ROOT)
+    if upstream == "synthetic":
+        from src.core.replay import set_service_replay
+
+        for service in SERVICES:
+            set_service_replay(service, synthetic_upstream(service))
+
+    run, teardown = _scenario(scenario, corpus)
+    try:
+        for _ in range(warmup):
+            run()
+        baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        before = _upstream_totals()
+        latencies, candidates, response_bytes = [], 0, 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            op_started = time.perf_counter()
+            found, size = run()
+            latencies.append(time.perf_counter() - op_started)
+            candidates += found
+            response_bytes += size
+        elapsed = time.perf_counter() - started
+        after = _upstream_totals()
+    finally:
+        teardown()
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    calls = after["requests"] - before["requests"]
+    return {
+        "scenario": scenario,
+        "iterations": iterations,
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "ops_per_second": round(iterations / elapsed, 2),
+        "candidates_per_op": round(candidates / iterations, 2),
+        "candidates_per_second": round(candidates / elapsed, 2),
+        "upstream_calls_per_op": round(calls / iterations, 2),
+        "upstream_calls_per_candidate": round(calls / candidates, 2) if candidates else None,
+        "upstream_bytes_per_op": round((after["request_bytes"] + after["response_bytes"]
+                                        - before["request_bytes"] - before["response_bytes"]) / iterations),
+        "response_bytes_per_op": round(response_bytes / iterations),
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "rss_growth_mb": round((peak_rss_kb - baseline_rss_kb) / 1024, 1),
+    }
+
+
+# --- Driver ---
+
+def _child_env(upstream: str, fixtures: Optional[str], scratch: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    # Every run does the full work: no result-set, Proxycurl or resume caches, no job recovery
+    env.update({
+        "RESULT_CACHE_TTL_SECONDS": "0",
+        "PROXYCURL_CACHE_ENABLED": "0",
+        "PROXYCURL_CACHE_PATH": os.path.join(scratch, "proxycurl.sqlite3"),
+        "PROXYCURL_DAILY_CREDIT_BUDGET": "0",
+        "RESUME_CACHE_ENABLED": "0",
+        "TALENT_JOBS_DIR": os.path.join(scratch, "jobs"),
+    })
+    # Client-side throttling would measure the limiter rather than the pipeline
+    env.setdefault("PROXYCURL_RPM", "1000000")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    if upstream == "synthetic":
+        env.setdefault("GITHUB_TOKEN", "synthetic")
+        for service, latency_ms in SYNTHETIC_LATENCY_MS.items():
+            env.setdefault(f"HTTP_REPLAY_{service.upper()}_LATENCY_MS", str(latency_ms))
+    else:
+        env.update({"HTTP_REPLAY_MODE": "replay", "HTTP_REPLAY_DIR": os.path.abspath(fixtures)})
+        env.setdefault("GITHUB_TOKEN", "replay")
+    env.setdefault("HTTP_REPLAY_SEED", "pipelines")
+    return env
+
+
+def measure(scenario: str, args, corpus: str, scratch: str) -> Dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", scenario, "--upstream", args.upstream,
+         "--iterations", str(args.iterations), "--warmup", str(args.warmup), "--corpus", corpus],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, env=_child_env(args.upstream, args.fixtures, scratch)
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Scenario {scenario} failed:\n{result.stderr[-4000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for scenario, metrics in report["scenarios"].items():
+        expected = baseline.get("scenarios", {}).get(scenario)
+        if expected is None:
+            continue
+        for metric, higher_is_worse in GATED_METRICS.items():
+            current, reference = metrics.get(metric), expected.get(metric)
+            if current is None or reference is None:
+                continue
+            allowed = reference * (1 + tolerance) if higher_is_worse else reference * (1 - tolerance)
+            if (current > allowed) if higher_is_worse else (current < allowed):
+                regressions.append(f"{scenario}.{metric}: {current} vs baseline {reference} (allowed {allowed:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=10, help="Measured operations per scenario.")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured operations before them.")
+    parser.add_argument("--upstream", choices=("synthetic", "replay"), default="synthetic")
+    parser.add_argument("--fixtures", default=os.path.join(PROJECT_ROOT, "fixtures", "http"),
+                        help="HTTP_REPLAY_DIR for --upstream replay.")
+    parser.add_argument("--resumes", type=int, default=8, help="Resumes per resume_batch operation.")
+    parser.add_argument("--corpus", help="Directory of resume PDFs for resume_batch (default: synthetic).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default 25%%).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON report.")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.upstream, args.iterations, args.warmup, args.corpus)))
+        return
+
+    scenarios = args.scenarios.split(",")
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    with tempfile.TemporaryDirectory(prefix="pipelines-bench-") as scratch:
+        corpus = args.corpus
+        if not corpus:
+            corpus = os.path.join(scratch, "resumes")
+            os.makedirs(corpus)
+            generate_corpus(corpus, args.resumes)
+        report = {
+            "python": sys.version.split()[0],
+            "upstream": args.upstream,
+            "iterations": args.iterations,
+            "scenarios": {name: measure(name, args, corpus, scratch) for name in scenarios},
+        }
+
+    print(f"{'scenario':<18} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ops/s':>7} {'cand/op':>8} {'calls/cand':>10} {'up KB/op':>9} {'peak MB':>8}")
+    for name, row in report["scenarios"].items():
+        calls = row["upstream_calls_per_candidate"]
+        print(f"{name:<18} {row['latency_p50_ms']:>8} {row['latency_p95_ms']:>8} {row['latency_p99_ms']:>8} "
+              f"{row['ops_per_second']:>7} {row['candidates_per_op']:>8} {calls if calls is not None else '-':>10} "
+              f"{row['upstream_bytes_per_op'] / 1024:>9.1f} {row['peak_rss_mb']:>8}")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": report["python"],
+                "upstream": report["upstream"],
+                "scenarios": {
+                    name: {metric: row[metric] for metric in GATED_METRICS}
+                    for name, row in report["scenarios"].items()
+                },
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to record one.")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("upstream") != report["upstream"]:
+        print(f"Baseline was recorded with --upstream {baseline.get('upstream')}; not comparing.")
+        return
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print("Pipeline regression:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("Pipelines within tolerance of the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark for main_app.
+
+Measures, in fresh interpreter processes:
+  * import time of `main_app` (from `python -X importtime`), with the heaviest modules
+  * ready time: import + app startup (lifespan) + first request served
+
+Usage:
+    python benchmarks/startup.py                    # report and compare against the baseline
+    python benchmarks/startup.py --update-baseline  # record the current numbers as the baseline
+
+Exits with status 1 if the median import or ready time regressed by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+
+# Runs in a child process: import the app, run its lifespan and serve one request
+READY_SCRIPT = """
+import time
+started = time.perf_counter()
+import main_app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main_app.app) as client:
+    started_up = time.perf_counter()
+    client.get("/openapi.json")
+    ready = time.perf_counter()
+print(f"{imported - started} {started_up - started} {ready - started}")
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Keep runs hermetic: no job recovery from a developer's local job directory
+    env.setdefault("TALENT_JOBS_DIR", os.path.join(PROJECT_ROOT, ".startup_bench_jobs_missing"))
+    return env
+
+
+def measure_import_time() -> Dict:
+    """Parses `python -X importtime` output for `import main_app`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main_app"],
+        cwd=PROJECT_ROOT, env=_child_env(), capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+
+    main_entry = next(m for m in modules if m["module"] == "main_app")
+    heaviest = sorted(
+        (m for m in modules if m["module"] != "main_app"),
+        key=lambda m: m["cumulative_us"], reverse=True
+    )[:15]
+    return {
+        "import_seconds": main_entry["cumulative_us"] / 1e6,
+        "modules_imported": len(modules),
+        "heaviest_modules": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_us"] / 1000, 1)} for m in heaviest
+        ],
+    }
+
+
+def measure_ready_time() -> Dict:
+    result = subprocess.run(
+        [sys.executable, "-c", READY_SCRIPT],
+        cwd=PROJECT_ROOT, env=_child_env(), capture_output=True, text=True, check=True
+    )
+    imported, started_up, ready = (float(value) for value in result.stdout.strip().splitlines()[-1].split())
+    return {"import_seconds": imported, "startup_seconds": started_up, "ready_seconds": ready}
+
+
+def run(iterations: int) -> Dict:
+    import_runs: List[Dict] = [measure_import_time() for _ in range(iterations)]
+    ready_runs: List[Dict] = [measure_ready_time() for _ in range(iterations)]
+    return {
+        "iterations": iterations,
+        "python": sys.version.split()[0],
+        "import_seconds_median": round(statistics.median(r["import_seconds"] for r in import_runs), 4),
+        "ready_seconds_median": round(statistics.median(r["ready_seconds"] for r in ready_runs), 4),
+        "startup_seconds_median": round(statistics.median(r["startup_seconds"] for r in ready_runs), 4),
+        "modules_imported": import_runs[-1]["modules_imported"],
+        "heaviest_modules": import_runs[-1]["heaviest_modules"],
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for metric in ("import_seconds_median", "ready_seconds_median"):
+        allowed = baseline[metric] * (1 + tolerance)
+        if report[metric] > allowed:
+            regressions.append(
+                f"{metric}: {report[metric]:.3f}s vs baseline {baseline[metric]:.3f}s (allowed {allowed:.3f}s)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default 25%%).")
+    parser.add_argument("--output", help="Also write the report as JSON to this path.")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    report = run(args.iterations)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({k: report[k] for k in ("python", "import_seconds_median", "ready_seconds_median")}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to record one.")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print("Cold-start regression:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("Cold start within tolerance of the baseline.")
+
+
+if __name__ == "__main__":
+    main()
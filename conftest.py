@@ -0,0 +1,2 @@
+# Scripts that call live services at import time; run them directly, not under pytest
+collect_ignore = ["test_endpoint.py", "test_github_agent.py", "src/parser/test_queries.py"]
@@ -1,5 +1,10 @@
-from fastapi import FastAPI, HTTPException
-from typing import List
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
+import asyncio
+import json
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -8,20 +13,73 @@ load_dotenv()
 
 # Import the parser's FastAPI app and its models directly
 from src.parser.main import app as nlp_parser_app
-from src.parser.models import ParseQueryRequest # Direct import of the model
 
 # Import the GitHub agent's FastAPI app/logic and its models
 from src.connectors.github_agent.main import app as github_agent_app
 from src.connectors.linkedin_agent.main import app as linkedin_agent_app
 
-from src.core.models import ParseQueryRequest, ParseQueryResponse, SearchParams, CandidateProfile
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.log import RequestContextMiddleware, configure_logging, shutdown_logging
+from src.core.metrics import REGISTRY
+from src.core.profiling import ProfileStore, ProfilingMiddleware, token_matches
+from src.core.tracing import critical_path, get_tracer, span, trace_summaries
+from src.core.tenants import authenticated_tenant
+from src.core.result_cache import CursorScopeMismatch, InvalidCursor, get_result_cache, load_page, render_page, result_set_key
+from src.core.models import ParseQueryRequest, ParseQueryResponse, SearchParams, CandidateProfile, TalentSearchResponse
+from src.orchestrator.talent_search import parse_talent_query, search_parsed_query, QueryParseError, SEARCH_SOURCES
+from src.orchestrator.jobs import JobManager, JobQueueFull, JobResultsPage, JobStatusResponse, TERMINAL_STATES
+from src.orchestrator.resume_uploads import UploadRejected, spool_uploads, stream_resume_batch
+
+logger = logging.getLogger(__name__)
+
+_job_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    """Background talent search jobs (see /talent_search/jobs), created on first use."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            store_dir=os.getenv("TALENT_JOBS_DIR", ".talent_jobs"),
+            max_workers=int(os.getenv("TALENT_JOB_WORKERS", "2")),
+            max_pending=int(os.getenv("TALENT_JOB_MAX_PENDING", "100")),
+            deadline_seconds=float(os.getenv("TALENT_JOB_DEADLINE_SECONDS", "600")),
+            retention_seconds=float(os.getenv("TALENT_JOB_RETENTION_SECONDS", str(24 * 3600)))
+        )
+    return _job_manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Structured logs are written by a background thread (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATES)
+    configure_logging()
+    # Unfinished jobs from a previous process are picked up again at startup
+    if os.path.isdir(os.getenv("TALENT_JOBS_DIR", ".talent_jobs")):
+        get_job_manager().recover()
+    yield
+    if _job_manager is not None:
+        _job_manager.shutdown()
+    shutdown_logging()
 
 app = FastAPI(
     title="HireAI Talent Search API",
-    description="Unified API for NLP parsing and dynamic GitHub talent search.",
-    version="0.1.0"
+    description="Unified API for NLP parsing and dynamic GitHub and LinkedIn talent search.",
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+# Request ids for log correlation (X-Request-Id) and per-request logging overhead
+app.add_middleware(RequestContextMiddleware)
+
+# Opt-in per-request profiling: only installed when PROFILING_TOKEN is set
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+profile_store = ProfileStore(os.getenv("PROFILES_DIR", ".profiles"))
+if PROFILING_TOKEN:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=PROFILING_TOKEN,
+        store=profile_store,
+        interval=float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.005"))
+    )
+
 # Mount the NLP Parser app under /nlp
 app.mount("/nlp", nlp_parser_app)
 
@@ -31,26 +89,243 @@ app.mount("/github", github_agent_app)
 # Mount the LinkedIn Agent app under /linkedin
 app.mount("/linkedin", linkedin_agent_app, name="linkedin")
 
-# Define a top-level endpoint that chains NLP -> GitHub
-@app.post("/talent_search", response_model=List[CandidateProfile])
-async def talent_search(query_request: ParseQueryRequest): # Use direct import here
-    """Accepts a natural language query, parses it, and then searches GitHub for matching candidates."""
-    print(f"Received natural language query: {query_request.query}")
+# Default and maximum end-to-end budget for one /talent_search request (seconds)
+TALENT_SEARCH_DEADLINE_SECONDS = float(os.getenv("TALENT_SEARCH_DEADLINE_SECONDS", "60"))
+TALENT_SEARCH_MAX_DEADLINE_SECONDS = float(os.getenv("TALENT_SEARCH_MAX_DEADLINE_SECONDS", "300"))
+
+def _check_sources(sources: Optional[List[str]]):
+    unknown_sources = [name for name in sources or [] if name not in SEARCH_SOURCES]
+    if unknown_sources:
+        raise HTTPException(status_code=400, detail=f"Unknown search sources: {', '.join(unknown_sources)}")
+
+# Default page size for /talent_search results
+TALENT_SEARCH_PAGE_SIZE = int(os.getenv("TALENT_SEARCH_PAGE_SIZE", "20"))
+
+# Define a top-level endpoint that chains NLP -> all search sources
+@app.post("/talent_search", response_model=TalentSearchResponse)
+async def talent_search(
+    query_request: Optional[ParseQueryRequest] = None,
+    sources: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor."),
+    page_size: Optional[int] = Query(None, ge=1, le=200, description="Defaults to TALENT_SEARCH_PAGE_SIZE, or the cursor's page size."),
+    x_request_deadline: Optional[float] = Header(
+        None, gt=0, le=TALENT_SEARCH_MAX_DEADLINE_SECONDS, description="End-to-end time budget in seconds."
+    ),
+    tenant: Optional[str] = Depends(authenticated_tenant)
+):
+    """
+    Accepts a natural language query, parses it, and then searches GitHub and LinkedIn
+    concurrently. Sources that fail or exceed their timeout are reported in `sources`
+    instead of failing the whole request.
+
+    The whole request shares one deadline (the X-Request-Deadline header, or
+    TALENT_SEARCH_DEADLINE_SECONDS). Stages cut short by it are listed in `truncated_stages`.
+
+    Results are paginated: the ranked result set is cached server-side and later pages
+    are fetched with `cursor` (no body needed), without re-running the search.
+
+    Paid lookups are charged to the tenant of the X-Api-Key header (see TENANT_API_KEYS).
+
+    The X-Trace-Id response header identifies the request's spans under /traces.
+    """
+    with span("talent_search", paged=cursor is not None) as request_span:
+        response = await _talent_search_response(query_request, sources, cursor, page_size, x_request_deadline, tenant)
+    if request_span.trace_id:
+        response.headers["X-Trace-Id"] = request_span.trace_id
+    return response
+
+async def _talent_search_response(
+    query_request: Optional[ParseQueryRequest],
+    sources: Optional[List[str]],
+    cursor: Optional[str],
+    page_size: Optional[int],
+    x_request_deadline: Optional[float],
+    tenant: Optional[str] = None
+) -> Response:
+    result_cache = get_result_cache()
+    if cursor:
+        try:
+            return Response(load_page(result_cache, cursor, page_size, scope="talent_search"), media_type="application/json")
+        except CursorScopeMismatch as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=410, detail=str(e))
+    if query_request is None:
+        raise HTTPException(status_code=422, detail="Either a query body or a cursor is required.")
+
+    budget = TALENT_SEARCH_DEADLINE_SECONDS if x_request_deadline is None else x_request_deadline
+    deadline = Deadline(min(budget, TALENT_SEARCH_MAX_DEADLINE_SECONDS))
+    logger.info(f"Received natural language query: {query_request.query}")
+    _check_sources(sources)
 
-    # 1. Use NLP Parser to get structured query
     try:
-        parsed_nlp_output = await nlp_parser_app.parse_query(query_request)
-        print(f"NLP Parser output: {parsed_nlp_output.dict()}")
-    except Exception as e:
+        parsed_query = await parse_talent_query(query_request.query, deadline=deadline)
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=f"NLP Parsing Error: {e}")
+    except QueryParseError as e:
         raise HTTPException(status_code=500, detail=f"NLP Parsing Error: {e}")
 
-    # 2. Convert NLP output to search params
-    github_search_params = SearchParams(**parsed_nlp_output.dict())
+    # Identical structured queries reuse the cached ranked result set
+    cache_key = result_set_key("talent_search", SearchParams(**parsed_query.dict()), sources)
+    entry = result_cache.get(cache_key, require_complete=True)
+    if entry is None:
+        result = await search_parsed_query(parsed_query, sources=sources, deadline=deadline, tenant=tenant)
+        complete = not result.truncated_stages and all(s.status == "ok" for s in result.sources)
+        entry = result_cache.put(
+            cache_key,
+            result.candidates,
+            metadata={
+                "query": parsed_query.dict(),
+                "sources": [s.dict() for s in result.sources],
+                "truncated_stages": result.truncated_stages
+            },
+            # Partial results are still pageable, but a fresh search retries the sources
+            complete=complete,
+            scope="talent_search"
+        )
+    return Response(render_page(entry, 0, page_size or TALENT_SEARCH_PAGE_SIZE), media_type="application/json")
+
+# --- Asynchronous job mode for long-running searches ---
+@app.post("/talent_search/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_talent_search_job(
+    query_request: ParseQueryRequest,
+    sources: Optional[List[str]] = Query(None),
+    tenant: Optional[str] = Depends(authenticated_tenant)
+):
+    """
+    Queues a talent search and returns its job id immediately.
+    An identical query that is already queued or running is attached to instead of re-run.
+    """
+    _check_sources(sources)
+    try:
+        job, attached = get_job_manager().submit(query_request.query, sources, tenant)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JobStatusResponse.from_job(job, attached=attached)
+
+def _get_job_or_404(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.get("/talent_search/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_talent_search_job(job_id: str):
+    """Polls a job's status and latest progress event."""
+    return JobStatusResponse.from_job(_get_job_or_404(job_id))
+
+@app.get("/talent_search/jobs/{job_id}/events")
+async def stream_talent_search_job_events(job_id: str, since: int = Query(0, ge=0)):
+    """Streams the job's progress events as NDJSON until it finishes."""
+    _get_job_or_404(job_id)
+
+    async def event_stream():
+        seq = since
+        while True:
+            events, status = get_job_manager().events_since(job_id, seq)
+            for event in events:
+                yield json.dumps(event) + "\n"
+            seq += len(events)
+            if status is None or (status in TERMINAL_STATES and not events):
+                break
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@app.get("/talent_search/jobs/{job_id}/results", response_model=JobResultsPage)
+async def get_talent_search_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Returns one page of a finished job's candidates."""
+    job = _get_job_or_404(job_id)
+    if job.status not in TERMINAL_STATES:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+    if job.result is None:
+        raise HTTPException(status_code=500, detail=f"Job {job_id} failed: {job.error}")
+    return JobResultsPage(
+        job_id=job.job_id,
+        status=job.status,
+        total=len(job.result.candidates),
+        offset=offset,
+        limit=limit,
+        candidates=job.result.candidates[offset:offset + limit],
+        sources=job.result.sources,
+        truncated_stages=job.result.truncated_stages
+    )
+
+# --- Resume batches ---
+@app.post("/resumes/batch")
+async def process_resume_batch_upload(
+    job_description: str = Form(...),
+    files: List[UploadFile] = File(...),
+    include_text: bool = Query(False),
+    tenant: Optional[str] = Depends(authenticated_tenant)
+):
+    """
+    Screens uploaded resumes (PDFs, or zip archives of PDFs) against a job description.
+    Uploads are spooled to disk, and results stream back as NDJSON, one line per resume as it
+    finishes, with periodic progress events. raw_text is left out unless include_text is set.
+    """
+    from src.orchestrator.pipeline import ResumeOrchestrator
+
+    try:
+        batch = await spool_uploads(files)
+    except UploadRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"Resume batch: {len(batch.entries)} resumes spooled, {len(batch.skipped)} skipped")
+    return StreamingResponse(
+        stream_resume_batch(ResumeOrchestrator(tenant=tenant), batch, job_description, include_text=include_text),
+        media_type="application/x-ndjson"
+    )
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)):
+    # Traces and profiles expose queries, usernames, code paths and timings, so they need the
+    # same token that enables profiling; without PROFILING_TOKEN they don't exist at all
+    if not token_matches(PROFILING_TOKEN, x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/traces", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def list_traces(
+    min_duration_ms: float = Query(0.0, ge=0),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Recent traces from the in-memory span buffer, newest first."""
+    tracer = get_tracer()
+    spans = tracer.buffer.spans() if tracer.buffer else []
+    return {"traces": trace_summaries(spans, min_duration_ms, limit)}
+
+@app.get("/traces/{trace_id}", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def get_trace(trace_id: str):
+    """All buffered spans of one trace, ordered by start time, plus its critical path."""
+    tracer = get_tracer()
+    spans = sorted(
+        (s for s in (tracer.buffer.spans() if tracer.buffer else []) if s["trace_id"] == trace_id),
+        key=lambda s: s["start"]
+    )
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found (it may have been evicted)")
+    return {"trace_id": trace_id, "critical_path": critical_path(spans), "spans": spans}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Stage latencies, upstream call counts, rate limits and cache/filter counters in Prometheus text format."""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/profiles", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def list_profiles():
+    """Stored request profiles, newest first."""
+    return {"profiles": profile_store.list()}
 
-    # 3. Use GitHub Agent to find candidates
+@app.get("/profiles/{profile_id}", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def get_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|folded)$")
+):
+    """One profile: the JSON summary with top functions, or folded stacks for a flame graph."""
     try:
-        candidates = await github_agent_app.search_github_candidates(github_search_params)
-        print(f"Found {len(candidates)} candidates from GitHub.")
-        return candidates
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"GitHub Search Error: {e}") 
\ No newline at end of file
+        content = profile_store.load(profile_id, format)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return Response(content, media_type="application/json" if format == "json" else "text/plain")
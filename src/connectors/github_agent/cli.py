@@ -1,11 +1,17 @@
 import sys
 import os
 import json
-from typing import List, Set
+import logging
+from typing import Dict, List, Optional, Tuple
 
 # Add the project root to sys.path for module discovery
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
+from src.core.deadline import Deadline
+from src.core.log import configure_logging, item_logger
+from src.core.metrics import CANDIDATES_DROPPED, STAGE_LATENCY
+from src.core.replay import get_service_replay
+from src.core.tracing import span
 from src.core.models import SearchParams, CandidateProfile
 from src.connectors.github_agent.models import GitHubSearchUserResult, GitHubRepoSearchResult
 from src.connectors.github_agent.search_query_generator import SearchQueryGenerator
@@ -17,76 +23,118 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-def run_github_search(nlp_output: dict) -> List[CandidateProfile]:
-    github_token = os.getenv("GITHUB_TOKEN")
-    if not github_token:
-        print("Error: GITHUB_TOKEN environment variable not set. Please set it in your .env file.")
-        return []
-
-    github_fetcher = GitHubFetcher(github_token=github_token)
-    profile_collector = ProfileCollector(github_fetcher=github_fetcher)
-
-    try:
-        # 1. Generate GitHub REPOSITORY search query
-        params = SearchParams(**nlp_output)
-        github_repo_query = SearchQueryGenerator.generate_github_repo_search_query(params.dict())
-        print(f"\nGenerated GitHub REPO search query: {github_repo_query}")
-
-        # 2. Search GitHub repositories and extract unique user logins
-        repo_search_results_raw = github_fetcher.search_repositories(github_repo_query)
-        if not repo_search_results_raw or not repo_search_results_raw.get("items"):
-            print("No initial GitHub repositories found for the given query.")
-            return []
-        
-        unique_github_logins: Set[str] = set()
-        for item in repo_search_results_raw["items"]:
-            repo_result = GitHubRepoSearchResult(**item)
-            if repo_result.owner and repo_result.owner.get("login"):
-                unique_github_logins.add(repo_result.owner["login"])
-        
-        print(f"Found {len(unique_github_logins)} unique GitHub users from repository search.")
+logger = logging.getLogger(__name__)
+items_logger = item_logger(__name__)
 
-        # Convert unique logins to GitHubSearchUserResult for profile_collector
-        users_to_collect = [GitHubSearchUserResult(login=login, html_url=f"https://github.com/{login}") 
-                            for login in list(unique_github_logins)]
 
-        # 3. Collect detailed profiles and repos for these unique users
-        collected_raw_profiles = profile_collector.collect_profiles(users_to_collect)
-        print(f"Collected detailed data for {len(collected_raw_profiles)} profiles.")
+def _filter_and_normalize(collected_raw_profiles: List[Dict]) -> List[CandidateProfile]:
+    final_candidates: List[CandidateProfile] = []
+    for raw_profile_data in collected_raw_profiles:
+        user_profile = raw_profile_data.get("user_profile", {})
+        user_repos = raw_profile_data.get("user_repos", [])
 
-        # 4. Filter and Normalize profiles
-        final_candidates: List[CandidateProfile] = []
-        for raw_profile_data in collected_raw_profiles:
-            user_profile = raw_profile_data.get("user_profile", {})
-            user_repos = raw_profile_data.get("user_repos", [])
-
-            # Extract skills and analyze activity
+        # Extract skills and analyze activity
+        with span("skill_activity_filter.analyze", username=user_profile.get("login"), repos=len(user_repos)):
             extracted_skills = SkillActivityFilter.extract_skills(user_profile, user_repos)
             activity_metrics = SkillActivityFilter.analyze_activity(user_profile, user_repos)
-            
-            # Combine all extracted and analyzed data
-            combined_data = {
-                **user_profile, 
-                "skills": extracted_skills, 
-                "top_languages": activity_metrics.get("top_languages"),
-                "total_stars": activity_metrics.get("total_stars"),
-                "recent_activity": activity_metrics.get("recent_activity"),
-                "oss_score": activity_metrics.get("oss_score"),
-            }
-            
-            # Normalize into CandidateProfile
+        
+        # Combine all extracted and analyzed data
+        combined_data = {
+            **user_profile, 
+            "skills": extracted_skills, 
+            "top_languages": activity_metrics.get("top_languages"),
+            "total_stars": activity_metrics.get("total_stars"),
+            "recent_activity": activity_metrics.get("recent_activity"),
+            "oss_score": activity_metrics.get("oss_score"),
+        }
+        
+        # Normalize into CandidateProfile
+        with span("profile_normalizer.normalize", username=user_profile.get("login")):
             candidate = ProfileNormalizer.normalize(user_profile, user_repos, combined_data)
-            
-            if candidate and SkillActivityFilter.apply_filters(candidate.dict()):
-                final_candidates.append(candidate)
-            else:
-                print(f"Skipping candidate: {candidate.github_username if candidate else 'Unknown'} (failed filter)")
+        
+        if candidate is None:
+            CANDIDATES_DROPPED.labels("normalize_failed").inc()
+            items_logger.info("Skipping candidate: Unknown (failed to normalize)")
+            continue
+        with span("skill_activity_filter.apply_filters", username=candidate.github_username) as filter_span:
+            passed = SkillActivityFilter.apply_filters(candidate.dict())
+            filter_span.set("passed", passed)
+        if passed:
+            final_candidates.append(candidate)
+        else:
+            items_logger.info("Skipping candidate: %s (failed filter)", candidate.github_username)
+    return final_candidates
+
+
+def search_github(
+    params: SearchParams,
+    github_fetcher: GitHubFetcher,
+    profile_collector: Optional[ProfileCollector] = None,
+    per_page: int = 30,
+    max_pages: int = 3
+) -> Tuple[List[CandidateProfile], Dict]:
+    """
+    Runs the repo search -> profile collection -> filter/normalize pipeline.
+    Returns the candidates plus search metadata. Respects github_fetcher.deadline.
+    """
+    profile_collector = profile_collector or ProfileCollector(github_fetcher=github_fetcher)
+    metadata: Dict = {"total_count": 0}
+
+    # 1. Generate GitHub REPOSITORY search query
+    with span("search_query_generator.github_repo_query"):
+        github_repo_query = SearchQueryGenerator.generate_github_repo_search_query(params.dict())
+    metadata["query"] = github_repo_query
+    logger.info(f"Generated GitHub REPO search query: {github_repo_query}")
+
+    # 2. Search GitHub repositories and extract unique user logins
+    repo_search_results_raw = github_fetcher.search_repositories(github_repo_query, per_page=per_page, max_pages=max_pages)
+    if not repo_search_results_raw or not repo_search_results_raw.get("items"):
+        logger.info("No initial GitHub repositories found for the given query.")
+        return [], metadata
+    metadata["repositories_searched"] = len(repo_search_results_raw["items"])
+
+    # Keep first-seen order so the best-starred repos' owners are collected first
+    unique_github_logins: Dict[str, None] = {}
+    for item in repo_search_results_raw["items"]:
+        repo_result = GitHubRepoSearchResult(**item)
+        if repo_result.owner and repo_result.owner.get("login"):
+            unique_github_logins[repo_result.owner["login"]] = None
+    metadata["unique_users_found"] = len(unique_github_logins)
+
+    logger.info(f"Found {len(unique_github_logins)} unique GitHub users from repository search.")
+
+    # Convert unique logins to GitHubSearchUserResult for profile_collector
+    users_to_collect = [GitHubSearchUserResult(login=login, html_url=f"https://github.com/{login}") 
+                        for login in unique_github_logins]
+
+    # 3. Collect detailed profiles and repos for these unique users
+    collected_raw_profiles = profile_collector.collect_profiles(users_to_collect, deadline=github_fetcher.deadline)
+    logger.info(f"Collected detailed data for {len(collected_raw_profiles)} profiles.")
+
+    # 4. Filter and Normalize profiles
+    with STAGE_LATENCY.labels("normalize_filter").time(), span("github.filter_normalize", profiles=len(collected_raw_profiles)) as filter_span:
+        final_candidates = _filter_and_normalize(collected_raw_profiles)
+        filter_span.set("kept", len(final_candidates))
+
+    metadata["total_count"] = len(final_candidates)
+    logger.info(f"Returning {len(final_candidates)} filtered candidates.")
+    return final_candidates, metadata
+
+def run_github_search(nlp_output: dict, deadline: Optional[Deadline] = None) -> List[CandidateProfile]:
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not github_token and get_service_replay("github") is None:
+        logger.error("GITHUB_TOKEN environment variable not set. Please set it in your .env file.")
+        return []
+
+    github_fetcher = GitHubFetcher(github_token=github_token, deadline=deadline)
 
-        print(f"Returning {len(final_candidates)} filtered candidates.")
-        return final_candidates
+    try:
+        params = SearchParams(**nlp_output)
+        candidates, _ = search_github(params, github_fetcher)
+        return candidates
 
     except Exception as e:
-        print(f"Error during GitHub search: {e}")
+        logger.error(f"Error during GitHub search: {e}")
         return []
 
 if __name__ == "__main__":
@@ -100,6 +148,7 @@ if __name__ == "__main__":
       "work_type": "contract"
     }
 
+    configure_logging(fmt="text")
     print("--- Starting GitHub Talent Search CLI Test ---")
     print(f"Input NLP Output: {json.dumps(sample_nlp_output, indent=2)}")
     
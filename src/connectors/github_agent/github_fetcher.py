@@ -1,28 +1,56 @@
 import os
+import re
 import time
+import hashlib
 import logging
 import requests
 from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime, timedelta
 
+from src.core.deadline import Deadline, ensure_deadline
+from src.core.log import item_logger
+from src.core.metrics import GITHUB_REQUESTS, GITHUB_RATE_LIMIT_REMAINING, STAGE_LATENCY
+from src.core.replay import replay_session
+from src.core.tracing import span
+
 logger = logging.getLogger(__name__)
+items_logger = item_logger(__name__)
+
+# Path segments that identify a user or repo are collapsed so metric labels stay low-cardinality
+_USER_PATH = re.compile(r"^/users/[^/]+")
+_REPO_PATH = re.compile(r"^/repos/[^/]+/[^/]+")
+
+
+def endpoint_template(url: str) -> str:
+    """Maps a GitHub API URL to its endpoint template, e.g. /users/{username}/repos."""
+    path = url.split("://", 1)[-1]
+    path = "/" + path.split("/", 1)[1] if "/" in path else "/"
+    path = path.split("?", 1)[0]
+    path = _USER_PATH.sub("/users/{username}", path)
+    return _REPO_PATH.sub("/repos/{owner}/{repo}", path)
 
 class RateLimitExceeded(Exception):
     """Raised when GitHub API rate limit is exceeded."""
     pass
 
 class GitHubFetcher:
-    BASE_URL = "https://api.github.com"
+    BASE_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
     MAX_RETRIES = 3
     INITIAL_RETRY_DELAY = 2  # seconds
+    REQUEST_TIMEOUT = 30  # seconds, capped by the deadline's remaining budget
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, deadline: Optional[Deadline] = None):
+        self.deadline = ensure_deadline(deadline)
+        # Pooled connections; routed through the record/replay adapter when HTTP_REPLAY_MODE is set
+        self.session = replay_session("github")
         self.headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28"
         }
         self.rate_limit_remaining = 30  # Default unauthenticated limit
         self.rate_limit_reset = datetime.now()
+        # Short fingerprint of the token, used as a metric label instead of the secret itself
+        self.token_id = hashlib.sha256(github_token.encode("utf-8")).hexdigest()[:8] if github_token else "anonymous"
         
         if github_token:
             self.headers["Authorization"] = f"Bearer {github_token}"
@@ -33,18 +61,28 @@ class GitHubFetcher:
                 "and subject to severe rate limits (60 requests/hour)."
             )
     
-    def _check_rate_limit(self):
-        """Check if we've hit the rate limit and need to wait."""
+    def _check_rate_limit(self) -> bool:
+        """
+        Check if we've hit the rate limit and need to wait.
+        Returns False if the wait doesn't fit in the request deadline.
+        """
         if self.rate_limit_remaining <= 1:  # Leave some buffer
             reset_in = (self.rate_limit_reset - datetime.now()).total_seconds()
             if reset_in > 0:
                 logger.warning(f"Rate limit reached. Waiting {reset_in:.1f} seconds...")
-                time.sleep(max(1, reset_in))  # Wait at least 1 second
+                # Wait at least 1 second
+                with span("github.backoff", seconds=max(1, reset_in), reason="rate_limit_reset"):
+                    slept = self.deadline.sleep(max(1, reset_in), "github.rate_limit_wait")
+                if not slept:
+                    logger.warning("Rate limit reset is past the request deadline. Giving up.")
+                    return False
+        return True
     
     def _update_rate_limit(self, headers: Dict[str, str]):
         """Update rate limit information from response headers."""
         if 'X-RateLimit-Remaining' in headers:
             self.rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
+            GITHUB_RATE_LIMIT_REMAINING.labels(self.token_id).set(self.rate_limit_remaining)
             
         if 'X-RateLimit-Reset' in headers:
             reset_timestamp = int(headers['X-RateLimit-Reset'])
@@ -64,23 +102,42 @@ class GitHubFetcher:
         Returns:
             Tuple of (response_json, status_code)
         """
+        if not self.deadline.can_afford(Deadline.MIN_CALL_BUDGET):
+            self.deadline.mark_truncated("github.request")
+            logger.warning(f"Skipping {method} {url}: request deadline exceeded")
+            return None, None
+
         try:
-            self._check_rate_limit()
+            if not self._check_rate_limit():
+                return None, None
             
             logger.debug(f"Making {method} request to {url} with params: {params}")
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                params=params,
-                json=data,
-                timeout=30  # Increased timeout
-            )
+            endpoint = endpoint_template(url)
+            # One span per attempt; backoff waits and retries are siblings, not children
+            with span("github.http", method=method, url_template=endpoint, attempt=retry_count) as http_span:
+                try:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=self.headers,
+                        params=params,
+                        json=data,
+                        timeout=self.deadline.timeout(self.REQUEST_TIMEOUT)
+                    )
+                except requests.exceptions.RequestException:
+                    GITHUB_REQUESTS.labels(endpoint, "error").inc()
+                    raise
+                http_span.set("status", response.status_code)
+                http_span.set("bytes", len(response.content or b""))
+                for header in ("X-RateLimit-Remaining", "X-RateLimit-Limit", "X-RateLimit-Reset", "X-RateLimit-Resource"):
+                    if header in response.headers:
+                        http_span.set(header.lower(), response.headers[header])
             
             # Update rate limit information
             self._update_rate_limit(response.headers)
             
             status_code = response.status_code
+            GITHUB_REQUESTS.labels(endpoint, status_code).inc()
             logger.debug(f"Response status: {status_code}")
             
             # Handle rate limiting
@@ -88,7 +145,11 @@ class GitHubFetcher:
                 if retry_count < self.MAX_RETRIES:
                     retry_after = int(response.headers.get('Retry-After', self.INITIAL_RETRY_DELAY * (retry_count + 1)))
                     logger.warning(f"Rate limited. Retrying after {retry_after} seconds...")
-                    time.sleep(retry_after)
+                    with span("github.backoff", seconds=retry_after, reason="rate_limited"):
+                        slept = self.deadline.sleep(retry_after, "github.retry")
+                    if not slept:
+                        logger.warning("Retry wait doesn't fit in the request deadline. Giving up.")
+                        return None, status_code
                     return self._make_request(method, url, params, data, retry_count + 1)
                 raise RateLimitExceeded("Rate limit exceeded and max retries reached")
                 
@@ -112,8 +173,12 @@ class GitHubFetcher:
             if retry_count < self.MAX_RETRIES:
                 delay = self.INITIAL_RETRY_DELAY * (2 ** retry_count)  # Exponential backoff
                 logger.warning(f"Request failed: {e}. Retrying in {delay} seconds...")
-                time.sleep(delay)
-                return self._make_request(method, url, params, data, retry_count + 1)
+                with span("github.backoff", seconds=delay, reason=type(e).__name__):
+                    slept = self.deadline.sleep(delay, "github.retry")
+                if slept:
+                    return self._make_request(method, url, params, data, retry_count + 1)
+                logger.error(f"Request failed and retry doesn't fit in the request deadline: {e}")
+                return None, None
             logger.error(f"Request failed after {self.MAX_RETRIES} retries: {e}")
             return None, None
 
@@ -136,11 +201,22 @@ class GitHubFetcher:
         Returns:
             Dictionary containing search results and metadata
         """
+        with STAGE_LATENCY.labels("repo_search").time(), span("github.search_repositories", query=query) as search_span:
+            results = self._search_repository_pages(query, page, per_page, max_pages)
+            search_span.set("items", len(results["items"]))
+            return results
+
+    def _search_repository_pages(self, query: str, page: int, per_page: int, max_pages: int) -> Dict[str, Any]:
         url = f"{self.BASE_URL}/search/repositories"
         all_items = []
         total_count = 0
         
         for current_page in range(page, page + max_pages):
+            if current_page > page and not self.deadline.can_afford(Deadline.MIN_CALL_BUDGET):
+                self.deadline.mark_truncated("github.search_repositories")
+                logger.warning(f"Stopping repository search before page {current_page}: request deadline exceeded")
+                break
+
             params = {
                 "q": query,
                 "page": current_page,
@@ -153,6 +229,9 @@ class GitHubFetcher:
             
             if not result or 'items' not in result:
                 logger.warning(f"No results or error in page {current_page}")
+                # A failed page (as opposed to an empty one) leaves the search incomplete
+                if status_code != 404:
+                    self.deadline.mark_truncated("github.search_repositories")
                 break
                 
             items = result.get('items', [])
@@ -176,23 +255,15 @@ class GitHubFetcher:
             "page": page,
             "per_page": per_page
         }
-        print(f"Searching GitHub users with query: {query}, page: {page}")
-        return self._make_request("GET", url, params)
-
-    def search_repositories(self, query: str, page: int = 1, per_page: int = 30) -> Optional[Dict]:
-        url = f"{self.BASE_URL}/search/repositories"
-        params = {
-            "q": query,
-            "page": page,
-            "per_page": per_page
-        }
-        print(f"Searching GitHub repositories with query: {query}, page: {page}")
-        return self._make_request("GET", url, params)
+        items_logger.info("Searching GitHub users with query: %s, page: %s", query, page)
+        result, _ = self._make_request("GET", url, params)
+        return result
 
     def get_user_profile(self, username: str) -> Optional[Dict]:
         url = f"{self.BASE_URL}/users/{username}"
-        print(f"Fetching GitHub profile for: {username}")
-        return self._make_request("GET", url)
+        items_logger.info("Fetching GitHub profile for: %s", username)
+        result, _ = self._make_request("GET", url)
+        return result
 
     def get_user_repos(self, username: str, page: int = 1, per_page: int = 100) -> Optional[List[Dict]]:
         url = f"{self.BASE_URL}/users/{username}/repos"
@@ -200,5 +271,6 @@ class GitHubFetcher:
             "page": page,
             "per_page": per_page
         }
-        print(f"Fetching GitHub repos for: {username}, page: {page}")
-        return self._make_request("GET", url, params) 
\ No newline at end of file
+        items_logger.info("Fetching GitHub repos for: %s, page: %s", username, page)
+        result, _ = self._make_request("GET", url, params)
+        return result
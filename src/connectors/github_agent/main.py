@@ -1,24 +1,20 @@
+import asyncio
 import logging
 import os
-from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, Depends, status
+from typing import Any, Callable, Dict, List, Optional
+from fastapi import FastAPI, HTTPException, Depends, Query, status
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
+from src.core.deadline import Deadline
 from src.core.models import SearchParams, CandidateProfile
-from src.connectors.github_agent.models import GitHubSearchUserResult, GitHubRepoSearchResult
-from src.connectors.github_agent.search_query_generator import SearchQueryGenerator
+from src.core.result_cache import CursorScopeMismatch, InvalidCursor, get_result_cache, load_page, render_page, result_set_key
+from src.connectors.github_agent.cli import search_github
 from src.connectors.github_agent.github_fetcher import GitHubFetcher, RateLimitExceeded
 from src.connectors.github_agent.profile_collector import ProfileCollector
-from src.connectors.github_agent.skill_activity_filter import SkillActivityFilter
-from src.connectors.github_agent.profile_normalizer import ProfileNormalizer
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
@@ -39,6 +35,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Default time budget for a standalone /github/search request (seconds)
+SEARCH_DEADLINE_SECONDS = float(os.getenv("GITHUB_SEARCH_DEADLINE_SECONDS", "60"))
+
 def get_github_fetcher():
     """Dependency for GitHubFetcher with error handling for missing token."""
     github_token = os.getenv("GITHUB_TOKEN")
@@ -47,12 +46,14 @@ def get_github_fetcher():
             "GITHUB_TOKEN environment variable not set. "
             "GitHub API rate limits will be severely restricted (60 requests/hour)."
         )
-    return GitHubFetcher(github_token=github_token)
+    return GitHubFetcher(github_token=github_token, deadline=Deadline(SEARCH_DEADLINE_SECONDS))
+
+def github_fetcher_factory() -> Callable[[], GitHubFetcher]:
+    """Dependency handing out get_github_fetcher itself, so the fetcher is only built when a search runs."""
+    return get_github_fetcher
 
-# Initialize components
-profile_collector = ProfileCollector(github_fetcher=get_github_fetcher())
-skill_activity_filter = SkillActivityFilter()
-profile_normalizer = ProfileNormalizer()
+# Default page size for /search results
+SEARCH_PAGE_SIZE = int(os.getenv("GITHUB_SEARCH_PAGE_SIZE", "20"))
 
 class SearchResponse(BaseModel):
     """Response model for search results."""
@@ -61,157 +62,81 @@ class SearchResponse(BaseModel):
     candidates: List[Dict[str, Any]] = []
     search_metadata: Dict[str, Any] = {}
     error: Optional[str] = None
+    total: Optional[int] = None # Size of the full result set
+    next_cursor: Optional[str] = None # Opaque cursor for the next page, None on the last page
 
 @app.post("/search", response_model=SearchResponse)
 async def search_github_candidates(
-    params: SearchParams,
-    fetcher: GitHubFetcher = Depends(get_github_fetcher)
+    params: Optional[SearchParams] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor."),
+    page_size: Optional[int] = Query(None, ge=1, le=200, description="Defaults to SEARCH_PAGE_SIZE, or the cursor's page size."),
+    fetcher_factory: Callable[[], GitHubFetcher] = Depends(github_fetcher_factory)
 ) -> SearchResponse:
     """
     Search for GitHub candidates based on search parameters.
     
     This endpoint performs a repository search based on the provided parameters,
     then collects and analyzes profiles of repository owners.
+
+    Results are paginated from a server-side cache of the ranked result set:
+    pass `cursor` (no body needed) to fetch later pages without re-crawling GitHub.
     """
+    result_cache = get_result_cache()
+    if cursor:
+        try:
+            return Response(load_page(result_cache, cursor, page_size, scope="github_search"), media_type="application/json")
+        except CursorScopeMismatch as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    if params is None:
+        raise HTTPException(status_code=422, detail="Either search parameters or a cursor is required.")
+
+    per_page = min(30, params.limit or 30)  # Default to 30 results max
+    cache_key = result_set_key(f"github_search:{per_page}", params)
+    entry = result_cache.get(cache_key, require_complete=True)
+    if entry is not None:
+        logger.info("Serving GitHub search from the result-set cache")
+        return Response(render_page(entry, 0, page_size or SEARCH_PAGE_SIZE), media_type="application/json")
+
+    # Built only now: cursor pages and cache hits don't need a fetcher (or its token check)
+    fetcher = fetcher_factory()
     try:
         logger.info(f"Starting search with params: {params.dict()}")
-        
-        # 1. Generate GitHub repository search query
-        try:
-            github_repo_query = SearchQueryGenerator.generate_github_repo_search_query(params.dict())
-            logger.info(f"Generated GitHub search query: {github_repo_query}")
-        except Exception as e:
-            logger.error(f"Error generating search query: {e}")
-            return SearchResponse(
-                success=False,
-                message="Failed to generate search query",
-                error=str(e)
-            )
-
-        # 2. Search GitHub repositories
-        try:
-            logger.info(f"Searching GitHub repositories with query: {github_repo_query}")
-            repo_search_results = fetcher.search_repositories(
-                query=github_repo_query,
-                per_page=min(30, params.limit or 30),  # Default to 30 results max
-                max_pages=2  # Limit to 2 pages to avoid excessive API calls
-            )
-            
-            if not repo_search_results or not repo_search_results.get('items'):
-                logger.info("No repositories found matching the search criteria")
-                return SearchResponse(
-                    success=True,
-                    message="No repositories found matching the search criteria",
-                    candidates=[],
-                    search_metadata={"total_count": 0}
-                )
-                
-            logger.info(f"Found {len(repo_search_results['items'])} repositories")
-            
-            # 3. Extract unique users from repository results
-            unique_users = {}
-            for item in repo_search_results['items']:
-                try:
-                    repo = GitHubRepoSearchResult(**item)
-                    if repo.owner and repo.owner.login and repo.owner.login not in unique_users:
-                        unique_users[repo.owner.login] = repo.owner
-                except Exception as e:
-                    logger.warning(f"Error processing repository result {item.get('id')}: {e}")
-            
-            if not unique_users:
-                return SearchResponse(
-                    success=True,
-                    message="No valid users found in repository results",
-                    candidates=[],
-                    search_metadata={"total_count": 0}
-                )
-                
-            logger.info(f"Found {len(unique_users)} unique users to analyze")
-            
-            # 4. Collect detailed profiles
-            users_to_collect = [
-                GitHubSearchUserResult(login=login, html_url=f"https://github.com/{login}")
-                for login in unique_users.keys()
-            ]
-            
-            profiles = await profile_collector.collect_profiles(users_to_collect)
-            
-            # 5. Filter and normalize profiles
-            filtered_profiles = []
-            for profile in profiles:
-                try:
-                    normalized = profile_normalizer.normalize(profile)
-                    if skill_activity_filter.matches_criteria(normalized, params):
-                        filtered_profiles.append(normalized)
-                except Exception as e:
-                    logger.warning(f"Error processing profile {profile.get('login')}: {e}")
-            
-            logger.info(f"Successfully processed {len(filtered_profiles)} profiles")
-            
-            return SearchResponse(
-                success=True,
-                message=f"Found {len(filtered_profiles)} matching candidates",
-                candidates=[p.dict() for p in filtered_profiles],
-                search_metadata={
-                    "total_count": len(filtered_profiles),
-                    "query": github_repo_query,
-                    "repositories_searched": len(repo_search_results['items']),
-                    "unique_users_found": len(unique_users)
-                }
-            )
-            
-        except RateLimitExceeded as e:
-            logger.error(f"GitHub API rate limit exceeded: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="GitHub API rate limit exceeded. Please try again later or provide a GitHub token for higher limits."
-            )
-        except Exception as e:
-            logger.error(f"Error during GitHub search: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error during GitHub search: {str(e)}"
-            )
-            
+        candidates, metadata = await asyncio.to_thread(
+            search_github,
+            params,
+            fetcher,
+            ProfileCollector(github_fetcher=fetcher),
+            per_page,
+            2  # Limit to 2 pages to avoid excessive API calls
+        )
+        metadata["truncated_stages"] = fetcher.deadline.truncated_stages
+        logger.info(f"Successfully processed {len(candidates)} profiles")
+
+        entry = result_cache.put(
+            cache_key,
+            candidates,
+            metadata={
+                "success": True,
+                "message": f"Found {len(candidates)} matching candidates",
+                "search_metadata": metadata,
+                "error": None
+            },
+            complete=not metadata["truncated_stages"],
+            scope="github_search"
+        )
+        return Response(render_page(entry, 0, page_size or SEARCH_PAGE_SIZE), media_type="application/json")
+
+    except RateLimitExceeded as e:
+        logger.error(f"GitHub API rate limit exceeded: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="GitHub API rate limit exceeded. Please try again later or provide a GitHub token for higher limits."
+        )
     except Exception as e:
-        logger.error(f"Unexpected error in search_github_candidates: {e}", exc_info=True)
+        logger.error(f"Error during GitHub search: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            detail=f"Error during GitHub search: {str(e)}"
         )
-        collected_raw_profiles = profile_collector.collect_profiles(users_to_collect)
-        print(f"Collected detailed data for {len(collected_raw_profiles)} profiles.")
-
-        # 4. Filter and Normalize profiles
-        final_candidates: List[CandidateProfile] = []
-        for raw_profile_data in collected_raw_profiles:
-            user_profile = raw_profile_data.get("user_profile", {})
-            user_repos = raw_profile_data.get("user_repos", [])
-
-            # Extract skills and analyze activity
-            extracted_skills = SkillActivityFilter.extract_skills(user_profile, user_repos)
-            activity_metrics = SkillActivityFilter.analyze_activity(user_profile, user_repos)
-            
-            # Combine all extracted and analyzed data
-            combined_data = {
-                **user_profile, 
-                "skills": extracted_skills, 
-                "top_languages": activity_metrics.get("top_languages"),
-                "total_stars": activity_metrics.get("total_stars"),
-                "recent_activity": activity_metrics.get("recent_activity"),
-                "oss_score": activity_metrics.get("oss_score"),
-            }
-            
-            # Normalize into CandidateProfile
-            candidate = ProfileNormalizer.normalize(user_profile, user_repos, combined_data)
-            
-            if candidate and SkillActivityFilter.apply_filters(candidate.dict()):
-                final_candidates.append(candidate)
-            else:
-                print(f"Skipping candidate: {candidate.github_username if candidate else 'Unknown'} (failed filter)")
-
-        print(f"Returning {len(final_candidates)} filtered candidates.")
-        return final_candidates
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}") 
\ No newline at end of file
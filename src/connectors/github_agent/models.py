@@ -21,6 +21,7 @@ class GitHubRepoSearchResult(BaseModel):
 
 class GitHubUserProfile(BaseModel):
     login: str
+    html_url: Optional[str] = None
     name: Optional[str] = None
     bio: Optional[str] = None
     location: Optional[str] = None
@@ -1,34 +1,65 @@
+import logging
 from typing import List, Dict, Optional
+from src.core.deadline import Deadline
+from src.core.log import item_logger
+from src.core.metrics import STAGE_LATENCY
+from src.core.tracing import span
 from src.connectors.github_agent.github_fetcher import GitHubFetcher
 from src.connectors.github_agent.models import GitHubSearchUserResult, GitHubUserProfile, GitHubRepo
 
+logger = logging.getLogger(__name__)
+items_logger = item_logger(__name__)
+
 class ProfileCollector:
     def __init__(self, github_fetcher: GitHubFetcher):
         self.github_fetcher = github_fetcher
 
-    def collect_profiles(self, user_search_results: List[GitHubSearchUserResult]) -> List[Dict]:
+    def collect_profiles(
+        self,
+        user_search_results: List[GitHubSearchUserResult],
+        deadline: Optional[Deadline] = None
+    ) -> List[Dict]:
+        with STAGE_LATENCY.labels("profile_collection").time(), span("github.collect_profiles", users=len(user_search_results)) as collect_span:
+            collected_profiles = self._collect(user_search_results, deadline)
+            collect_span.set("collected", len(collected_profiles))
+            return collected_profiles
+
+    def _collect(self, user_search_results: List[GitHubSearchUserResult], deadline: Optional[Deadline]) -> List[Dict]:
+        # Each user costs two calls; stop once the request deadline can't cover them
+        deadline = deadline or self.github_fetcher.deadline
         collected_profiles = []
-        print(f"Collecting detailed profiles for {len(user_search_results)} users...")
+        logger.info(f"Collecting detailed profiles for {len(user_search_results)} users...")
+
+        for index, user_result in enumerate(user_search_results):
+            if not deadline.can_afford(2 * Deadline.MIN_CALL_BUDGET):
+                deadline.mark_truncated("github.collect_profiles")
+                logger.warning(f"Deadline reached: collected {index} of {len(user_search_results)} profiles.")
+                break
 
-        for user_result in user_search_results:
             username = user_result.login
-            print(f"  -> Collecting data for user: {username}")
-
-            profile_data = self.github_fetcher.get_user_profile(username)
-            repo_data = self.github_fetcher.get_user_repos(username)
-
-            if profile_data and repo_data is not None: # Check if repo_data is not None (can be empty list)
-                collected_profiles.append({
-                    "user_profile": GitHubUserProfile(**profile_data).dict(),
-                    "user_repos": [GitHubRepo(**repo).dict() for repo in repo_data]
-                })
-            elif profile_data:
-                print(f"    Warning: No public repositories found for {username}, collecting profile only.")
-                collected_profiles.append({
-                    "user_profile": GitHubUserProfile(**profile_data).dict(),
-                    "user_repos": [] # Empty list if no repos
-                })
-            else:
-                print(f"    Error: Failed to collect profile for {username}. Skipping.")
-
-        return collected_profiles 
\ No newline at end of file
+            items_logger.info("Collecting data for user: %s", username)
+            with span("github.collect_profile", username=username):
+                collected = self._collect_one(username)
+            if collected:
+                collected_profiles.append(collected)
+
+        return collected_profiles
+
+    def _collect_one(self, username: str) -> Optional[Dict]:
+        profile_data = self.github_fetcher.get_user_profile(username)
+        repo_data = self.github_fetcher.get_user_repos(username)
+
+        if profile_data and repo_data is not None: # Check if repo_data is not None (can be empty list)
+            return {
+                "user_profile": GitHubUserProfile(**profile_data).dict(),
+                "user_repos": [GitHubRepo(**repo).dict() for repo in repo_data]
+            }
+        elif profile_data:
+            items_logger.info("No public repositories found for %s, collecting profile only.", username)
+            return {
+                "user_profile": GitHubUserProfile(**profile_data).dict(),
+                "user_repos": [] # Empty list if no repos
+            }
+        else:
+            logger.warning(f"Failed to collect profile for {username}. Skipping.")
+            return None
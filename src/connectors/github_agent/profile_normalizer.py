@@ -21,7 +21,7 @@ class ProfileNormalizer:
         top_repo_details = None
         if repo_data:
             # Sort repos by stars, then by forks
-            sorted_repos = sorted(repo_data, key=lambda r: (r.get("stargazers_count", 0), r.get("forks_count", 0)), reverse=True)
+            sorted_repos = sorted(repo_data, key=lambda r: (r.get("stargazers_count") or 0, r.get("forks_count") or 0), reverse=True)
             if sorted_repos:
                 top_repo = sorted_repos[0]
                 top_repo_details = {
@@ -34,6 +34,7 @@ class ProfileNormalizer:
             github_username=profile_obj.login,
             github_url=profile_obj.html_url, # Assuming html_url is available in profile_obj
             location=profile_obj.location,
+            website=profile_obj.blog or None,
             skills=extracted_skills_and_activity.get("skills"),
             top_languages=extracted_skills_and_activity.get("top_languages"),
             total_stars=extracted_skills_and_activity.get("total_stars"),
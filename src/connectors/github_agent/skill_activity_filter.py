@@ -1,6 +1,11 @@
 from typing import List, Dict, Optional
 import datetime
 
+from src.core.log import item_logger
+from src.core.metrics import CANDIDATES_DROPPED
+
+items_logger = item_logger(__name__)
+
 class SkillActivityFilter:
     @staticmethod
     def extract_skills(profile_data: Dict, repo_data: List[Dict]) -> List[str]:
@@ -13,20 +18,20 @@ class SkillActivityFilter:
         
         # From repo topics (if available)
         for repo in repo_data:
-            for topic in repo.get("topics", []):
+            for topic in repo.get("topics") or []:
                 skills.add(topic)
 
         # From repo descriptions and user bio (basic keyword matching)
         keywords = ["AI", "ML", "Gen-AI", "Machine Learning", "Artificial Intelligence", 
                     "LangChain", "RAG", "LLM", "NLP", "Deep Learning", "Python", "TensorFlow", "PyTorch"]
         
-        bio = profile_data.get("bio", "").lower()
+        bio = (profile_data.get("bio") or "").lower()
         for keyword in keywords:
             if keyword.lower() in bio:
                 skills.add(keyword)
 
         for repo in repo_data:
-            description = repo.get("description", "").lower()
+            description = (repo.get("description") or "").lower()
             for keyword in keywords:
                 if keyword.lower() in description:
                     skills.add(keyword)
@@ -40,7 +45,7 @@ class SkillActivityFilter:
         last_active_timestamp: Optional[datetime.datetime] = None
 
         for repo in repo_data:
-            total_stars += repo.get("stargazers_count", 0)
+            total_stars += repo.get("stargazers_count") or 0
             if repo.get("language"):
                 lang = repo["language"]
                 top_languages[lang] = top_languages.get(lang, 0) + 1
@@ -56,8 +61,8 @@ class SkillActivityFilter:
                     pass # Handle malformed dates
 
         # Basic OSS score (can be refined)
-        followers = profile_data.get("followers", 0)
-        public_repos = profile_data.get("public_repos", 0)
+        followers = profile_data.get("followers") or 0
+        public_repos = profile_data.get("public_repos") or 0
         oss_score = (total_stars * 0.5) + (followers * 0.3) + (public_repos * 0.2)
 
         sorted_languages = sorted(top_languages.items(), key=lambda item: item[1], reverse=True)
@@ -78,13 +83,16 @@ class SkillActivityFilter:
                 recent_activity = datetime.datetime.fromisoformat(recent_activity_str.replace("Z", "+00:00"))
                 six_months_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30 * required_activity_months)
                 if recent_activity < six_months_ago:
-                    print(f"Filtering out {candidate_data.get('github_username')}: Last activity too old.")
+                    items_logger.info("Filtering out %s: Last activity too old.", candidate_data.get('github_username'))
+                    CANDIDATES_DROPPED.labels("stale_activity").inc()
                     return False
             except ValueError:
-                print(f"Filtering out {candidate_data.get('github_username')}: Invalid recent_activity timestamp.")
+                items_logger.info("Filtering out %s: Invalid recent_activity timestamp.", candidate_data.get('github_username'))
+                CANDIDATES_DROPPED.labels("invalid_activity").inc()
                 return False
         else:
-            print(f"Filtering out {candidate_data.get('github_username')}: No recent activity found.")
+            items_logger.info("Filtering out %s: No recent activity found.", candidate_data.get('github_username'))
+            CANDIDATES_DROPPED.labels("no_activity").inc()
             return False
             
         # You can add more filters here (e.g., minimum stars, specific skills required)
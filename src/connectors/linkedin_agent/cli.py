@@ -1,48 +1,34 @@
 import sys
 import os
 import json
-from typing import List
+import logging
+from typing import List, Optional
 
 # Add the project root to sys.path for module discovery
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
+from src.core.deadline import Deadline
+from src.core.log import configure_logging
 from src.core.models import SearchParams, CandidateProfile
-from src.connectors.linkedin_agent.search_query_generator import LinkedInSearchQueryGenerator
 from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher
-from src.connectors.linkedin_agent.profile_normalizer import LinkedInProfileNormalizer
-from src.connectors.linkedin_agent.models import LinkedInRawProfile
 
-def run_linkedin_search(nlp_output: dict) -> List[CandidateProfile]:
+logger = logging.getLogger(__name__)
+
+def run_linkedin_search(nlp_output: dict, deadline: Optional[Deadline] = None) -> List[CandidateProfile]:
     try:
-        # 1. Generate LinkedIn search query
         params = SearchParams(**nlp_output)
-        linkedin_query = LinkedInSearchQueryGenerator.generate_linkedin_search_query(params)
-        print(f"\nGenerated LinkedIn search query: {linkedin_query}")
-
-        # 2. Search for profiles using the LinkedIn Fetcher (simulated)
-        fetcher = LinkedInFetcher()
-        raw_profile_results = fetcher.search_profiles(linkedin_query)
-        print(f"Found {len(raw_profile_results)} raw LinkedIn profiles.")
+        # Pages through the search, fetching and normalizing profiles until the limit is reached
+        fetcher = LinkedInFetcher(deadline=deadline)
+        candidate_profiles = fetcher.search_candidates(params)
 
-        candidate_profiles: List[CandidateProfile] = []
-        for raw_profile_summary in raw_profile_results:
-            # 3. Fetch detailed profile (simulated)
-            detailed_raw_profile = fetcher.get_profile_details(raw_profile_summary.get("profile_url"))
-            
-            if detailed_raw_profile:
-                # 4. Normalize the raw profile into CandidateProfile
-                linkedin_raw_profile_model = LinkedInRawProfile(**detailed_raw_profile)
-                normalized_profile = LinkedInProfileNormalizer.normalize_profile(linkedin_raw_profile_model)
-                candidate_profiles.append(normalized_profile)
-        
         if not candidate_profiles:
-            print("No LinkedIn candidates found matching the criteria.")
+            logger.info("No LinkedIn candidates found matching the criteria.")
 
-        print(f"Returning {len(candidate_profiles)} filtered candidates.")
+        logger.info(f"Returning {len(candidate_profiles)} filtered candidates.")
         return candidate_profiles
 
     except Exception as e:
-        print(f"Error during LinkedIn search: {e}")
+        logger.error(f"Error during LinkedIn search: {e}")
         return []
 
 if __name__ == "__main__":
@@ -56,6 +42,7 @@ if __name__ == "__main__":
       "work_type": "full-time"
     }
 
+    configure_logging(fmt="text")
     print("--- Starting LinkedIn Talent Search CLI Test ---")
     print(f"Input NLP Output: {json.dumps(sample_nlp_output, indent=2)}")
     
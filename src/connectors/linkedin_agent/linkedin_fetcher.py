@@ -1,7 +1,160 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+import asyncio
+import collections
+import contextvars
+import logging
 import os
+import threading
+import time
+import httpx
 import requests
 
+from src.connectors.linkedin_agent.locations import location_filters
+from src.connectors.linkedin_agent.models import LinkedInRawProfile
+from src.connectors.linkedin_agent.profile_normalizer import LinkedInProfileNormalizer
+from src.connectors.linkedin_agent.search_query_generator import LinkedInSearchQueryGenerator
+from src.connectors.linkedin_agent.proxycurl_cache import PROXYCURL_CREDIT_COSTS, credits_charged, get_credit_ledger, get_proxycurl_cache
+from src.core.deadline import Deadline, ensure_deadline
+from src.core.metrics import LINKEDIN_REQUESTS, PROXYCURL_BUDGET_EXHAUSTED, STAGE_LATENCY
+from src.core.models import CandidateProfile, SearchParams
+from src.core.replay import httpx_transport, replay_session
+from src.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Proxycurl request budget shared by every fetcher in the process
+PROXYCURL_RPM = int(os.getenv("PROXYCURL_RPM", "300"))
+# Profile detail lookups in flight at once; also the size of the shared connection pool
+PROXYCURL_CONCURRENCY = int(os.getenv("PROXYCURL_CONCURRENCY", "10"))
+# Tenant whose credit budget pays for calls made without an explicit tenant
+PROXYCURL_DEFAULT_TENANT = os.getenv("PROXYCURL_DEFAULT_TENANT", "default")
+# Country searched when SearchParams.location names no place at all (ISO 3166-1 alpha-2; empty for none)
+PROXYCURL_SEARCH_COUNTRY = os.getenv("PROXYCURL_SEARCH_COUNTRY", "us")
+# Most result pages one search follows
+PROXYCURL_SEARCH_MAX_PAGES = int(os.getenv("PROXYCURL_SEARCH_MAX_PAGES", "5"))
+# Candidates a search returns when neither the caller nor SearchParams.limit sets a limit
+LINKEDIN_SEARCH_DEFAULT_LIMIT = int(os.getenv("LINKEDIN_SEARCH_DEFAULT_LIMIT", "10"))
+
+# Base URL of the Proxycurl API, e.g. a local stand-in
+PROXYCURL_API_URL = os.getenv("PROXYCURL_API_URL", "https://nubela.co/proxycurl").rstrip("/")
+PROFILE_DETAILS_URL = f"{PROXYCURL_API_URL}/api/v2/linkedin"
+# `extra` adds the personal website (one more credit per call), which entity resolution matches on
+PROFILE_DETAILS_EXTRA = {"extra": "include"}
+SEARCH_URL = f"{PROXYCURL_API_URL}/api/linkedin/search/people"
+
+
+class RateLimiter:
+    """
+    Sliding one-minute window of request start times. reserve() books the next free slot
+    and returns how long to wait before using it, so callers on any thread or event loop
+    share one budget. With max_wait, a slot further out than that isn't booked at all, so
+    a call that can't wait for it doesn't hold a slot it will never use.
+    """
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = max(1, requests_per_minute)
+        self._starts = collections.deque()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before sending, or None (nothing booked) if that would exceed max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            while self._starts and self._starts[0] <= now - 60:
+                self._starts.popleft()
+            start = now
+            if len(self._starts) >= self.requests_per_minute:
+                start = max(now, self._starts[-self.requests_per_minute] + 60)
+            if max_wait is not None and start - now > max_wait:
+                return None
+            self._starts.append(start)
+            return start - now
+
+
+class _ProxycurlPool:
+    """
+    Pooled HTTP clients for Proxycurl: a requests.Session for the blocking calls, and an
+    httpx.AsyncClient driven by one background event loop thread, so concurrent detail
+    lookups reuse warm connections no matter which thread or loop asks for them.
+    Both go through the record/replay transports when HTTP_REPLAY_MODE is set.
+    """
+
+    def __init__(self, max_connections: int):
+        self.session = replay_session("proxycurl", pool_connections=1, pool_maxsize=max_connections)
+        self.loop = asyncio.new_event_loop()
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = httpx.AsyncClient(transport=httpx_transport("proxycurl", asynchronous=True, limits=limits))
+        threading.Thread(target=self.loop.run_forever, name="proxycurl-pool", daemon=True).start()
+
+    def run(self, coroutine):
+        """
+        Schedules a coroutine on the pool's loop; returns a concurrent.futures.Future. It runs
+        in a copy of the caller's context, so its spans and log records keep the caller's
+        request id and parent span.
+        """
+        # The task is created from a callback scheduled in this context, and copies it
+        return contextvars.copy_context().run(asyncio.run_coroutine_threadsafe, coroutine, self.loop)
+
+
+_pool: Optional[_ProxycurlPool] = None
+_pool_lock = threading.Lock()
+_rate_limiter = RateLimiter(PROXYCURL_RPM)
+
+
+def get_proxycurl_pool() -> _ProxycurlPool:
+    """Process-wide Proxycurl client pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _ProxycurlPool(PROXYCURL_CONCURRENCY)
+        return _pool
+
+
+async def _on_pool(coroutine):
+    """Awaits a coroutine run on the Proxycurl pool's event loop, from any loop (including that one)."""
+    return await asyncio.wrap_future(get_proxycurl_pool().run(coroutine))
+
+
+def _split_url(url: str) -> Tuple[str, Dict[str, str]]:
+    """A URL without its query string, plus the query as params (so next_page links share the search cache)."""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(query="")), dict(parse_qsl(parts.query))
+
+
+def _map_search_results(data) -> Optional[List[Dict]]:
+    """Profile summaries from a search response; None if the response isn't a recognized shape."""
+    results = data.get("results", data.get("profiles")) if isinstance(data, dict) else data
+    if not isinstance(results, list):
+        return None
+    return [
+        {
+            "profile_url": person.get("linkedin_profile_url"),
+            "name": person.get("full_name") or person.get("name"),
+            "headline": person.get("headline"),
+            "location": person.get("location"),
+            "skills": person.get("skills") or [],
+        }
+        for person in results
+    ]
+
+
+def _map_profile_details(profile_url: str, data: Dict) -> Dict:
+    """Maps a Proxycurl profile response to LinkedInRawProfile fields."""
+    return {
+        "profile_url": profile_url,
+        "name": data.get("full_name") or data.get("first_name"),
+        "headline": data.get("headline"),
+        "location": data.get("location"),
+        "industry": data.get("industry"),
+        "summary": data.get("summary"),
+        "experience": data.get("experiences"),
+        "education": data.get("education"),
+        "skills": data.get("skills") or [],
+        "website": (data.get("extra") or {}).get("website"),
+    }
+
+
 class LinkedInFetcher:
     """
     A placeholder class for fetching data from LinkedIn.
@@ -13,74 +166,273 @@ class LinkedInFetcher:
     
     This class is illustrative and will return mock data or raise warnings for demonstration purposes.
     """
-    def __init__(self):
+    REQUEST_TIMEOUT = 15  # seconds, capped by the deadline's remaining budget
+
+    def __init__(self, deadline: Optional[Deadline] = None, tenant: Optional[str] = None):
+        self.deadline = ensure_deadline(deadline)
+        self.tenant = tenant or PROXYCURL_DEFAULT_TENANT
+        self.cache = get_proxycurl_cache()
+        self.ledger = get_credit_ledger()
         self.api_key = ("8vd9dJ7Mk0SF642RvbzDOQ")
-        self.base_url = "https://nubela.co/proxycurl/api/linkedin/search/people"
+        self.base_url = SEARCH_URL
         if not self.api_key:
-            print("WARNING: PROXYCURL_API_KEY environment variable not set. LinkedInFetcher will not work.")
+            logger.warning("PROXYCURL_API_KEY environment variable not set. LinkedInFetcher will not work.")
+
+    def _get(self, endpoint: str, url: str, params: Dict) -> requests.Response:
+        """GET against Proxycurl, recording latency and status under the given endpoint name."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        with STAGE_LATENCY.labels(f"linkedin_{endpoint}").time(), span("linkedin.http", method="GET", endpoint=endpoint) as http_span:
+            try:
+                response = get_proxycurl_pool().session.get(url, headers=headers, params=params, timeout=self.deadline.timeout(self.REQUEST_TIMEOUT))
+            except requests.exceptions.RequestException:
+                LINKEDIN_REQUESTS.labels(endpoint, "error").inc()
+                raise
+            http_span.set("status", response.status_code)
+            http_span.set("bytes", len(response.content or b""))
+        LINKEDIN_REQUESTS.labels(endpoint, response.status_code).inc()
+        return response
+
+    async def _aget(self, endpoint: str, url: str, params: Dict) -> httpx.Response:
+        """_get on the pooled async client; runs on the pool's event loop."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        with STAGE_LATENCY.labels(f"linkedin_{endpoint}").time(), span("linkedin.http", method="GET", endpoint=endpoint) as http_span:
+            try:
+                response = await get_proxycurl_pool().client.get(url, headers=headers, params=params, timeout=self.deadline.timeout(self.REQUEST_TIMEOUT))
+            except httpx.HTTPError:
+                LINKEDIN_REQUESTS.labels(endpoint, "error").inc()
+                raise
+            http_span.set("status", response.status_code)
+            http_span.set("bytes", len(response.content or b""))
+        LINKEDIN_REQUESTS.labels(endpoint, response.status_code).inc()
+        return response
+
+    def _cached(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        return self.cache.get(endpoint, params) if self.cache is not None else None
+
+    def _over_budget(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """What to serve when the tenant's credit budget refuses a call: a stale cached response, or None."""
+        stale = self.cache.get(endpoint, params, allow_stale=True) if self.cache is not None else None
+        # Stale or missing, the result is incomplete and shouldn't be cached as a full answer
+        self.deadline.mark_truncated(f"linkedin.{endpoint}")
+        PROXYCURL_BUDGET_EXHAUSTED.labels(endpoint, "stale" if stale is not None else "empty").inc()
+        logger.warning(
+            f"Proxycurl credit budget of tenant {self.tenant} exhausted; "
+            f"{'serving a stale cached' if stale is not None else 'no cached'} {endpoint} response."
+        )
+        return stale
 
-    def search_profiles(self, query: str) -> List[Dict]:
+    def _skip_for_deadline(self, endpoint: str):
+        self.deadline.mark_truncated(f"linkedin.{endpoint}")
+        logger.warning(f"Skipping Proxycurl {endpoint} call: request deadline exceeded.")
+
+    def _reserve_slot(self, endpoint: str) -> Optional[float]:
         """
-        Searches for LinkedIn profiles using Proxycurl API based on a generated query.
+        The last step before sending, after the deadline and credit checks: books a rate-limit
+        slot and returns the wait for it. If the wait doesn't fit the deadline, no slot is
+        booked, the reserved credits are returned and None comes back.
         """
-        if not self.api_key:
-            print("No Proxycurl API key set. Returning empty result.")
-            return []
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        params = {"keywords": query, "country": "us", "page": 1}  # Adjust country/page as needed
+        wait = _rate_limiter.reserve(max_wait=self.deadline.remaining() - Deadline.MIN_CALL_BUDGET)
+        if wait is None:
+            self.ledger.settle(self.tenant, endpoint, PROXYCURL_CREDIT_COSTS[endpoint], 0.0)
+            self._skip_for_deadline(endpoint)
+        return wait
+
+    def _accept(self, endpoint: str, params: Dict, response) -> Dict:
+        """Settles the call's credits, then returns (and caches) its JSON; HTTP errors raise."""
+        reserved = PROXYCURL_CREDIT_COSTS[endpoint]
+        self.ledger.settle(self.tenant, endpoint, reserved, credits_charged(response, reserved))
+        response.raise_for_status()
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(endpoint, params, data)
+        return data
+
+    def _fetch_json(self, endpoint: str, url: str, params: Dict) -> Optional[Dict]:
+        """
+        Proxycurl JSON for a call: from the cache while fresh, otherwise fetched, paid from the
+        tenant's daily credit budget and cached. Past the budget a stale cached response is
+        returned instead, or None; also None when the deadline can't fit the call.
+        """
+        data = self._cached(endpoint, params)
+        if data is not None:
+            return data
+        if not self.deadline.can_afford(Deadline.MIN_CALL_BUDGET):
+            self._skip_for_deadline(endpoint)
+            return None
+        if not self.ledger.reserve(self.tenant, endpoint, PROXYCURL_CREDIT_COSTS[endpoint]):
+            return self._over_budget(endpoint, params)
+        wait = self._reserve_slot(endpoint)
+        if wait is None:
+            return None
+        if wait > 0:
+            time.sleep(wait)
         try:
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            # Proxycurl returns a list of people under 'results' or similar; adjust as per actual API response
-            results = data.get("results") or data.get("profiles") or data
-            if not isinstance(results, list):
-                print(f"Unexpected Proxycurl response: {data}")
-                return []
-            # Map Proxycurl fields to expected output
-            mapped = []
-            for person in results:
-                mapped.append({
-                    "profile_url": person.get("linkedin_profile_url"),
-                    "name": person.get("full_name") or person.get("name"),
-                    "headline": person.get("headline"),
-                    "location": person.get("location"),
-                    "skills": person.get("skills") or [],
-                })
-            return mapped
-        except Exception as e:
-            print(f"Error fetching from Proxycurl: {e}")
-            return []
+            response = self._get(endpoint, url, params)
+        except Exception:
+            self.ledger.settle(self.tenant, endpoint, PROXYCURL_CREDIT_COSTS[endpoint], 0.0)
+            raise
+        return self._accept(endpoint, params, response)
+
+    async def _afetch_json(self, endpoint: str, url: str, params: Dict) -> Optional[Dict]:
+        """
+        _fetch_json on the pooled async client. The SQLite cache and ledger calls block, so
+        they run in worker threads rather than stall every other lookup on the pool's loop.
+        """
+        data = await asyncio.to_thread(self._cached, endpoint, params)
+        if data is not None:
+            return data
+        if not self.deadline.can_afford(Deadline.MIN_CALL_BUDGET):
+            self._skip_for_deadline(endpoint)
+            return None
+        if not await asyncio.to_thread(self.ledger.reserve, self.tenant, endpoint, PROXYCURL_CREDIT_COSTS[endpoint]):
+            return await asyncio.to_thread(self._over_budget, endpoint, params)
+        wait = await asyncio.to_thread(self._reserve_slot, endpoint)
+        if wait is None:
+            return None
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            response = await self._aget(endpoint, url, params)
+        except Exception:
+            await asyncio.to_thread(self.ledger.settle, self.tenant, endpoint, PROXYCURL_CREDIT_COSTS[endpoint], 0.0)
+            raise
+        return await asyncio.to_thread(self._accept, endpoint, params, response)
 
     def get_profile_details(self, profile_url: str) -> Optional[Dict]:
         """
         Fetches detailed information for a given LinkedIn profile URL using Proxycurl's LinkedIn Profile Endpoint.
         """
         if not self.api_key:
-            print("No Proxycurl API key set. Returning None.")
+            logger.warning("No Proxycurl API key set. Returning None.")
             return None
         if not profile_url:
-            print("No profile_url provided.")
+            logger.warning("No profile_url provided.")
             return None
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        endpoint = "https://nubela.co/proxycurl/api/v2/linkedin"  # v2 endpoint for profile details
-        params = {"url": profile_url}
         try:
-            response = requests.get(endpoint, headers=headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            # Map Proxycurl fields to LinkedInRawProfile fields
-            return {
-                "profile_url": profile_url,
-                "name": data.get("full_name") or data.get("first_name"),
-                "headline": data.get("headline"),
-                "location": data.get("location"),
-                "industry": data.get("industry"),
-                "summary": data.get("summary"),
-                "experience": data.get("experiences"),
-                "education": data.get("education"),
-                "skills": data.get("skills") or [],
-            }
+            data = self._fetch_json("details", PROFILE_DETAILS_URL, {"url": profile_url, **PROFILE_DETAILS_EXTRA})
+            return _map_profile_details(profile_url, data) if data is not None else None
         except Exception as e:
-            print(f"Error fetching profile details from Proxycurl: {e}")
-            return None 
\ No newline at end of file
+            logger.error(f"Error fetching profile details from Proxycurl: {e}")
+            return None
+
+    async def _profile_details_async(self, profile_url: Optional[str], slots: asyncio.Semaphore) -> Optional[Dict]:
+        if not profile_url:
+            return None
+        async with slots:
+            try:
+                data = await self._afetch_json("details", PROFILE_DETAILS_URL, {"url": profile_url, **PROFILE_DETAILS_EXTRA})
+                return _map_profile_details(profile_url, data) if data is not None else None
+            except Exception as e:
+                logger.error(f"Error fetching profile details from Proxycurl: {e}")
+                return None
+
+    async def _profile_details_many(self, profile_urls: List[Optional[str]], concurrency: int) -> List[Optional[Dict]]:
+        slots = asyncio.Semaphore(max(1, concurrency))
+        return await asyncio.gather(*(self._profile_details_async(url, slots) for url in profile_urls))
+
+    def get_profile_details_many(self, profile_urls: List[Optional[str]], concurrency: Optional[int] = None) -> List[Optional[Dict]]:
+        """
+        Fetches profile details for many URLs concurrently on the pooled async client, at most
+        `concurrency` (default PROXYCURL_CONCURRENCY) in flight and within PROXYCURL_RPM.
+        Returns one entry per URL, in order; None where the lookup failed or was skipped.
+        Blocks the calling thread; async code should use aget_profile_details_many.
+        """
+        if not self.api_key:
+            logger.warning("No Proxycurl API key set. Returning no details.")
+            return [None] * len(profile_urls)
+        future = get_proxycurl_pool().run(self._profile_details_many(list(profile_urls), concurrency or PROXYCURL_CONCURRENCY))
+        return future.result()
+
+    async def aget_profile_details_many(self, profile_urls: List[Optional[str]], concurrency: Optional[int] = None) -> List[Optional[Dict]]:
+        """get_profile_details_many for callers already on an event loop."""
+        if not self.api_key:
+            logger.warning("No Proxycurl API key set. Returning no details.")
+            return [None] * len(profile_urls)
+        return await _on_pool(self._profile_details_many(list(profile_urls), concurrency or PROXYCURL_CONCURRENCY))
+
+    async def iter_search_pages(self, params: SearchParams, max_pages: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Pages of profile summaries for a search, fetched lazily: a page is only requested when
+        the caller asks for the next one. A location with a known country is sent as
+        country/city/region filters (see location_filters); any other place is searched as
+        keywords, and PROXYCURL_SEARCH_COUNTRY only applies when no place is named. Follows
+        the response's `next_page` link when there is one, else increments `page`; stops on an
+        empty page, after max_pages (default PROXYCURL_SEARCH_MAX_PAGES), or when a page can't
+        be fetched (deadline, budget, error). An error on the first page is raised; on a later
+        page the search is marked truncated.
+        """
+        if not self.api_key:
+            logger.warning("No Proxycurl API key set. Returning empty result.")
+            return
+        url = self.base_url
+        filters, keyword_places = location_filters(params.location)
+        keywords = [LinkedInSearchQueryGenerator.generate_linkedin_search_query(params, include_location=False), *keyword_places]
+        query = {"keywords": " ".join(part for part in keywords if part)}
+        if not filters and not keyword_places and PROXYCURL_SEARCH_COUNTRY:
+            query["country"] = PROXYCURL_SEARCH_COUNTRY
+        query.update(filters, page=1)
+        logger.info(f"Proxycurl search: {query}")
+        for page_number in range(1, (max_pages or PROXYCURL_SEARCH_MAX_PAGES) + 1):
+            try:
+                data = await _on_pool(self._afetch_json("search", url, query))
+            except Exception as e:
+                logger.error(f"Error fetching search page {page_number} from Proxycurl: {e}")
+                if page_number == 1:
+                    raise  # nothing found yet: the search failed rather than came back short
+                self.deadline.mark_truncated("linkedin.search")
+                return
+            if data is None:
+                return
+            results = _map_search_results(data)
+            if results is None:
+                logger.warning(f"Unexpected Proxycurl response: {data}")
+                return
+            if not results:
+                return
+            yield results
+            if isinstance(data, dict) and "next_page" in data:
+                if not data["next_page"]:
+                    return
+                url, query = _split_url(data["next_page"])
+            else:
+                query = {**query, "page": int(query.get("page", page_number)) + 1}
+
+    async def iter_candidates(
+        self,
+        params: SearchParams,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[CandidateProfile]:
+        """
+        Normalized candidates for a search, stopping once `limit` (default params.limit, else
+        LINKEDIN_SEARCH_DEFAULT_LIMIT) have been yielded. Details are fetched concurrently for
+        only as many hits as are still needed, so neither pages nor profiles past the limit
+        are paid for. Profiles repeated across pages are returned once.
+        """
+        limit = limit or params.limit or LINKEDIN_SEARCH_DEFAULT_LIMIT
+        found = 0
+        seen = set()
+        pages = self.iter_search_pages(params)
+        try:
+            async for page in pages:
+                urls = []
+                for hit in page:
+                    if hit.get("profile_url") and hit["profile_url"] not in seen:
+                        seen.add(hit["profile_url"])
+                        urls.append(hit["profile_url"])
+                while urls and found < limit:
+                    batch, urls = urls[:limit - found], urls[limit - found:]
+                    for detail in await self.aget_profile_details_many(batch, concurrency):
+                        if detail:
+                            found += 1
+                            yield LinkedInProfileNormalizer.normalize_profile(LinkedInRawProfile(**detail))
+                if found >= limit:
+                    return
+        finally:
+            await pages.aclose()
+
+    def search_candidates(self, params: SearchParams, limit: Optional[int] = None) -> List[CandidateProfile]:
+        """iter_candidates for blocking callers: runs the search on the pool's event loop and returns the list."""
+        async def collect():
+            return [candidate async for candidate in self.iter_candidates(params, limit)]
+        return get_proxycurl_pool().run(collect()).result() 
\ No newline at end of file
@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Tuple
+
+# Country names and aliases -> ISO 3166-1 alpha-2 code, as Proxycurl's `country` filter expects
+COUNTRIES: Dict[str, str] = {
+    "argentina": "ar", "australia": "au", "austria": "at", "bangladesh": "bd", "belgium": "be",
+    "brazil": "br", "bulgaria": "bg", "canada": "ca", "chile": "cl", "china": "cn",
+    "colombia": "co", "croatia": "hr", "czech republic": "cz", "czechia": "cz", "denmark": "dk",
+    "egypt": "eg", "estonia": "ee", "finland": "fi", "france": "fr", "germany": "de",
+    "greece": "gr", "hong kong": "hk", "hungary": "hu", "india": "in", "indonesia": "id",
+    "ireland": "ie", "israel": "il", "italy": "it", "japan": "jp", "kenya": "ke",
+    "latvia": "lv", "lithuania": "lt", "luxembourg": "lu", "malaysia": "my", "mexico": "mx",
+    "netherlands": "nl", "the netherlands": "nl", "new zealand": "nz", "nigeria": "ng", "norway": "no",
+    "pakistan": "pk", "peru": "pe", "philippines": "ph", "poland": "pl", "portugal": "pt",
+    "romania": "ro", "saudi arabia": "sa", "serbia": "rs", "singapore": "sg", "slovakia": "sk",
+    "slovenia": "si", "south africa": "za", "south korea": "kr", "korea": "kr", "spain": "es",
+    "sweden": "se", "switzerland": "ch", "taiwan": "tw", "thailand": "th", "turkey": "tr",
+    "ukraine": "ua", "united arab emirates": "ae", "uae": "ae", "united kingdom": "gb", "uk": "gb",
+    "great britain": "gb", "england": "gb", "scotland": "gb", "wales": "gb",
+    "united states": "us", "united states of america": "us", "usa": "us", "vietnam": "vn",
+}
+COUNTRY_CODES = set(COUNTRIES.values())
+
+# US states by postal code, so "Austin, TX" can be filtered as city + region + country
+US_STATES: Dict[str, str] = {
+    "al": "Alabama", "ak": "Alaska", "az": "Arizona", "ar": "Arkansas", "ca": "California",
+    "co": "Colorado", "ct": "Connecticut", "de": "Delaware", "dc": "District of Columbia", "fl": "Florida",
+    "ga": "Georgia", "hi": "Hawaii", "id": "Idaho", "il": "Illinois", "in": "Indiana",
+    "ia": "Iowa", "ks": "Kansas", "ky": "Kentucky", "la": "Louisiana", "me": "Maine",
+    "md": "Maryland", "ma": "Massachusetts", "mi": "Michigan", "mn": "Minnesota", "ms": "Mississippi",
+    "mo": "Missouri", "mt": "Montana", "ne": "Nebraska", "nv": "Nevada", "nh": "New Hampshire",
+    "nj": "New Jersey", "nm": "New Mexico", "ny": "New York", "nc": "North Carolina", "nd": "North Dakota",
+    "oh": "Ohio", "ok": "Oklahoma", "or": "Oregon", "pa": "Pennsylvania", "ri": "Rhode Island",
+    "sc": "South Carolina", "sd": "South Dakota", "tn": "Tennessee", "tx": "Texas", "ut": "Utah",
+    "vt": "Vermont", "va": "Virginia", "wa": "Washington", "wv": "West Virginia", "wi": "Wisconsin",
+    "wy": "Wyoming",
+}
+_US_STATE_NAMES = {name.lower(): name for name in US_STATES.values()}
+
+# Locations that don't restrict where a candidate is
+ANYWHERE = {"remote", "anywhere", "worldwide", "global"}
+
+
+def country_code(name: str) -> Optional[str]:
+    """ISO code for a country name, alias or code we know; None for anything else (e.g. "Europe")."""
+    name = name.strip().lower()
+    if name in COUNTRY_CODES:
+        return name
+    return COUNTRIES.get(name)
+
+
+def us_state(name: str) -> Optional[str]:
+    """Full state name for a US state's name or postal code."""
+    name = name.strip().lower()
+    return US_STATES.get(name) or _US_STATE_NAMES.get(name)
+
+
+def _place_filters(place: str) -> Optional[Dict[str, str]]:
+    """Filters for one place, or None when its country can't be told (a bare city, a continent)."""
+    parts = [part.strip() for part in place.split(",") if part.strip()]
+    if not parts:
+        return None
+    city, last = parts[0], parts[-1]
+    if len(parts) == 1:
+        country = country_code(last)
+        if country:
+            return {"country": country}
+        # A state's full name ("California"); a bare two-letter code is a country, not a state
+        state = us_state(last) if len(last) > 2 else None
+        return {"country": "us", "region": state} if state else None
+    if len(parts) == 2:
+        # "City, ST": a state comes before a country, so "Austin, CA" is California, not Canada
+        state = us_state(last)
+        if state:
+            return {"country": "us", "region": state, "city": city}
+        country = country_code(last)
+        return {"country": country, "city": city} if country else None
+    country = country_code(last)
+    if not country:
+        return None
+    region = us_state(parts[-2]) if country == "us" else parts[-2]
+    return {"country": country, "region": region, "city": city} if region else None
+
+
+def location_filters(location) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Proxycurl search filters for SearchParams.location, plus the places left to search as
+    keywords. Filters are only set for a place whose country is known ("Berlin, Germany",
+    "Austin, TX", "DE"), and city/region only together with that country. A place without
+    a known country ("Berlin", "Europe") goes to keywords, as do all places of a list with
+    more than one, since the API filters on a single place. remote/anywhere is dropped.
+    """
+    places = [" ".join((place or "").split()).strip(", ") for place in (location if isinstance(location, list) else [location])]
+    places = [place for place in places if place and place.lower() not in ANYWHERE]
+    if len(places) != 1:
+        return {}, places
+    filters = _place_filters(places[0])
+    return (filters, []) if filters else ({}, places)
@@ -1,10 +1,13 @@
-from fastapi import FastAPI, HTTPException
-from typing import List
+from fastapi import Depends, FastAPI, HTTPException
+from typing import List, Optional
+import logging
+import os
+from src.core.deadline import Deadline
 from src.core.models import SearchParams, CandidateProfile
-from src.connectors.linkedin_agent.search_query_generator import LinkedInSearchQueryGenerator
+from src.core.tenants import authenticated_tenant
 from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher
-from src.connectors.linkedin_agent.profile_normalizer import LinkedInProfileNormalizer
-from src.connectors.linkedin_agent.models import LinkedInRawProfile
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="LinkedIn Agent",
@@ -12,33 +15,25 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Default time budget for a standalone /linkedin/search request (seconds)
+SEARCH_DEADLINE_SECONDS = float(os.getenv("LINKEDIN_SEARCH_DEADLINE_SECONDS", "30"))
+
 @app.post("/search", response_model=List[CandidateProfile])
-async def search_linkedin_profiles(params: SearchParams):
+async def search_linkedin_profiles(
+    params: SearchParams,
+    tenant: Optional[str] = Depends(authenticated_tenant)
+):
     """
     Searches for LinkedIn profiles based on the provided search parameters,
     fetches details, and normalizes them into a universal CandidateProfile format.
+    The credits are charged to the tenant of the X-Api-Key header (see TENANT_API_KEYS).
     """
+    deadline = Deadline(SEARCH_DEADLINE_SECONDS)
     try:
-        # 1. Generate LinkedIn search query
-        linkedin_query = LinkedInSearchQueryGenerator.generate_linkedin_search_query(params)
-        print(f"Generated LinkedIn search query: {linkedin_query}")
-
-        # 2. Search for profiles using the LinkedIn Fetcher (simulated)
-        fetcher = LinkedInFetcher()
-        raw_profile_results = fetcher.search_profiles(linkedin_query)
-        print(f"Found {len(raw_profile_results)} raw LinkedIn profiles.")
+        # Pages through the search, fetching and normalizing profiles until the limit is reached
+        fetcher = LinkedInFetcher(deadline=deadline, tenant=tenant)
+        candidate_profiles: List[CandidateProfile] = [candidate async for candidate in fetcher.iter_candidates(params)]
 
-        candidate_profiles: List[CandidateProfile] = []
-        for raw_profile_summary in raw_profile_results:
-            # 3. Fetch detailed profile (simulated)
-            detailed_raw_profile = fetcher.get_profile_details(raw_profile_summary.get("profile_url"))
-            
-            if detailed_raw_profile:
-                # 4. Normalize the raw profile into CandidateProfile
-                linkedin_raw_profile_model = LinkedInRawProfile(**detailed_raw_profile)
-                normalized_profile = LinkedInProfileNormalizer.normalize_profile(linkedin_raw_profile_model)
-                candidate_profiles.append(normalized_profile)
-        
         if not candidate_profiles:
             raise HTTPException(status_code=404, detail="No LinkedIn candidates found matching the criteria.")
 
@@ -19,4 +19,5 @@ class LinkedInRawProfile(BaseModel):
     experience: Optional[List[dict]] = None  # List of experience entries
     education: Optional[List[dict]] = None   # List of education entries
     skills: Optional[List[str]] = None
+    website: Optional[str] = None  # Personal site, from the profile's `extra` data
     # Add more fields as needed 
\ No newline at end of file
@@ -23,6 +23,7 @@ class LinkedInProfileNormalizer:
             linkedin_url=raw_profile.profile_url,
             location=raw_profile.location,
             skills=normalized_skills if normalized_skills else None,
+            website=raw_profile.website,
             # For LinkedIn, we don't have direct GitHub fields, so they remain None
             github_username=None,
             github_url=None,
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.core.metrics import CACHE_REQUESTS, PROXYCURL_CREDITS
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding both the response cache and the credit ledger
+PROXYCURL_CACHE_PATH = os.getenv("PROXYCURL_CACHE_PATH", ".proxycurl_cache.sqlite3")
+PROXYCURL_CACHE_ENABLED = os.getenv("PROXYCURL_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+# Freshness per endpoint (seconds): search results go stale sooner than profiles
+PROXYCURL_SEARCH_TTL_SECONDS = float(os.getenv("PROXYCURL_SEARCH_TTL_SECONDS", str(24 * 3600)))
+PROXYCURL_DETAILS_TTL_SECONDS = float(os.getenv("PROXYCURL_DETAILS_TTL_SECONDS", str(30 * 24 * 3600)))
+# Expired entries are kept this long past their TTL, to serve when the credit budget runs out
+PROXYCURL_CACHE_MAX_STALE_SECONDS = float(os.getenv("PROXYCURL_CACHE_MAX_STALE_SECONDS", str(90 * 24 * 3600)))
+# Credits one tenant may spend per UTC day; 0 means no limit
+PROXYCURL_DAILY_CREDIT_BUDGET = float(os.getenv("PROXYCURL_DAILY_CREDIT_BUDGET", "0"))
+# Credits charged per call when Proxycurl doesn't report the cost in X-Proxycurl-Credit-Cost
+PROXYCURL_CREDIT_COSTS = {
+    "search": float(os.getenv("PROXYCURL_SEARCH_CREDITS", "3")),
+    "details": float(os.getenv("PROXYCURL_DETAILS_CREDITS", "2")),
+}
+
+_PRUNE_EVERY_WRITES = 1000
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Autocommit; multi-statement updates use explicit BEGIN IMMEDIATE so other processes see them atomically
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _normalize(params: Dict) -> str:
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, str):
+            value = " ".join(value.lower().split())
+            if name == "url":
+                value = value.rstrip("/")
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(params: Dict) -> str:
+    """Key for a call's query parameters; case, whitespace and a trailing slash on `url` don't change it."""
+    return hashlib.sha256(_normalize(params).encode("utf-8")).hexdigest()[:32]
+
+
+def utc_day(timestamp: Optional[float] = None) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+class ProxycurlCache:
+    """
+    Persistent cache of Proxycurl JSON responses, per endpoint and normalized query parameters.
+    An entry is fresh for its endpoint's TTL; after that it is only returned with allow_stale,
+    and it is deleted once it is max_stale_seconds past the TTL.
+    """
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None, max_stale_seconds: float = PROXYCURL_CACHE_MAX_STALE_SECONDS):
+        self.path = path
+        self.ttls = ttls or {"search": PROXYCURL_SEARCH_TTL_SECONDS, "details": PROXYCURL_DETAILS_TTL_SECONDS}
+        self.max_stale_seconds = max_stale_seconds
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "endpoint TEXT NOT NULL, key TEXT NOT NULL, fetched_at REAL NOT NULL, body TEXT NOT NULL, "
+            "PRIMARY KEY (endpoint, key))"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+        self.prune()
+
+    def get(self, endpoint: str, params: Dict, allow_stale: bool = False) -> Optional[Dict]:
+        """
+        The cached response if it is fresh; with allow_stale, also an expired one. A stale
+        lookup follows a miss for the same call, so it only counts when it finds something.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, body FROM responses WHERE endpoint = ? AND key = ?",
+                (endpoint, cache_key(params))
+            ).fetchone()
+        fresh = row is not None and time.time() - row[0] <= self.ttls.get(endpoint, 0)
+        if not fresh and not (allow_stale and row is not None):
+            if not allow_stale:
+                self.stats["misses"] += 1
+                CACHE_REQUESTS.labels(f"proxycurl_{endpoint}", "miss").inc()
+            return None
+        self.stats["hits" if fresh else "stale"] += 1
+        CACHE_REQUESTS.labels(f"proxycurl_{endpoint}", "hit" if fresh else "stale").inc()
+        try:
+            return json.loads(row[1])
+        except ValueError as e:
+            logger.warning(f"Unreadable Proxycurl cache entry for {endpoint}: {e}")
+            return None
+
+    def put(self, endpoint: str, params: Dict, data) -> None:
+        try:
+            body = json.dumps(data)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (endpoint, key, fetched_at, body) VALUES (?, ?, ?, ?)",
+                    (endpoint, cache_key(params), time.time(), body)
+                )
+                self._writes += 1
+                prune = self._writes % _PRUNE_EVERY_WRITES == 0
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache Proxycurl {endpoint} response: {e}")
+            return
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Deletes entries too old to be served even as stale; returns how many."""
+        deleted = 0
+        now = time.time()
+        with self._lock:
+            for endpoint, ttl in self.ttls.items():
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE endpoint = ? AND fetched_at < ?",
+                    (endpoint, now - ttl - self.max_stale_seconds)
+                )
+                deleted += cursor.rowcount
+        return deleted
+
+
+class CreditLedger:
+    """
+    Proxycurl credits spent per UTC day, tenant and endpoint, shared by every process using
+    the same database. reserve() books a call's expected cost up front, and refuses it if
+    the tenant's daily budget would be exceeded; settle() corrects the booking to the actual
+    cost once the response is in, so concurrent calls can't overshoot the budget together.
+    """
+
+    def __init__(self, path: str, daily_budget: float = PROXYCURL_DAILY_CREDIT_BUDGET):
+        self.path = path
+        self.daily_budget = daily_budget
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS credits ("
+            "day TEXT NOT NULL, tenant TEXT NOT NULL, endpoint TEXT NOT NULL, "
+            "credits REAL NOT NULL DEFAULT 0, calls INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (day, tenant, endpoint))"
+        )
+        self._lock = threading.Lock()
+
+    def _add(self, day: str, tenant: str, endpoint: str, credits: float, calls: int):
+        self._conn.execute(
+            "INSERT INTO credits (day, tenant, endpoint, credits, calls) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, tenant, endpoint) DO UPDATE SET credits = credits + excluded.credits, calls = calls + excluded.calls",
+            (day, tenant, endpoint, credits, calls)
+        )
+
+    def reserve(self, tenant: str, endpoint: str, credits: float) -> bool:
+        """Books `credits` for one call, or returns False if that would exceed the tenant's budget today."""
+        day = utc_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.daily_budget > 0 and self._spent(day, tenant) + credits > self.daily_budget:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._add(day, tenant, endpoint, credits, 1)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def settle(self, tenant: str, endpoint: str, reserved: float, actual: float) -> None:
+        """Replaces a reservation with the credits the call actually cost."""
+        if actual != reserved:
+            with self._lock:
+                self._add(utc_day(), tenant, endpoint, actual - reserved, 0)
+        if actual:
+            PROXYCURL_CREDITS.labels(endpoint, tenant).inc(actual)
+
+    def _spent(self, day: str, tenant: str) -> float:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(credits), 0) FROM credits WHERE day = ? AND tenant = ?", (day, tenant)
+        ).fetchone()
+        return row[0]
+
+    def spent(self, tenant: str, day: Optional[str] = None) -> float:
+        with self._lock:
+            return self._spent(day or utc_day(), tenant)
+
+    def usage(self, day: Optional[str] = None) -> List[Dict]:
+        """Credits and calls per tenant and endpoint for a day (default: today, UTC)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tenant, endpoint, credits, calls FROM credits WHERE day = ? ORDER BY tenant, endpoint",
+                (day or utc_day(),)
+            ).fetchall()
+        return [{"tenant": t, "endpoint": e, "credits": c, "calls": n} for t, e, c, n in rows]
+
+
+def credits_charged(response, reserved: float) -> float:
+    """Credits a Proxycurl response cost: its X-Proxycurl-Credit-Cost header, else the estimate for a 200, else 0."""
+    if response is None:
+        return 0.0
+    header = response.headers.get("X-Proxycurl-Credit-Cost")
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    return reserved if response.status_code == 200 else 0.0
+
+
+_cache: Optional[ProxycurlCache] = None
+_ledger: Optional[CreditLedger] = None
+_lock = threading.Lock()
+
+
+def get_proxycurl_cache() -> Optional[ProxycurlCache]:
+    """Process-wide response cache, or None when PROXYCURL_CACHE_ENABLED is off or the database can't be opened."""
+    global _cache
+    if not PROXYCURL_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _cache is None:
+            try:
+                _cache = ProxycurlCache(PROXYCURL_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning(f"Proxycurl cache disabled, can't open {PROXYCURL_CACHE_PATH}: {e}")
+                return None
+        return _cache
+
+
+def get_credit_ledger() -> CreditLedger:
+    """
+    Process-wide credit ledger; budget from PROXYCURL_DAILY_CREDIT_BUDGET. If the database
+    can't be opened, spending is tracked in memory for this process only.
+    """
+    global _ledger
+    with _lock:
+        if _ledger is None:
+            try:
+                _ledger = CreditLedger(PROXYCURL_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning(f"Can't open {PROXYCURL_CACHE_PATH} for the credit ledger, keeping it in memory: {e}")
+                _ledger = CreditLedger(":memory:")
+        return _ledger
@@ -3,11 +3,12 @@ from src.core.models import SearchParams
 
 class LinkedInSearchQueryGenerator:
     @staticmethod
-    def generate_linkedin_search_query(params: SearchParams) -> str:
+    def generate_linkedin_search_query(params: SearchParams, include_location: bool = True) -> str:
         """
         Generates a LinkedIn search query based on the parsed SearchParams.
         For now, this will create a simple keyword-based query. 
         Future iterations might incorporate more advanced LinkedIn search operators.
+        Pass include_location=False when the location is sent as a search filter instead.
         """
         query_parts = []
 
@@ -15,7 +16,7 @@ class LinkedInSearchQueryGenerator:
             query_parts.append(params.title)
         if params.skills:
             query_parts.extend(params.skills)
-        if params.location:
+        if params.location and include_location:
             # LinkedIn often uses specific location formats, this is a simplified approach
             if isinstance(params.location, list):
                 query_parts.extend(params.location)
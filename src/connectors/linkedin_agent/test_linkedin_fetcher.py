@@ -0,0 +1,168 @@
+import asyncio
+import queue
+import threading
+
+import httpx
+import pytest
+
+from src.connectors.linkedin_agent import linkedin_fetcher
+from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher, RateLimiter
+from src.connectors.linkedin_agent.proxycurl_cache import CreditLedger, ProxycurlCache
+from src.core import log, tracing
+from src.core.deadline import Deadline
+from src.core.models import SearchParams
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(linkedin_fetcher.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_reserve_spaces_requests_over_the_window(clock):
+    limiter = RateLimiter(2)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    # Window full: the third call waits until the first slot is a minute old
+    assert limiter.reserve() == 60
+    clock.now += 30
+    assert limiter.reserve() == 30
+    # Once every booked slot is more than a minute old, the window is empty again
+    clock.now += 120
+    assert limiter.reserve() == 0
+
+
+def test_reserve_over_max_wait_books_nothing(clock):
+    limiter = RateLimiter(1)
+    assert limiter.reserve() == 0
+    assert limiter.reserve(max_wait=10) is None
+    # The refused call didn't take the next slot
+    assert limiter.reserve(max_wait=60) == 60
+
+
+@pytest.fixture
+def fetcher_factory(tmp_path, monkeypatch):
+    cache = ProxycurlCache(str(tmp_path / "proxycurl.sqlite3"))
+    ledger = CreditLedger(str(tmp_path / "proxycurl.sqlite3"), daily_budget=10)
+    limiter = RateLimiter(1)
+    monkeypatch.setattr(linkedin_fetcher, "get_proxycurl_cache", lambda: cache)
+    monkeypatch.setattr(linkedin_fetcher, "get_credit_ledger", lambda: ledger)
+    monkeypatch.setattr(linkedin_fetcher, "_rate_limiter", limiter)
+
+    def make(deadline=None):
+        fetcher = LinkedInFetcher(deadline=deadline)
+        monkeypatch.setattr(fetcher, "_get", lambda *args: pytest.fail("request sent"))
+        return fetcher
+
+    make.ledger = ledger
+    make.limiter = limiter
+    return make
+
+
+def test_rate_wait_past_the_deadline_skips_the_call_and_refunds_credits(fetcher_factory):
+    fetcher_factory.limiter.reserve()  # the next slot is a minute away
+    deadline = Deadline(5)
+    fetcher = fetcher_factory(deadline)
+
+    assert fetcher._fetch_json("search", "https://example.test", {"keywords": "python"}) is None
+    assert fetcher_factory.ledger.spent(fetcher.tenant) == 0
+    assert "linkedin.search" in deadline.truncated_stages
+    assert len(fetcher_factory.limiter._starts) == 1
+
+
+def test_refused_budget_takes_no_rate_slot(fetcher_factory):
+    fetcher_factory.ledger.daily_budget = 1  # less than one search costs
+    fetcher = fetcher_factory()
+
+    assert fetcher._fetch_json("search", "https://example.test", {"keywords": "python"}) is None
+    assert len(fetcher_factory.limiter._starts) == 0
+
+
+def first_search_query(monkeypatch, fetcher, params):
+    sent = []
+
+    async def fetch(endpoint, url, query):
+        sent.append(query)
+        return {"results": []}
+
+    async def run_here(coroutine):
+        return await coroutine
+
+    monkeypatch.setattr(fetcher, "_afetch_json", fetch)
+    monkeypatch.setattr(linkedin_fetcher, "_on_pool", run_here)
+
+    async def drain():
+        return [page async for page in fetcher.iter_search_pages(params)]
+
+    asyncio.run(drain())
+    return sent[0]
+
+
+@pytest.mark.parametrize("location, expected", [
+    # The default country only applies when no place is named
+    (None, {"keywords": "Backend Engineer Python", "country": "us"}),
+    ("remote", {"keywords": "Backend Engineer Python", "country": "us"}),
+    ("Berlin, Germany", {"keywords": "Backend Engineer Python", "country": "de", "city": "Berlin"}),
+    ("Berlin", {"keywords": "Backend Engineer Python Berlin"}),
+    ("Europe", {"keywords": "Backend Engineer Python Europe"}),
+])
+def test_search_query_location_handling(monkeypatch, fetcher_factory, location, expected):
+    monkeypatch.setattr(linkedin_fetcher, "PROXYCURL_SEARCH_COUNTRY", "us")
+    params = SearchParams(intent="find_candidates", title="Backend Engineer", skills=["Python"], location=location)
+
+    assert first_search_query(monkeypatch, fetcher_factory(), params) == {**expected, "page": 1}
+
+
+def test_pool_calls_keep_the_callers_request_id_and_span(monkeypatch, fetcher_factory):
+    pool = linkedin_fetcher._ProxycurlPool(2)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500, request=request)))
+    monkeypatch.setattr(linkedin_fetcher, "_pool", pool)
+    buffer = tracing.RingBufferExporter()
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer([buffer]))
+    records = queue.Queue()
+    handler = log.ContextQueueHandler(records)
+    linkedin_fetcher.logger.addHandler(handler)
+    token = log._request_id.set("req-1")
+    try:
+        with tracing.span("talent_search") as parent:
+            assert fetcher_factory().get_profile_details_many(["https://www.linkedin.com/in/jane"]) == [None]
+    finally:
+        log._request_id.reset(token)
+        linkedin_fetcher.logger.removeHandler(handler)
+
+    http_span = next(s for s in buffer.spans() if s["name"] == "linkedin.http")
+    assert (http_span["trace_id"], http_span["parent_id"]) == (parent.trace_id, parent.span_id)
+    assert http_span["thread"] == "proxycurl-pool"
+    record = records.get_nowait()  # the failed lookup, logged on the pool's thread
+    assert "Error fetching profile details" in record.getMessage()
+    assert (record.request_id, record.trace_id) == ("req-1", parent.trace_id)
+
+
+def test_ledger_calls_stay_off_the_pools_event_loop(monkeypatch, fetcher_factory):
+    pool = linkedin_fetcher._ProxycurlPool(2)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}, request=request)))
+    monkeypatch.setattr(linkedin_fetcher, "_pool", pool)
+    ledger = fetcher_factory.ledger
+    threads = []
+    for name in ("reserve", "settle"):
+        original = getattr(ledger, name)
+
+        def record(*args, original=original):
+            threads.append(threading.current_thread().name)
+            return original(*args)
+
+        monkeypatch.setattr(ledger, name, record)
+
+    fetcher = fetcher_factory()
+    assert fetcher.get_profile_details_many(["https://www.linkedin.com/in/jane"])[0]["profile_url"].endswith("/jane")
+    assert len(threads) == 2 and "proxycurl-pool" not in threads
+    assert ledger.spent(fetcher.tenant) == linkedin_fetcher.PROXYCURL_CREDIT_COSTS["details"]
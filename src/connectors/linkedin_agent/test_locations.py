@@ -0,0 +1,33 @@
+import pytest
+
+from src.connectors.linkedin_agent.locations import location_filters
+
+
+@pytest.mark.parametrize("location, filters", [
+    ("Berlin, Germany", {"country": "de", "city": "Berlin"}),
+    ("London, UK", {"country": "gb", "city": "London"}),
+    ("DE", {"country": "de"}),
+    ("Germany", {"country": "de"}),
+    ("Austin, TX", {"country": "us", "region": "Texas", "city": "Austin"}),
+    ("Austin,   texas", {"country": "us", "region": "Texas", "city": "Austin"}),
+    ("San Francisco, CA, USA", {"country": "us", "region": "California", "city": "San Francisco"}),
+    ("Munich, Bavaria, Germany", {"country": "de", "region": "Bavaria", "city": "Munich"}),
+    ("California", {"country": "us", "region": "California"}),
+    (["remote", "Toronto, Canada"], {"country": "ca", "city": "Toronto"}),
+])
+def test_places_with_a_known_country_become_filters(location, filters):
+    assert location_filters(location) == (filters, [])
+
+
+@pytest.mark.parametrize("location", ["Berlin", "Europe", "xx", "Springfield, Nowhere, USA", "Lyon, Narnia"])
+def test_places_without_a_known_country_stay_keywords(location):
+    assert location_filters(location) == ({}, [location])
+
+
+def test_several_places_are_all_keywords():
+    assert location_filters(["Berlin, Germany", "London"]) == ({}, ["Berlin, Germany", "London"])
+
+
+@pytest.mark.parametrize("location", [None, "", "remote", ["Anywhere", " "], ","])
+def test_no_place_means_no_filter(location):
+    assert location_filters(location) == ({}, [])
@@ -0,0 +1,100 @@
+import pytest
+
+from src.connectors.linkedin_agent import proxycurl_cache
+from src.connectors.linkedin_agent.proxycurl_cache import CreditLedger, ProxycurlCache, cache_key, credits_charged
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(proxycurl_cache.time, "time", fake.time)
+    return fake
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "proxycurl.sqlite3")
+
+
+def test_key_ignores_case_whitespace_and_trailing_slash():
+    assert cache_key({"url": "https://LinkedIn.com/in/jane/"}) == cache_key({"url": "https://linkedin.com/in/jane"})
+    assert cache_key({"keywords": "Python   Engineer"}) == cache_key({"keywords": "python engineer"})
+    assert cache_key({"keywords": "python"}) != cache_key({"keywords": "go"})
+
+
+def test_entry_is_fresh_then_stale_then_pruned(clock, db_path):
+    cache = ProxycurlCache(db_path, ttls={"search": 100}, max_stale_seconds=1000)
+    params = {"keywords": "python"}
+    cache.put("search", params, {"results": [1]})
+
+    assert cache.get("search", params) == {"results": [1]}
+    clock.now += 101
+    assert cache.get("search", params) is None
+    assert cache.get("search", params, allow_stale=True) == {"results": [1]}
+    assert cache.stats == {"hits": 1, "misses": 1, "stale": 1}
+
+    clock.now += 1000
+    assert cache.prune() == 1
+    assert cache.get("search", params, allow_stale=True) is None
+
+
+def test_endpoints_are_cached_separately(clock, db_path):
+    cache = ProxycurlCache(db_path, ttls={"search": 100, "details": 100})
+    cache.put("search", {"url": "x"}, {"from": "search"})
+
+    assert cache.get("details", {"url": "x"}) is None
+
+
+def test_reserve_refuses_past_the_daily_budget(db_path):
+    ledger = CreditLedger(db_path, daily_budget=5)
+
+    assert ledger.reserve("acme", "search", 3)
+    assert not ledger.reserve("acme", "search", 3)
+    assert ledger.reserve("acme", "details", 2)
+    # Budgets are per tenant
+    assert ledger.reserve("other", "search", 3)
+    assert ledger.spent("acme") == 5
+
+
+def test_settle_replaces_the_reservation_with_the_actual_cost(db_path):
+    ledger = CreditLedger(db_path, daily_budget=5)
+    ledger.reserve("acme", "search", 3)
+    ledger.settle("acme", "search", reserved=3, actual=1)
+
+    assert ledger.spent("acme") == 1
+    assert ledger.reserve("acme", "search", 3)  # the refund made room
+    ledger.settle("acme", "search", reserved=3, actual=0)
+    assert ledger.usage() == [{"tenant": "acme", "endpoint": "search", "credits": 1, "calls": 2}]
+
+
+def test_ledger_is_shared_through_the_database(db_path):
+    CreditLedger(db_path, daily_budget=4).reserve("acme", "search", 3)
+
+    assert not CreditLedger(db_path, daily_budget=4).reserve("acme", "search", 3)
+
+
+def test_zero_budget_means_unlimited(db_path):
+    ledger = CreditLedger(db_path, daily_budget=0)
+
+    assert all(ledger.reserve("acme", "search", 100) for _ in range(5))
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_credits_charged_prefers_the_cost_header():
+    assert credits_charged(Response(200, {"X-Proxycurl-Credit-Cost": "2"}), 3) == 2
+    assert credits_charged(Response(200, {"X-Proxycurl-Credit-Cost": "n/a"}), 3) == 3
+    assert credits_charged(Response(404), 3) == 0
+    assert credits_charged(None, 3) == 0
@@ -0,0 +1,85 @@
+import math
+import threading
+import time
+from typing import List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage can't start because the request deadline has passed."""
+    pass
+
+
+class Deadline:
+    """
+    Request-scoped time budget shared by every stage of a search.
+
+    Created once at the API edge and passed down to the parser and connectors.
+    Stages ask it for per-call timeouts, check it before retries, backoff sleeps
+    and page fetches, and record themselves as truncated when they stop early.
+    A Deadline with no budget never expires, so callers can always pass one.
+    """
+
+    # Smallest budget worth starting an upstream call with (seconds)
+    MIN_CALL_BUDGET = 0.5
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds if budget_seconds is not None else math.inf
+        self._truncated: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def unlimited(cls) -> "Deadline":
+        return cls(None)
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (inf for an unlimited deadline)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def can_afford(self, seconds: float) -> bool:
+        """True if `seconds` of work still fits in the remaining budget."""
+        return self.remaining() >= seconds
+
+    def timeout(self, default: float) -> float:
+        """Per-call timeout: the stage's own default, capped by the remaining budget."""
+        return max(0.001, min(default, self.remaining()))
+
+    def check(self, stage: str):
+        """Raises DeadlineExceeded (and records the stage) if there's no time left to start it."""
+        if not self.can_afford(self.MIN_CALL_BUDGET):
+            self.mark_truncated(stage)
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+    def sleep(self, seconds: float, stage: str) -> bool:
+        """
+        Sleeps for a backoff/rate-limit wait if the budget can cover it plus one more call.
+        Returns False (and records the stage as truncated) instead of sleeping otherwise.
+        """
+        if not self.can_afford(seconds + self.MIN_CALL_BUDGET):
+            self.mark_truncated(stage)
+            return False
+        time.sleep(seconds)
+        return True
+
+    def mark_truncated(self, stage: str):
+        with self._lock:
+            if stage not in self._truncated:
+                self._truncated.append(stage)
+
+    @property
+    def truncated_stages(self) -> List[str]:
+        with self._lock:
+            return list(self._truncated)
+
+
+def ensure_deadline(deadline: Optional[Deadline]) -> Deadline:
+    """Lets stages accept deadline=None and treat it as unlimited."""
+    return deadline if deadline is not None else Deadline.unlimited()
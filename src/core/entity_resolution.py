@@ -0,0 +1,280 @@
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from src.core.models import CandidateProfile
+
+# Hosts that identify a source rather than a person, so they never count as a shared domain
+_SOURCE_HOSTS = {"github.com", "linkedin.com", "www.linkedin.com", "twitter.com", "x.com", "medium.com"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_tokens(text: Optional[str]) -> List[str]:
+    """Lowercases, strips accents and splits into alphanumeric tokens."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return [token for token in _NON_ALNUM.split(text) if token]
+
+
+def website_domain(url: Optional[str]) -> Optional[str]:
+    """Registrable-ish domain of a personal site, or None for empty/source-host URLs."""
+    if not url:
+        return None
+    if "://" not in url:
+        url = f"http://{url}"
+    host = (urlparse(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host or host in _SOURCE_HOSTS:
+        return None
+    return host
+
+
+def profile_key(url: Optional[str]) -> Optional[str]:
+    """"gh:<login>" or "li:<slug>" for a GitHub or LinkedIn profile URL, None for any other URL."""
+    if not url:
+        return None
+    if "://" not in url:
+        url = f"http://{url}"
+    parts = urlparse(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = [segment for segment in parts.path.lower().split("/") if segment]
+    if host == "github.com" and len(path) == 1:
+        return f"gh:{path[0]}"
+    if host == "linkedin.com" and len(path) == 2 and path[0] == "in":
+        return f"li:{path[1]}"
+    return None
+
+
+class MinHasher:
+    """
+    MinHash signatures over token sets, with LSH banding.
+    Two sets share a band key with probability that rises steeply with their Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Universal hash family h(x) = (a*x + b) mod p, fixed per instance
+        state = seed
+        self._coefficients = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (state >> 3) % _MERSENNE_PRIME or 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (state >> 3) % _MERSENNE_PRIME
+            self._coefficients.append((a, b))
+
+    def signature(self, tokens: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        base_hashes = [zlib.crc32(token.encode("utf-8")) for token in set(tokens)]
+        if not base_hashes:
+            return None
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in base_hashes)
+            for a, b in self._coefficients
+        )
+
+    def band_keys(self, signature: Tuple[int, ...]) -> List[str]:
+        return [
+            f"{band}:{hash(signature[band * self.rows:(band + 1) * self.rows]) & 0xffffffff:x}"
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def estimate_jaccard(left: Optional[Tuple[int, ...]], right: Optional[Tuple[int, ...]]) -> float:
+        if not left or not right:
+            return 0.0
+        return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class _Features:
+    """Precomputed comparison features for one profile."""
+    __slots__ = ("name_tokens", "location_tokens", "domain", "skills_signature", "github", "linkedin",
+                 "profile_keys", "linked_profile")
+
+    def __init__(self, profile: CandidateProfile, hasher: MinHasher):
+        self.name_tokens: Set[str] = set(normalize_tokens(profile.name))
+        self.location_tokens: Set[str] = set(normalize_tokens(profile.location))
+        self.domain = website_domain(profile.website)
+        skills = {" ".join(normalize_tokens(skill)) for skill in profile.skills or []}
+        skills.discard("")
+        self.skills_signature = hasher.signature(skills) if len(skills) >= 2 else None
+        self.github = (profile.github_username or "").lower() or None
+        self.linkedin = (profile.linkedin_url or "").lower().rstrip("/") or None
+        # The profile's own GitHub/LinkedIn pages, and the one its website points at (if any)
+        self.profile_keys: Set[str] = {
+            key for key in (
+                f"gh:{self.github}" if self.github else profile_key(profile.github_url),
+                profile_key(profile.linkedin_url),
+            ) if key
+        }
+        self.linked_profile = profile_key(profile.website)
+
+
+class EntityResolver:
+    """
+    Merges CandidateProfiles that describe the same person across sources.
+
+    Profiles are bucketed by blocking keys (exact identifiers, normalized name,
+    name + location, website domain, MinHash LSH bands over skills), and only pairs
+    sharing a bucket are scored. Oversized buckets are skipped, which keeps the
+    comparison count near-linear for batches of tens of thousands of profiles.
+
+    A pair only merges on a strong signal: a shared personal domain, a website pointing
+    at the other's profile, or skills at least `min_skills_similarity` alike. A common
+    name in the same city is not enough on its own.
+    """
+
+    def __init__(self, threshold: float = 0.6, max_block_size: int = 100, hasher: Optional[MinHasher] = None,
+                 min_skills_similarity: float = 0.5):
+        self.threshold = threshold
+        self.min_skills_similarity = min_skills_similarity
+        self.max_block_size = max_block_size
+        self.hasher = hasher or MinHasher()
+        self.last_stats: Dict[str, int] = {}
+
+    def _blocking_keys(self, features: _Features) -> List[str]:
+        keys = []
+        if features.github:
+            keys.append(f"gh:{features.github}")
+        if features.linkedin:
+            keys.append(f"li:{features.linkedin}")
+        if features.name_tokens:
+            name_key = " ".join(sorted(features.name_tokens))
+            keys.append(f"n:{name_key}")
+            for location_token in features.location_tokens:
+                for name_token in features.name_tokens:
+                    keys.append(f"nl:{name_token}:{location_token}")
+        if features.domain:
+            keys.append(f"d:{features.domain}")
+        keys.extend(f"p:{key}" for key in features.profile_keys)
+        if features.linked_profile:
+            keys.append(f"p:{features.linked_profile}")
+        if features.skills_signature:
+            keys.extend(f"m:{key}" for key in self.hasher.band_keys(features.skills_signature))
+        return keys
+
+    def _score(self, left: _Features, right: _Features) -> float:
+        # Same identifier in both: always the same person; different ones: never
+        if left.github and right.github:
+            return 1.0 if left.github == right.github else 0.0
+        if left.linkedin and right.linkedin:
+            return 1.0 if left.linkedin == right.linkedin else 0.0
+
+        # One profile's website is the other's GitHub/LinkedIn page
+        if left.linked_profile in right.profile_keys or right.linked_profile in left.profile_keys:
+            return 1.0
+
+        same_domain = bool(left.domain and left.domain == right.domain)
+        skills_similarity = MinHasher.estimate_jaccard(left.skills_signature, right.skills_signature)
+        if not same_domain and skills_similarity < self.min_skills_similarity:
+            return 0.0
+        name_union = left.name_tokens | right.name_tokens
+        name_similarity = len(left.name_tokens & right.name_tokens) / len(name_union) if name_union else 0.0
+        if name_similarity < 0.5 and not same_domain:
+            return 0.0
+
+        score = 0.5 * name_similarity
+        if same_domain:
+            score += 0.4
+        if left.location_tokens & right.location_tokens:
+            score += 0.15
+        score += 0.2 * skills_similarity
+        return min(score, 1.0)
+
+    def resolve(self, profiles: List[CandidateProfile]) -> List[CandidateProfile]:
+        """Returns one merged profile per resolved entity, in first-seen order."""
+        features = [_Features(profile, self.hasher) for profile in profiles]
+
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for index, profile_features in enumerate(features):
+            for key in self._blocking_keys(profile_features):
+                blocks[key].append(index)
+
+        parent = list(range(len(profiles)))
+        # Identifiers held by each cluster root, so a merge never joins two GitHub or LinkedIn accounts
+        cluster_ids = [
+            ({f.github} if f.github else set(), {f.linkedin} if f.linkedin else set())
+            for f in features
+        ]
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        compared: Set[Tuple[int, int]] = set()
+        skipped_blocks = 0
+        merges = 0
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                skipped_blocks += 1
+                continue
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pair = (i, j) if i < j else (j, i)
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    root_i, root_j = find(i), find(j)
+                    if root_i == root_j or self._score(features[i], features[j]) < self.threshold:
+                        continue
+                    github_i, linkedin_i = cluster_ids[root_i]
+                    github_j, linkedin_j = cluster_ids[root_j]
+                    if len(github_i | github_j) > 1 or len(linkedin_i | linkedin_j) > 1:
+                        continue
+                    parent[root_j] = root_i
+                    cluster_ids[root_i] = (github_i | github_j, linkedin_i | linkedin_j)
+                    merges += 1
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for index in range(len(profiles)):
+            clusters[find(index)].append(index)
+
+        self.last_stats = {
+            "profiles": len(profiles),
+            "entities": len(clusters),
+            "blocks": len(blocks),
+            "skipped_blocks": skipped_blocks,
+            "comparisons": len(compared),
+            "merges": merges,
+        }
+        return [
+            self.merge_profiles([profiles[index] for index in members])
+            for members in sorted(clusters.values(), key=lambda members: members[0])
+        ]
+
+    @staticmethod
+    def merge_profiles(profiles: List[CandidateProfile]) -> CandidateProfile:
+        """Combines profiles of one person: first non-empty value per field, union of list fields."""
+        if len(profiles) == 1:
+            return profiles[0]
+        merged: Dict = {}
+        for profile in profiles:
+            for field, value in profile.dict().items():
+                if value is None:
+                    continue
+                if isinstance(value, list):
+                    existing = merged.setdefault(field, [])
+                    seen = {str(item).lower() for item in existing}
+                    existing.extend(item for item in value if str(item).lower() not in seen)
+                elif field == "name":
+                    # Prefer the most complete display name (GitHub often only has the login)
+                    if len(value) > len(merged.get("name") or ""):
+                        merged["name"] = value
+                elif field not in merged:
+                    merged[field] = value
+        return CandidateProfile(**merged)
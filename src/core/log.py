@@ -0,0 +1,269 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from src.core.metrics import REGISTRY, Counter, Histogram
+from src.core.tracing import current_trace_id
+
+LOG_RECORDS = REGISTRY.register(Counter(
+    "hireai_log_records_total",
+    "Log records by outcome (emitted, or sampled_out by per-logger sampling).",
+    ["outcome"]
+))
+REQUEST_LOGGING_SECONDS = REGISTRY.register(Histogram(
+    "hireai_request_logging_seconds",
+    "Time spent on the request path formatting and enqueueing log records, per request.",
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+))
+
+# Per-item messages go to "<module>.items" loggers, which are sampled by default
+ITEM_LOGGER_SUFFIX = ".items"
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_request_log_stats: contextvars.ContextVar[Optional["LogStats"]] = contextvars.ContextVar("request_log_stats", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def item_logger(name: str) -> logging.Logger:
+    """Logger for per-item messages (one per user, repo, profile...) of module `name`."""
+    return logging.getLogger(name + ITEM_LOGGER_SUFFIX)
+
+
+class LogStats:
+    """Logging cost accumulated by one request, across its event loop and worker threads."""
+    __slots__ = ("seconds", "records", "sampled_out", "_lock")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.records = 0
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, emitted: bool):
+        with self._lock:
+            self.seconds += seconds
+            if emitted:
+                self.records += 1
+            else:
+                self.sampled_out += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every 1/rate INFO-or-lower records per logger. Warnings and errors always pass.
+    The rate for a logger is the one configured for its longest matching name prefix;
+    "*.items" sets the default for item loggers.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._counters: Dict[str, int] = {}
+        self._resolved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse_rates(spec: str) -> Dict[str, float]:
+        """Parses "name=rate,name=rate" (e.g. LOG_SAMPLE_RATES)."""
+        rates = {}
+        for part in spec.split(","):
+            if "=" in part:
+                name, rate = part.split("=", 1)
+                rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+        return rates
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if prefix != "*.items" and (name == prefix or name.startswith(prefix + "."))]
+            if matches:
+                rate = self.rates[max(matches, key=len)]
+            elif name.endswith(ITEM_LOGGER_SUFFIX):
+                rate = self.rates.get("*.items", 1.0)
+            else:
+                rate = 1.0
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        every = round(1 / rate)
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+        return count % every == 0
+
+
+# Message arguments that can't change after the call, so formatting them later is safe
+_IMMUTABLE_ARGS = (str, bytes, int, float, bool, type(None))
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records for the background listener. Request and trace ids are captured
+    here, on the calling thread, because the listener thread doesn't see the caller's context.
+    Formatting (message, exception, stack) is left to the listener's handlers.
+    """
+
+    def __init__(self, log_queue: queue.Queue, sampler: Optional[SamplingFilter] = None):
+        super().__init__(log_queue)
+        self.sampler = sampler
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        A copy of the record with the caller's context attached. Unlike QueueHandler.prepare,
+        it doesn't format the record or drop exc_info; only a message whose arguments are
+        mutable objects is rendered now, so later changes to them can't alter it.
+        """
+        record = copy.copy(record)
+        record.request_id = _request_id.get()
+        record.trace_id = current_trace_id()
+        args = record.args
+        # A lone dict argument becomes record.args itself, and the dict is mutable
+        if args and (isinstance(args, dict) or not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)):
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        started = time.perf_counter()
+        emitted = self.sampler is None or self.sampler.filter(record)
+        if emitted:
+            super().handle(record)
+        LOG_RECORDS.labels("emitted" if emitted else "sampled_out").inc()
+        stats = _request_log_stats.get()
+        if stats is not None:
+            stats.add(time.perf_counter() - started, emitted)
+        return emitted
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request/trace ids and any `extra` fields."""
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "trace_id"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        for key, value in vars(record).items():
+            if key not in self._RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, sample_rates: Optional[Dict[str, float]] = None):
+    """
+    Routes the root logger through a queue to a background thread that formats and writes
+    to stdout, so request threads never block on I/O. Safe to call more than once.
+
+    LOG_LEVEL (INFO), LOG_FORMAT (json|text, default json) and LOG_SAMPLE_RATES
+    (e.g. "*.items=0.1,src.connectors.github_agent=0.5") configure it.
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+        if sample_rates is None:
+            sample_rates = {"*.items": 0.1, **SamplingFilter.parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))}
+        fmt = fmt or os.getenv("LOG_FORMAT", "json")
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        log_queue: queue.Queue = queue.Queue(-1)
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(ContextQueueHandler(log_queue, SamplingFilter(sample_rates)))
+        root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that gives every request an id (from X-Request-Id, or a new one),
+    echoes it in the response and records how long the request spent logging.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope.get("headers") or []:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        stats = LogStats()
+        id_token = _request_id.set(request_id)
+        stats_token = _request_log_stats.set(stats)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_log_stats.reset(stats_token)
+            _request_id.reset(id_token)
+            REQUEST_LOGGING_SECONDS.observe(stats.seconds)
@@ -0,0 +1,239 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) covering cheap local stages up to long upstream crawls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base for labelled metrics; children per label combination are created once and cached."""
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in sorted(self._children.items())
+        ]
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in sorted(self._children.items())
+        ]
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    self.counts[index] += 1
+                    break
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for upper, count in zip(child.buckets, child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(upper)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Metrics shared across the search pipeline ---
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "hireai_stage_duration_seconds",
+    "Latency of search pipeline stages (llm_parse, repo_search, profile_collection, normalize_filter, ...).",
+    ["stage"]
+))
+LLM_PARSES = REGISTRY.register(Counter(
+    "hireai_llm_parse_total",
+    "LLM query parses by outcome (clean, repaired, failed).",
+    ["outcome"]
+))
+GITHUB_REQUESTS = REGISTRY.register(Counter(
+    "hireai_github_requests_total",
+    "GitHub API calls by endpoint template and HTTP status ('error' for transport failures).",
+    ["endpoint", "status"]
+))
+GITHUB_RATE_LIMIT_REMAINING = REGISTRY.register(Gauge(
+    "hireai_github_rate_limit_remaining",
+    "Remaining GitHub API requests in the current window, per token fingerprint.",
+    ["token"]
+))
+LINKEDIN_REQUESTS = REGISTRY.register(Counter(
+    "hireai_linkedin_requests_total",
+    "Proxycurl API calls by endpoint and HTTP status ('error' for transport failures).",
+    ["endpoint", "status"]
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "hireai_cache_requests_total",
+    "Cache lookups by cache name and result (hit, miss, or stale when an expired entry was served).",
+    ["cache", "result"]
+))
+PROXYCURL_CREDITS = REGISTRY.register(Counter(
+    "hireai_proxycurl_credits_total",
+    "Proxycurl credits spent, by endpoint and tenant.",
+    ["endpoint", "tenant"]
+))
+PROXYCURL_BUDGET_EXHAUSTED = REGISTRY.register(Counter(
+    "hireai_proxycurl_budget_exhausted_total",
+    "Proxycurl calls refused by the daily credit budget, by endpoint and outcome (stale or empty).",
+    ["endpoint", "outcome"]
+))
+CANDIDATES_DROPPED = REGISTRY.register(Counter(
+    "hireai_candidates_dropped_total",
+    "Candidates removed from results, by the filter that dropped them.",
+    ["filter"]
+))
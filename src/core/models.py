@@ -21,6 +21,7 @@ class SearchParams(BaseModel):
     experience_level: Optional[str] = None
     location: Optional[Union[str, List[str]]] = None
     work_type: Optional[Union[str, List[str]]] = None
+    limit: Optional[int] = None # Max candidates the caller wants back
 
 # --- Universal Candidate Profile (was in GitHub agent) ---
 class CandidateProfile(BaseModel):
@@ -28,6 +29,7 @@ class CandidateProfile(BaseModel):
     github_username: Optional[str] = None # Make Optional as it might be from LinkedIn
     github_url: Optional[str] = None
     linkedin_url: Optional[str] = None # New field for LinkedIn profiles
+    website: Optional[str] = None # Personal site/blog, used to match profiles across sources
     location: Optional[str] = None
     skills: Optional[List[str]] = None
     top_languages: Optional[List[str]] = None
@@ -35,4 +37,20 @@ class CandidateProfile(BaseModel):
     recent_activity: Optional[str] = None # Last active timestamp
     oss_score: Optional[int] = None # Heuristic score for OSS contributions
     top_repo: Optional[Dict] = None # Top GitHub repo details
-    # Add more common fields as needed from LinkedIn/other sources 
\ No newline at end of file
+    # Add more common fields as needed from LinkedIn/other sources 
+
+# --- Multi-source Talent Search Models ---
+class SourceStatus(BaseModel):
+    source: str
+    status: str # "ok", "timeout" or "error"
+    elapsed_ms: float
+    candidate_count: int = 0
+    error: Optional[str] = None
+
+class TalentSearchResponse(BaseModel):
+    query: Optional[ParseQueryResponse] = None # Structured query the sources were given
+    candidates: List[CandidateProfile] = []
+    sources: List[SourceStatus] = []
+    truncated_stages: List[str] = [] # Stages cut short by the request deadline
+    total: Optional[int] = None # Size of the full result set when paginated
+    next_cursor: Optional[str] = None # Opaque cursor for the next page, None on the last page
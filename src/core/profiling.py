@@ -0,0 +1,238 @@
+import asyncio
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_TOKEN_PARAM = "profile_token"
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all threads at a fixed interval, from a background thread.
+
+    Searches do their upstream work in worker threads (asyncio.to_thread), which
+    deterministic profilers attached to the event loop thread never see; sampling
+    every thread shows JSON decoding, validation and network waits side by side.
+    Idle thread-pool workers are left out.
+
+    Samples are process-wide: they can't be attributed to a request, so anything else
+    running at the same time (other requests, background jobs) shows up too.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.reverse()
+                if self._is_idle_worker(labels):
+                    continue
+                labels.insert(0, names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(labels)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _is_idle_worker(labels: List[str]) -> bool:
+        # A pool worker blocked in queue.get() is waiting for work, not doing any
+        for index, label in enumerate(labels[:-1]):
+            if label.startswith("_worker (thread.py") and labels[index + 1].startswith("get (queue.py"):
+                return True
+        return False
+
+    def folded(self) -> str:
+        """Collapsed stacks, one `frame;frame;... count` per line (flamegraph.pl / speedscope input)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 25) -> Dict[str, List[Tuple[str, int]]]:
+        self_counts: Counter = Counter()
+        inclusive_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # drop the thread name
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                inclusive_counts[label] += count
+        return {
+            "self": self_counts.most_common(limit),
+            "inclusive": inclusive_counts.most_common(limit),
+        }
+
+
+class ProfileStore:
+    """Profiles on disk: `<id>.folded` stacks plus a `<id>.json` summary."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        # ids are generated here; anything else can't name a file in the directory
+        if not profile_id.replace("-", "").isalnum():
+            raise KeyError(profile_id)
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, sampler: StackSampler, metadata: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile_id, "folded"), "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+        summary = {
+            "profile_id": profile_id,
+            **metadata,
+            "samples": sampler.samples,
+            "interval_seconds": sampler.interval,
+            "top_functions": sampler.top_functions(),
+        }
+        with open(self._path(profile_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    def list(self) -> List[Dict]:
+        """Summaries without the function tables, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for filename in sorted(os.listdir(self.directory), reverse=True):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                summary = json.load(f)
+            summary.pop("top_functions", None)
+            profiles.append(summary)
+        return profiles
+
+    def load(self, profile_id: str, extension: str) -> str:
+        path = self._path(profile_id, extension)
+        if not os.path.exists(path):
+            raise KeyError(profile_id)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+
+def token_matches(expected: Optional[str], provided: Optional[str]) -> bool:
+    return bool(expected and provided) and hmac.compare_digest(expected.encode("utf-8"), provided.encode("utf-8"))
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a single request when it carries the profiling token,
+    in the X-Profile-Token header or the `profile_token` query parameter. The profile id
+    is returned in the X-Profile-Id response header.
+
+    It is only installed when PROFILING_TOKEN is set; other requests pass straight through.
+    The sampler covers the whole process, so the profile's `concurrent_requests` records
+    how many requests (including the profiled one) were in flight at most while it ran;
+    above 1, the profile mixes in their work.
+    """
+
+    def __init__(self, app, token: str, store: ProfileStore, interval: float = 0.005, exclude_prefix: str = "/profiles"):
+        self.app = app
+        self.token = token
+        self.store = store
+        self.interval = interval
+        self.exclude_prefix = exclude_prefix
+        self._in_flight = 0
+        self._active_profiles: List[Dict] = []
+
+    def _requested(self, scope) -> bool:
+        if scope.get("path", "").startswith(self.exclude_prefix):
+            return False
+        for name, value in scope.get("headers") or []:
+            if name == PROFILE_TOKEN_HEADER:
+                return token_matches(self.token, value.decode("latin-1"))
+        query_string = scope.get("query_string") or b""
+        if PROFILE_TOKEN_PARAM.encode("ascii") in query_string:
+            values = parse_qs(query_string.decode("latin-1")).get(PROFILE_TOKEN_PARAM)
+            return bool(values) and token_matches(self.token, values[0])
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Every request is counted, so profiles know what else was running (single event loop: no lock needed)
+        self._in_flight += 1
+        for active in self._active_profiles:
+            active["concurrent_requests"] = max(active["concurrent_requests"], self._in_flight)
+        try:
+            if self._requested(scope):
+                await self._profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope, receive, send):
+        sampler = StackSampler(self.interval)
+        # The id is reserved up front so it can go out in the response headers
+        profile_id = self.store.new_id()
+        status = {"code": None}
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-profile-id", profile_id.encode("ascii")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        active = {"concurrent_requests": self._in_flight}
+        self._active_profiles.append(active)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            # Joining the sampler and writing the files are blocking; keep them off the event loop
+            await asyncio.to_thread(sampler.stop)
+            self._active_profiles.remove(active)
+            await asyncio.to_thread(self.store.save, profile_id, sampler, {
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": status["code"],
+                "duration_seconds": round(time.perf_counter() - started, 4),
+                "concurrent_requests": active["concurrent_requests"],
+                "created_at": time.time(),
+            })
@@ -0,0 +1,390 @@
+"""
+Record/replay of upstream HTTP traffic (GitHub, Proxycurl, OpenRouter), so the connectors
+can be exercised and measured without live keys.
+
+HTTP_REPLAY_MODE=record sends requests for real and saves every response (status, body and
+rate-limit headers) as a fixture under HTTP_REPLAY_DIR/<service>/. HTTP_REPLAY_MODE=replay
+answers from those fixtures without touching the network, optionally with injected latency,
+jitter, errors and rate-limit exhaustion. Each setting can be overridden per service, e.g.
+HTTP_REPLAY_GITHUB_ERROR_RATE=0.2 or HTTP_REPLAY_OPENROUTER_MODE=off.
+"""
+import asyncio
+import base64
+import hashlib
+import http
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay")
+# Response headers worth keeping in a fixture; everything else (cookies, encodings, ids) is dropped
+_KEPT_HEADERS = ("content-type", "link", "retry-after", "x-ratelimit-", "x-proxycurl-")
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _setting(service: str, name: str, default: str) -> str:
+    return os.getenv(f"HTTP_REPLAY_{service.upper()}_{name}", os.getenv(f"HTTP_REPLAY_{name}", default))
+
+
+def _canonical_body(body) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        return body
+
+
+def request_signature(method: str, url: str, body=None) -> str:
+    """
+    Identifies a request by method, path, sorted query and (canonical JSON) body. The host is
+    left out, so fixtures recorded against the real API also answer a base-URL override.
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    digest = hashlib.sha256()
+    digest.update(f"{method.upper()} {parts.path} {json.dumps(query)}\n".encode("utf-8"))
+    digest.update(_canonical_body(body))
+    return digest.hexdigest()[:16]
+
+
+class ReplayedResponse:
+    __slots__ = ("status", "headers", "content", "delay")
+
+    def __init__(self, status: int, headers: Dict[str, str], content: bytes, delay: float = 0.0):
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.delay = delay
+
+
+class ServiceReplay:
+    """
+    Fixtures and fault injection for one upstream service. Settings default to the
+    HTTP_REPLAY_* environment: LATENCY_MS (a number, or "recorded" for each fixture's
+    recorded latency), JITTER_MS (uniform extra delay), ERROR_RATE (share of requests
+    answered 503), RATE_LIMIT and RATE_LIMIT_WINDOW_SECONDS (requests allowed per window
+    before the service's rate-limit response), and SEED for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        mode: Optional[str] = None,
+        directory: Optional[str] = None,
+        latency_ms: Optional[str] = None,
+        jitter_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: Optional[float] = None,
+        seed: Optional[str] = None
+    ):
+        self.service = service
+        self.mode = (mode or _setting(service, "MODE", "off")).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"HTTP replay mode must be one of {MODES}, got {self.mode!r}")
+        self.directory = os.path.join(directory or _setting(service, "DIR", os.path.join("fixtures", "http")), service)
+        self.latency_ms = str(latency_ms if latency_ms is not None else _setting(service, "LATENCY_MS", "0"))
+        self.jitter_ms = jitter_ms if jitter_ms is not None else float(_setting(service, "JITTER_MS", "0"))
+        self.error_rate = error_rate if error_rate is not None else float(_setting(service, "ERROR_RATE", "0"))
+        self.rate_limit = rate_limit if rate_limit is not None else int(_setting(service, "RATE_LIMIT", "0"))
+        self.rate_limit_window = rate_limit_window or float(_setting(service, "RATE_LIMIT_WINDOW_SECONDS", "60"))
+        seed = seed if seed is not None else _setting(service, "SEED", "")
+        self._random = random.Random(seed or None)
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_count = 0
+        self.stats = {
+            "requests": 0, "recorded": 0, "replayed": 0, "missing": 0, "errors_injected": 0, "rate_limited": 0,
+            "request_bytes": 0, "response_bytes": 0,
+        }
+
+    def fixture_path(self, method: str, url: str, body=None) -> str:
+        path = urlsplit(url).path.strip("/")
+        slug = _UNSAFE_NAME.sub("-", path.rsplit("/", 2)[-1] if path else "root")[:40].strip("-")
+        return os.path.join(self.directory, f"{method.upper()}-{slug}-{request_signature(method, url, body)}.json")
+
+    def record(self, method: str, url: str, body, status: int, headers, content: bytes, elapsed: float):
+        """Saves a real response as the fixture for its request (atomically, last write wins)."""
+        kept = {name: value for name, value in headers.items() if name.lower().startswith(_KEPT_HEADERS)}
+        fixture = {
+            "request": {"method": method.upper(), "url": url},
+            "response": {"status": status, "headers": kept, "elapsed_ms": round(elapsed * 1000, 1)},
+        }
+        try:
+            fixture["response"]["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            fixture["response"]["body_base64"] = base64.b64encode(content).decode("ascii")
+        path = self.fixture_path(method, url, body)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(fixture, f, indent=1)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write {self.service} fixture {path}: {e}")
+            return
+        with self._lock:
+            self.stats["recorded"] += 1
+        self._count(body, content)
+
+    def _count(self, body, content: bytes):
+        size = len(body.encode("utf-8") if isinstance(body, str) else body or b"")
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["request_bytes"] += size
+            self.stats["response_bytes"] += len(content)
+
+    def load_fixture(self, method: str, url: str, body=None) -> Optional[Dict]:
+        """
+        The response part of a request's fixture (status, headers, body or body_base64, elapsed_ms),
+        or None if there is none. Subclasses can synthesize responses here instead.
+        """
+        path = self.fixture_path(method, url, body)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            logger.warning(f"No {self.service} fixture for {method.upper()} {url} (expected {path})")
+            return None
+
+    def _delay(self, recorded_ms: float = 0.0) -> float:
+        base = recorded_ms if self.latency_ms == "recorded" else float(self.latency_ms)
+        jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, base + jitter) / 1000
+
+    def _rate_limited(self, window_end: float) -> ReplayedResponse:
+        retry_after = str(max(1, int(window_end - time.time() + 0.999)))
+        if self.service == "github":
+            return ReplayedResponse(403, {
+                "Content-Type": "application/json",
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(window_end)),
+                "Retry-After": retry_after,
+            }, b'{"message": "API rate limit exceeded (injected by HTTP replay)"}')
+        return ReplayedResponse(429, {"Content-Type": "application/json", "Retry-After": retry_after},
+                                b'{"error": "rate limit exceeded (injected by HTTP replay)"}')
+
+    def replay(self, method: str, url: str, body=None) -> ReplayedResponse:
+        """The response to serve for a request: an injected fault, or its fixture, with the configured delay."""
+        response = self._replay(method, url, body)
+        self._count(body, response.content)
+        return response
+
+    def _replay(self, method: str, url: str, body) -> ReplayedResponse:
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            window_end = self._window_start + self.rate_limit_window
+            if self.rate_limit and self._window_count > self.rate_limit:
+                self.stats["rate_limited"] += 1
+                response = self._rate_limited(window_end)
+                response.delay = self._delay()
+                return response
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats["errors_injected"] += 1
+                return ReplayedResponse(503, {"Content-Type": "application/json"},
+                                        b'{"message": "injected error (HTTP replay)"}', self._delay())
+            remaining = self.rate_limit - self._window_count
+
+        recorded = self.load_fixture(method, url, body)
+        if recorded is None:
+            with self._lock:
+                self.stats["missing"] += 1
+            return ReplayedResponse(501, {"Content-Type": "application/json"},
+                                    json.dumps({"message": f"No recorded fixture for {method.upper()} {urlsplit(url).path}"}).encode("utf-8"))
+        content = base64.b64decode(recorded["body_base64"]) if "body_base64" in recorded else recorded.get("body", "").encode("utf-8")
+        headers = dict(recorded.get("headers", {}))
+        if self.rate_limit and self.service == "github":
+            # Report the simulated window, so the fetcher's own rate-limit tracking is exercised
+            headers.update({
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, remaining)),
+                "X-RateLimit-Reset": str(int(window_end)),
+            })
+        with self._lock:
+            self.stats["replayed"] += 1
+        return ReplayedResponse(recorded["status"], headers, content, self._delay(recorded.get("elapsed_ms", 0.0)))
+
+
+_services: Dict[str, Optional[ServiceReplay]] = {}
+_services_lock = threading.Lock()
+
+
+def get_service_replay(service: str) -> Optional[ServiceReplay]:
+    """The service's replay settings, or None when record/replay is off for it."""
+    with _services_lock:
+        if service not in _services:
+            replay = ServiceReplay(service)
+            _services[service] = replay if replay.mode != "off" else None
+            if replay.mode != "off":
+                logger.info(f"HTTP {replay.mode} for {service} using {replay.directory}")
+        return _services[service]
+
+
+def set_service_replay(service: str, replay: Optional[ServiceReplay]) -> None:
+    """
+    Installs replay settings for a service (e.g. a ServiceReplay subclass that synthesizes
+    responses), or None to turn it off. Only clients created afterwards pick it up.
+    """
+    with _services_lock:
+        _services[service] = replay
+
+
+def _read_timeout(timeout) -> Optional[float]:
+    return timeout[1] if isinstance(timeout, tuple) else timeout
+
+
+# --- requests ---
+
+class ReplayAdapter(HTTPAdapter):
+    """requests transport adapter: in record mode, sends for real and saves the response; in replay mode, never connects."""
+
+    def __init__(self, replay: ServiceReplay, **kwargs):
+        super().__init__(**kwargs)
+        self.replay = replay
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.replay.mode == "record":
+            started = time.perf_counter()
+            response = super().send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            self.replay.record(request.method, request.url, request.body, response.status_code,
+                               response.headers, response.content, time.perf_counter() - started)
+            return response
+
+        replayed = self.replay.replay(request.method, request.url, request.body)
+        read_timeout = _read_timeout(timeout)
+        if read_timeout is not None and replayed.delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Replayed {self.replay.service} response is slower than the {read_timeout}s timeout", request=request)
+        if replayed.delay:
+            time.sleep(replayed.delay)
+        response = requests.Response()
+        response.status_code = replayed.status
+        response.headers = CaseInsensitiveDict(replayed.headers)
+        response._content = replayed.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.reason = http.HTTPStatus(replayed.status).phrase if replayed.status in http.HTTPStatus._value2member_map_ else ""
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def replay_session(service: str, **adapter_kwargs) -> requests.Session:
+    """A requests.Session for the service, routed through ReplayAdapter when record/replay is on for it."""
+    session = requests.Session()
+    replay = get_service_replay(service)
+    adapter = ReplayAdapter(replay, **adapter_kwargs) if replay is not None else HTTPAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# --- httpx ---
+
+def _copied_response(response: httpx.Response, content: bytes) -> httpx.Response:
+    # The body has been read (and decoded), so drop the headers that describe the wire encoding
+    headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+    return httpx.Response(response.status_code, headers=headers, content=content, extensions=response.extensions)
+
+
+def _replayed_httpx_response(replayed: ReplayedResponse) -> httpx.Response:
+    return httpx.Response(replayed.status, headers=replayed.headers, content=replayed.content)
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """httpx transport with ReplayAdapter's behaviour, for sync clients (e.g. the OpenAI SDK's)."""
+
+    def __init__(self, replay: ServiceReplay, **transport_kwargs):
+        self.replay = replay
+        self.real = httpx.HTTPTransport(**transport_kwargs)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        if self.replay.mode == "record":
+            started = time.perf_counter()
+            response = self.real.handle_request(request)
+            try:
+                content = response.read()
+            finally:
+                response.close()
+            self.replay.record(request.method, str(request.url), body, response.status_code,
+                               response.headers, content, time.perf_counter() - started)
+            return _copied_response(response, content)
+
+        replayed = self.replay.replay(request.method, str(request.url), body)
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        if read_timeout is not None and replayed.delay > read_timeout:
+            time.sleep(read_timeout)
+            raise httpx.ReadTimeout(f"Replayed {self.replay.service} response is slower than the {read_timeout}s timeout", request=request)
+        if replayed.delay:
+            time.sleep(replayed.delay)
+        return _replayed_httpx_response(replayed)
+
+    def close(self):
+        self.real.close()
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """ReplayTransport for async clients."""
+
+    def __init__(self, replay: ServiceReplay, **transport_kwargs):
+        self.replay = replay
+        self.real = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        if self.replay.mode == "record":
+            started = time.perf_counter()
+            response = await self.real.handle_async_request(request)
+            try:
+                content = await response.aread()
+            finally:
+                await response.aclose()
+            self.replay.record(request.method, str(request.url), body, response.status_code,
+                               response.headers, content, time.perf_counter() - started)
+            return _copied_response(response, content)
+
+        replayed = self.replay.replay(request.method, str(request.url), body)
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        if read_timeout is not None and replayed.delay > read_timeout:
+            await asyncio.sleep(read_timeout)
+            raise httpx.ReadTimeout(f"Replayed {self.replay.service} response is slower than the {read_timeout}s timeout", request=request)
+        if replayed.delay:
+            await asyncio.sleep(replayed.delay)
+        return _replayed_httpx_response(replayed)
+
+    async def aclose(self):
+        await self.real.aclose()
+
+
+def httpx_transport(service: str, asynchronous: bool = False, **transport_kwargs):
+    """
+    httpx transport for the service: a (Async)ReplayTransport when record/replay is on for it,
+    else the regular HTTP transport built with transport_kwargs (e.g. limits).
+    """
+    replay = get_service_replay(service)
+    if asynchronous:
+        return AsyncReplayTransport(replay, **transport_kwargs) if replay is not None else httpx.AsyncHTTPTransport(**transport_kwargs)
+    return ReplayTransport(replay, **transport_kwargs) if replay is not None else httpx.HTTPTransport(**transport_kwargs)
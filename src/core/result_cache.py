@@ -0,0 +1,219 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.core.metrics import CACHE_REQUESTS
+from src.core.models import SearchParams
+
+
+class InvalidCursor(Exception):
+    """Raised for cursors that are malformed or point at an evicted/expired result set."""
+    pass
+
+
+class CursorScopeMismatch(InvalidCursor):
+    """Raised for a cursor issued by a different endpoint than the one it was sent to."""
+    pass
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        value = " ".join(value.lower().split())
+        return value or None
+    if isinstance(value, list):
+        items = sorted({v for v in (_normalize_value(item) for item in value) if v})
+        return items or None
+    return value
+
+
+def result_set_key(scope: str, params: SearchParams, sources: Optional[List[str]] = None) -> str:
+    """
+    Cache key for a ranked result set: the endpoint scope plus normalized SearchParams.
+    Case, whitespace and list order don't change the key; `limit` is a page concern and is ignored.
+    """
+    normalized = {
+        field: _normalize_value(value)
+        for field, value in sorted(params.dict().items())
+        if field != "limit"
+    }
+    normalized["_sources"] = sorted(sources) if sources else None
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{scope}|{payload}".encode("utf-8")).hexdigest()[:32]
+
+
+class CachedResultSet:
+    """
+    A ranked result set. Items are serialized to JSON on first use and kept that way, so
+    later pages are just string joins and no page pays for candidates it doesn't show.
+    `scope` names the endpoint that produced it; its cursors are only valid there.
+    `generation` tells this result set from a later one stored under the same key.
+    """
+    __slots__ = ("key", "scope", "generation", "_models", "_json", "metadata", "complete", "created_at", "size_bytes")
+
+    # Items serialized up front to estimate the entry's size; the first page needs them anyway
+    SIZE_SAMPLE = 20
+
+    def __init__(self, key: str, items: List[BaseModel], metadata: Dict, complete: bool, scope: Optional[str] = None):
+        self.key = key
+        self.scope = scope
+        self.generation = secrets.token_hex(4)
+        self._models: List[Optional[BaseModel]] = list(items)
+        self._json: List[Optional[str]] = [None] * len(self._models)
+        self.metadata = metadata
+        self.complete = complete
+        self.created_at = time.monotonic()
+        sample = self._serialized(0, self.SIZE_SAMPLE)
+        average = sum(len(item) for item in sample) / len(sample) if sample else 0
+        self.size_bytes = int(average * len(self._json)) + len(json.dumps(metadata))
+
+    @property
+    def total(self) -> int:
+        return len(self._json)
+
+    def _serialized(self, start: int, stop: int) -> List[str]:
+        # Racing readers may both serialize an item; they write the same string
+        for index in range(start, min(stop, len(self._json))):
+            if self._json[index] is None:
+                self._json[index] = self._models[index].json()
+                self._models[index] = None
+        return self._json[start:stop]
+
+    def page_json(self, offset: int, page_size: int, next_cursor: Optional[str], extra: Optional[Dict] = None) -> str:
+        """Renders one page as a JSON object, serializing only the candidates on it."""
+        envelope = {**self.metadata, **(extra or {}), "total": self.total, "next_cursor": next_cursor}
+        head = json.dumps(envelope)[:-1]  # drop the closing brace
+        candidates = ",".join(self._serialized(offset, offset + page_size))
+        return f'{head}, "candidates": [{candidates}]}}'
+
+
+class ResultSetCache:
+    """
+    In-process cache of ranked search results for cursor pagination.
+    Entries expire after ttl_seconds; the least recently used ones are evicted
+    once the serialized size of all entries exceeds max_bytes.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResultSet]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size_bytes
+
+    def get(self, key: str, require_complete: bool = False) -> Optional[CachedResultSet]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_at > self.ttl_seconds:
+                self._drop(key)
+                entry = None
+            if entry is None or (require_complete and not entry.complete):
+                self.stats["misses"] += 1
+                CACHE_REQUESTS.labels("result_set", "miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        CACHE_REQUESTS.labels("result_set", "hit").inc()
+        return entry
+
+    def put(self, key: str, items: List[BaseModel], metadata: Dict, complete: bool = True, scope: Optional[str] = None) -> CachedResultSet:
+        entry = CachedResultSet(key, items, metadata, complete, scope)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._total_bytes += entry.size_bytes
+            # Keep the newest entry even if it alone is over budget; the next put evicts it
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+        return entry
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+def encode_cursor(key: str, offset: int, page_size: int, scope: Optional[str] = None, generation: Optional[str] = None) -> str:
+    """
+    Opaque cursor naming the result set (its key, i.e. the query hash, the endpoint scope and
+    the generation stored under that key) and a position in it.
+    """
+    raw = json.dumps({"k": key, "s": scope, "g": generation, "o": offset, "n": page_size}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(data, dict) or not isinstance(data.get("k"), str):
+            raise ValueError("missing key")
+        return {
+            "key": data["k"],
+            "scope": data.get("s"),
+            "generation": data.get("g"),
+            "offset": max(0, int(data["o"])),
+            "page_size": max(1, int(data["n"]))
+        }
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+
+
+def render_page(entry: CachedResultSet, offset: int, page_size: int, extra: Optional[Dict] = None) -> str:
+    """JSON for one page of a cached result set, including the cursor for the next page."""
+    next_offset = offset + page_size
+    next_cursor = encode_cursor(entry.key, next_offset, page_size, entry.scope, entry.generation) if next_offset < entry.total else None
+    return entry.page_json(offset, page_size, next_cursor, extra)
+
+
+def load_page(
+    cache: ResultSetCache,
+    cursor: str,
+    page_size: Optional[int] = None,
+    extra: Optional[Dict] = None,
+    scope: Optional[str] = None
+) -> str:
+    """
+    Resolves a cursor against the cache; raises InvalidCursor if the result set is gone or was
+    replaced by a rerun of the search (its ranking may differ, so the offset no longer applies),
+    or CursorScopeMismatch if the cursor (or its result set) belongs to another scope.
+    """
+    position = decode_cursor(cursor)
+    if position["scope"] != scope:
+        raise CursorScopeMismatch(f"Cursor was issued by {position['scope'] or 'another endpoint'}, not {scope}")
+    entry = cache.get(position["key"])
+    if entry is not None and entry.scope != scope:
+        raise CursorScopeMismatch(f"Cursor was issued by {entry.scope or 'another endpoint'}, not {scope}")
+    if entry is None or entry.generation != position["generation"]:
+        raise InvalidCursor("Result set expired or evicted; run the search again")
+    return render_page(entry, position["offset"], page_size or position["page_size"], extra)
+
+
+_shared_cache: Optional[ResultSetCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultSetCache:
+    """Process-wide result-set cache shared by /talent_search and /github/search."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultSetCache(
+                ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "900")),
+                max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+            )
+        return _shared_cache
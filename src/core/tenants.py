@@ -0,0 +1,51 @@
+import hmac
+import os
+from typing import Dict, Optional
+
+from fastapi import Header, HTTPException
+
+
+def parse_api_keys(spec: str) -> Dict[str, str]:
+    """
+    API keys and the tenants they belong to, from "key=tenant" pairs separated by commas
+    (e.g. "k3y-a=acme,k3y-b=globex"). Pairs without both parts are ignored.
+    """
+    keys = {}
+    for pair in spec.split(","):
+        key, _, tenant = pair.partition("=")
+        if key.strip() and tenant.strip():
+            keys[key.strip()] = tenant.strip()
+    return keys
+
+
+# Tenants are only ever derived from these server-side keys, never taken from the request
+TENANT_API_KEYS = parse_api_keys(os.getenv("TENANT_API_KEYS", ""))
+
+
+def tenant_for_api_key(api_key: Optional[str], keys: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """The tenant an API key belongs to, or None for a missing or unknown key."""
+    keys = TENANT_API_KEYS if keys is None else keys
+    if not api_key:
+        return None
+    tenant = None
+    # Compare against every key, so the time taken doesn't tell which one came close
+    for known_key, known_tenant in keys.items():
+        if hmac.compare_digest(known_key.encode("utf-8"), api_key.encode("utf-8")):
+            tenant = known_tenant
+    return tenant
+
+
+def authenticated_tenant(
+    x_api_key: Optional[str] = Header(None, description="API key; its tenant pays for the Proxycurl credits spent.")
+) -> Optional[str]:
+    """
+    FastAPI dependency: the tenant of the request's X-Api-Key. Without TENANT_API_KEYS the
+    service is single-tenant and every request gets None (PROXYCURL_DEFAULT_TENANT pays);
+    with it, a missing or unknown key is rejected with 401.
+    """
+    if not TENANT_API_KEYS:
+        return None
+    tenant = tenant_for_api_key(x_api_key)
+    if tenant is None:
+        raise HTTPException(status_code=401, detail="A valid X-Api-Key header is required")
+    return tenant
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from src.core import deadline as deadline_module
+from src.core.deadline import Deadline, DeadlineExceeded, ensure_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(deadline_module.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(deadline_module.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_remaining_counts_down_and_stops_at_zero(clock):
+    deadline = Deadline(10)
+    clock.now += 4
+    assert deadline.remaining() == pytest.approx(6)
+    assert deadline.elapsed() == pytest.approx(4)
+    clock.now += 20
+    assert deadline.remaining() == 0
+    assert deadline.expired
+
+
+def test_unlimited_never_expires(clock):
+    deadline = ensure_deadline(None)
+    clock.now += 1e9
+    assert deadline.remaining() == math.inf
+    assert deadline.can_afford(1e9)
+    assert deadline.timeout(15) == 15
+
+
+def test_can_afford_and_timeout(clock):
+    deadline = Deadline(2)
+    assert deadline.can_afford(2)
+    assert not deadline.can_afford(2.01)
+    assert deadline.timeout(15) == pytest.approx(2)
+    clock.now += 5
+    assert deadline.timeout(15) == 0.001
+
+
+def test_check_raises_and_records_the_stage(clock):
+    deadline = Deadline(1)
+    deadline.check("nlp_parse")
+    clock.now += Deadline.MIN_CALL_BUDGET + 0.1
+    with pytest.raises(DeadlineExceeded):
+        deadline.check("repo_search")
+    with pytest.raises(DeadlineExceeded):
+        deadline.check("repo_search")
+    assert deadline.truncated_stages == ["repo_search"]
+
+
+def test_sleep_only_when_a_call_still_fits_afterwards(clock):
+    deadline = Deadline(3)
+    assert deadline.sleep(2, "backoff")
+    assert clock.slept == [2]
+    assert not deadline.sleep(1, "backoff")
+    assert clock.slept == [2]
+    assert deadline.truncated_stages == ["backoff"]
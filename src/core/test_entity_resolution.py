@@ -0,0 +1,90 @@
+from src.core.entity_resolution import EntityResolver, normalize_tokens, profile_key, website_domain
+from src.core.models import CandidateProfile
+
+
+def github(login, **fields):
+    return CandidateProfile(github_username=login, github_url=f"https://github.com/{login}", **fields)
+
+
+def linkedin(slug, **fields):
+    return CandidateProfile(linkedin_url=f"https://www.linkedin.com/in/{slug}", **fields)
+
+
+def test_helpers():
+    assert normalize_tokens("José  O'Neil-Smith") == ["jose", "o", "neil", "smith"]
+    assert website_domain("www.jane.dev/blog") == "jane.dev"
+    assert website_domain("https://github.com/jane") is None
+    assert website_domain(None) is None
+    assert profile_key("https://www.linkedin.com/in/Jane-Doe/") == "li:jane-doe"
+    assert profile_key("github.com/jdoe") == "gh:jdoe"
+    assert profile_key("https://github.com/jdoe/dotfiles") is None
+
+
+def test_profiles_linked_by_website_merge_across_sources():
+    profiles = [
+        github("jdoe", name="jdoe", location="Berlin", skills=["Python", "Django"]),
+        linkedin("jane-doe", name="Jane Doe", location="Berlin, Germany", skills=["python", "SQL"],
+                 website="https://github.com/jdoe"),
+        github("jdoe", name="Jane Doe", location="Berlin"),
+    ]
+    resolved = EntityResolver().resolve(profiles)
+    assert len(resolved) == 1
+    merged = resolved[0]
+    assert merged.name == "Jane Doe"
+    assert merged.github_username == "jdoe"
+    assert merged.linkedin_url == "https://www.linkedin.com/in/jane-doe"
+    assert merged.skills == ["Python", "Django", "SQL"]
+
+
+def test_shared_personal_domain_tips_a_partial_name_match():
+    with_domain = [
+        github("jd", name="Jane A. Doe", website="https://jane.dev"),
+        linkedin("jane", name="Jane Doe", website="jane.dev/about"),
+    ]
+    without_domain = [github("jd", name="Jane A. Doe"), linkedin("jane", name="Jane Doe")]
+    assert len(EntityResolver().resolve(with_domain)) == 1
+    assert len(EntityResolver().resolve(without_domain)) == 2
+
+
+def test_same_name_and_city_alone_do_not_merge():
+    profiles = [
+        github("jsmith", name="John Smith", location="London", skills=["Go", "Kubernetes"]),
+        linkedin("john-smith-42", name="John Smith", location="London, United Kingdom", skills=["Sales", "CRM"]),
+    ]
+    assert len(EntityResolver().resolve(profiles)) == 2
+
+
+def test_same_name_with_matching_skills_merge():
+    skills = ["Go", "Kubernetes", "Terraform", "PostgreSQL"]
+    profiles = [
+        github("jsmith", name="John Smith", location="London", skills=skills),
+        linkedin("john-smith-42", name="John Smith", location="London, United Kingdom", skills=skills[:3]),
+    ]
+    assert len(EntityResolver().resolve(profiles)) == 1
+
+
+def test_different_people_stay_apart():
+    profiles = [
+        github("alice", name="Alice Smith", location="Berlin"),
+        linkedin("bob", name="Bob Jones", location="Berlin"),
+    ]
+    assert [p.name for p in EntityResolver().resolve(profiles)] == ["Alice Smith", "Bob Jones"]
+
+
+def test_never_joins_two_accounts_of_the_same_source():
+    profiles = [
+        github("jdoe1", name="Jane Doe", location="Berlin", website="jane.dev"),
+        linkedin("jane-doe", name="Jane Doe", location="Berlin", website="jane.dev"),
+        github("jdoe2", name="Jane Doe", location="Berlin", website="jane.dev"),
+    ]
+    resolved = EntityResolver().resolve(profiles)
+    assert sorted(p.github_username for p in resolved) == ["jdoe1", "jdoe2"]
+    assert sum(p.linkedin_url is not None for p in resolved) == 1
+
+
+def test_oversized_blocks_are_skipped():
+    profiles = [linkedin(f"x{i}", name="Sam Lee") for i in range(5)]
+    resolver = EntityResolver(max_block_size=3)
+    assert len(resolver.resolve(profiles)) == 5
+    assert resolver.last_stats["skipped_blocks"] >= 1
+    assert resolver.last_stats["merges"] == 0
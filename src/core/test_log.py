@@ -0,0 +1,47 @@
+import json
+import logging
+import queue
+import sys
+
+from src.core.log import ContextQueueHandler, JsonFormatter
+
+
+def _enqueued(record):
+    log_queue = queue.Queue()
+    ContextQueueHandler(log_queue).handle(record)
+    return log_queue.get_nowait()
+
+
+def _record(msg, args, exc_info=None):
+    return logging.LogRecord("test", logging.ERROR, __file__, 1, msg, args, exc_info)
+
+
+def test_exception_survives_the_queue_for_the_json_formatter():
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = _record("failed %s", ("parse",), sys.exc_info())
+
+    queued = _enqueued(record)
+    payload = json.loads(JsonFormatter().format(queued))
+
+    assert payload["message"] == "failed parse"
+    assert "ValueError: bad input" in payload["exception"]
+
+
+def test_prepare_copies_instead_of_mutating_the_callers_record():
+    record = _record("count %d", (3,))
+    queued = _enqueued(record)
+
+    assert queued is not record
+    assert queued.args == (3,)
+    assert not hasattr(record, "request_id")
+    assert hasattr(queued, "request_id")
+
+
+def test_mutable_arguments_are_rendered_at_call_time():
+    items = ["a"]
+    queued = _enqueued(_record("items %s", (items,)))
+    items.append("b")
+
+    assert queued.getMessage() == "items ['a']"
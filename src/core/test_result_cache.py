@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from src.core import result_cache as result_cache_module
+from src.core.models import CandidateProfile, SearchParams
+from src.core.result_cache import (
+    CursorScopeMismatch, InvalidCursor, ResultSetCache, decode_cursor, encode_cursor, load_page, render_page,
+    result_set_key,
+)
+
+
+def candidates(count):
+    return [CandidateProfile(name=f"Person {i}") for i in range(count)]
+
+
+def names(page_json):
+    return [c["name"] for c in json.loads(page_json)["candidates"]]
+
+
+def test_key_ignores_case_whitespace_order_and_limit():
+    a = SearchParams(intent="find_candidates", title="Data  Engineer", skills=["SQL", "Python"], limit=5)
+    b = SearchParams(intent="find_candidates", title="data engineer", skills=["python", "sql"])
+    assert result_set_key("talent_search", a) == result_set_key("talent_search", b)
+    assert result_set_key("talent_search", a) != result_set_key("github_search:30", a)
+    assert result_set_key("talent_search", a, ["github"]) != result_set_key("talent_search", a)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("abc", 20, 10, "talent_search", "g1")
+    assert decode_cursor(cursor) == {"key": "abc", "scope": "talent_search", "generation": "g1", "offset": 20, "page_size": 10}
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_follow_the_cursor_to_the_end():
+    cache = ResultSetCache()
+    entry = cache.put("k", candidates(5), {"query": "q"}, scope="talent_search")
+    first = json.loads(render_page(entry, 0, 2))
+    assert first["total"] == 5 and first["query"] == "q"
+    assert [c["name"] for c in first["candidates"]] == ["Person 0", "Person 1"]
+
+    seen, cursor = [], first["next_cursor"]
+    while cursor:
+        page = json.loads(load_page(cache, cursor, scope="talent_search"))
+        seen += [c["name"] for c in page["candidates"]]
+        cursor = page["next_cursor"]
+    assert seen == ["Person 2", "Person 3", "Person 4"]
+    assert names(load_page(cache, first["next_cursor"], page_size=10, scope="talent_search")) == seen
+
+
+def test_cursor_is_rejected_on_another_endpoint():
+    cache = ResultSetCache()
+    entry = cache.put("k", candidates(3), {}, scope="github_search")
+    cursor = json.loads(render_page(entry, 0, 1))["next_cursor"]
+    with pytest.raises(CursorScopeMismatch):
+        load_page(cache, cursor, scope="talent_search")
+    forged = encode_cursor("k", 1, 1, "talent_search")
+    with pytest.raises(CursorScopeMismatch):
+        load_page(cache, forged, scope="talent_search")
+
+
+def test_expired_entries_miss(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultSetCache(ttl_seconds=10)
+    entry = cache.put("k", candidates(3), {}, scope="talent_search")
+    cursor = json.loads(render_page(entry, 0, 1))["next_cursor"]
+    now[0] += 11
+    assert cache.get("k") is None
+    with pytest.raises(InvalidCursor):
+        load_page(cache, cursor, scope="talent_search")
+
+
+def test_cursor_expires_when_the_search_is_rerun():
+    cache = ResultSetCache()
+    entry = cache.put("k", candidates(3), {}, complete=False, scope="talent_search")
+    cursor = json.loads(render_page(entry, 0, 1))["next_cursor"]
+    rerun = cache.put("k", list(reversed(candidates(3))), {}, scope="talent_search")
+    with pytest.raises(InvalidCursor):
+        load_page(cache, cursor, scope="talent_search")
+    fresh = json.loads(render_page(rerun, 0, 1))["next_cursor"]
+    assert names(load_page(cache, fresh, scope="talent_search")) == ["Person 1"]
+
+
+def test_items_are_serialized_only_when_a_page_shows_them(monkeypatch):
+    monkeypatch.setattr(result_cache_module.CachedResultSet, "SIZE_SAMPLE", 2)
+    serialized = []
+
+    class Tracked(CandidateProfile):
+        def json(self, *args, **kwargs):
+            serialized.append(self.name)
+            return super().json(*args, **kwargs)
+
+    cache = ResultSetCache()
+    entry = cache.put("k", [Tracked(name=f"Person {i}") for i in range(6)], {}, scope="talent_search")
+    assert serialized == ["Person 0", "Person 1"]
+    assert entry.size_bytes > 0
+    assert names(render_page(entry, 2, 2)) == ["Person 2", "Person 3"]
+    render_page(entry, 0, 4)
+    assert serialized == ["Person 0", "Person 1", "Person 2", "Person 3"]
+
+
+def test_incomplete_entries_only_serve_pages():
+    cache = ResultSetCache()
+    cache.put("k", candidates(1), {}, complete=False)
+    assert cache.get("k", require_complete=True) is None
+    assert cache.get("k") is not None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultSetCache(max_bytes=1)
+    cache.put("a", candidates(2), {})
+    cache.put("b", candidates(2), {})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats["evictions"] == 1
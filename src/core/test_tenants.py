@@ -0,0 +1,29 @@
+import pytest
+from fastapi import HTTPException
+
+from src.core import tenants
+from src.core.tenants import authenticated_tenant, parse_api_keys, tenant_for_api_key
+
+
+def test_parse_api_keys():
+    assert parse_api_keys(" k1 = acme,k2=globex,,broken,=nobody") == {"k1": "acme", "k2": "globex"}
+    assert parse_api_keys("") == {}
+
+
+def test_tenant_comes_only_from_a_known_key():
+    keys = {"k1": "acme"}
+    assert tenant_for_api_key("k1", keys) == "acme"
+    assert tenant_for_api_key("k2", keys) is None
+    assert tenant_for_api_key(None, keys) is None
+
+
+def test_dependency_rejects_unknown_keys_once_keys_are_configured(monkeypatch):
+    monkeypatch.setattr(tenants, "TENANT_API_KEYS", {})
+    assert authenticated_tenant(None) is None  # single-tenant: the default tenant pays
+
+    monkeypatch.setattr(tenants, "TENANT_API_KEYS", {"k1": "acme"})
+    assert authenticated_tenant("k1") == "acme"
+    for api_key in (None, "acme"):
+        with pytest.raises(HTTPException) as error:
+            authenticated_tenant(api_key)
+        assert error.value.status_code == 401
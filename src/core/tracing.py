@@ -0,0 +1,207 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation in a trace; children link to their parent through parent_id."""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "status", "error", "thread", "_started")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.thread = threading.current_thread().name
+        self._started = time.perf_counter()
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def finish(self):
+        self.end = self.start + (time.perf_counter() - self._started)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return round((self.end - self.start) * 1000, 3) if self.end is not None else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+            "attributes": self.attributes,
+        }
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory, for the /traces endpoints."""
+
+    def __init__(self, capacity: int = 10000):
+        self._spans: deque = deque(maxlen=capacity)
+
+    def export(self, span_dict: Dict):
+        self._spans.append(span_dict)
+
+    def spans(self) -> List[Dict]:
+        return list(self._spans)
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSON Lines file, through one handle kept open (line-buffered)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        atexit.register(self.close)
+
+    def export(self, span_dict: Dict):
+        line = json.dumps(span_dict, default=str) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    def __init__(self, exporters: Optional[List] = None, enabled: bool = True):
+        self.exporters = exporters or []
+        self.enabled = enabled
+        self.buffer = next((e for e in self.exporters if isinstance(e, RingBufferExporter)), None)
+
+    def export(self, span: Span):
+        span_dict = span.to_dict()
+        for exporter in self.exporters:
+            try:
+                exporter.export(span_dict)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {e}")
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """
+    Process-wide tracer. TRACING_ENABLED (default 1) switches it on, TRACE_BUFFER_SPANS
+    sizes the in-memory buffer and TRACE_JSONL_PATH additionally writes spans to a file.
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters: List = [RingBufferExporter(int(os.getenv("TRACE_BUFFER_SPANS", "10000")))]
+            if os.getenv("TRACE_JSONL_PATH"):
+                exporters.append(JsonlExporter(os.environ["TRACE_JSONL_PATH"]))
+            _tracer = Tracer(exporters, enabled=os.getenv("TRACING_ENABLED", "1") != "0")
+        return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+
+
+class _NoopSpan:
+    trace_id = span_id = None
+
+    def set(self, key: str, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Times the enclosed block as a child of the current span (or as a new trace root).
+    The current span follows contextvars, so it carries into asyncio tasks and
+    asyncio.to_thread workers. Exceptions mark the span as an error and propagate.
+    """
+    tracer = get_tracer()
+    if not tracer.enabled:
+        yield _NOOP_SPAN
+        return
+    parent = _current_span.get()
+    current = Span(name, parent.trace_id if parent else uuid.uuid4().hex, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        tracer.export(current)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current else None
+
+
+def critical_path(spans: List[Dict]) -> List[Dict]:
+    """
+    Follows the root down through, at each level, the child that finished last:
+    the chain of spans that determined when the trace completed.
+    """
+    children: Dict[Optional[str], List[Dict]] = {}
+    span_ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in span_ids else None
+        children.setdefault(parent, []).append(s)
+    path = []
+    level = children.get(None, [])
+    while level:
+        last = max(level, key=lambda s: s["end"] or 0)
+        path.append({"name": last["name"], "span_id": last["span_id"], "duration_ms": last["duration_ms"]})
+        level = children.get(last["span_id"], [])
+    return path
+
+
+def trace_summaries(spans: List[Dict], min_duration_ms: float = 0.0, limit: int = 50) -> List[Dict]:
+    """One entry per trace (root span name, duration, span count), newest first."""
+    traces: Dict[str, Dict] = {}
+    for s in spans:
+        entry = traces.setdefault(s["trace_id"], {"trace_id": s["trace_id"], "root": None, "start": s["start"], "duration_ms": None, "span_count": 0, "errors": 0})
+        entry["span_count"] += 1
+        entry["start"] = min(entry["start"], s["start"])
+        if s["status"] == "error":
+            entry["errors"] += 1
+        if s["parent_id"] is None:
+            entry["root"] = s["name"]
+            entry["duration_ms"] = s["duration_ms"]
+    summaries = [t for t in traces.values() if (t["duration_ms"] or 0) >= min_duration_ms]
+    summaries.sort(key=lambda t: t["start"], reverse=True)
+    return summaries[:limit]
@@ -0,0 +1,241 @@
+"""
+Checkpointed resume batch runs.
+
+Every result is appended to `<output_dir>/results.jsonl` as soon as it is ready, and
+`<output_dir>/manifest.json` records which files (by SHA-256 of their bytes) are done.
+Re-running the same command after a crash skips the completed files.
+
+Usage:
+    python -m src.orchestrator.batch_runner --jd-file jd.txt --output runs/backend resumes/
+    python -m src.orchestrator.batch_runner --jd-file jd.txt --output runs/backend --parallel a.pdf b.pdf
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.orchestrator.resume_cache import content_hash
+from src.orchestrator.resume_uploads import json_default
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class BatchManifest:
+    """
+    Per-file status of a run, keyed by content hash. results.jsonl is the source of truth:
+    the manifest also records how many bytes of it it covers, and on load any lines
+    appended after that (a crash between checkpoints) are replayed into it.
+    """
+
+    def __init__(self, output_dir: str, job_description: str):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, "manifest.json")
+        self.sink_path = os.path.join(output_dir, "results.jsonl")
+        self.jd_hash = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+        self.items: Dict[str, Dict] = {}
+        self.sink_bytes = 0
+
+    def load(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("job_description_sha256") != self.jd_hash:
+                raise ValueError(f"{self.output_dir} holds a run for a different job description")
+            self.items = manifest.get("items", {})
+            self.sink_bytes = manifest.get("sink_bytes", 0)
+        self._recover_sink()
+
+    def _recover_sink(self):
+        if not os.path.exists(self.sink_path):
+            self.sink_bytes = 0
+            return
+        with open(self.sink_path, "rb+") as sink:
+            sink.seek(self.sink_bytes)
+            offset = self.sink_bytes
+            for line in sink:
+                if not line.endswith(b"\n"):
+                    # Torn write from a crash: drop the partial line
+                    sink.truncate(offset)
+                    logger.warning(f"Dropped a partial line at byte {offset} of {self.sink_path}")
+                    break
+                try:
+                    self.record(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    # A complete but unreadable line: skip it, the lines after it are still good
+                    logger.warning(f"Skipped an unreadable line at byte {offset} of {self.sink_path}: {e}")
+                offset += len(line)
+            self.sink_bytes = offset
+
+    def record(self, entry: Dict):
+        previous = self.items.get(entry["file_sha256"], {})
+        self.items[entry["file_sha256"]] = {
+            "status": entry["status"],
+            "path": entry["path"],
+            "attempts": previous.get("attempts", 0) + 1,
+            "error": entry.get("error"),
+        }
+
+    def is_done(self, file_hash: str, retry_failed: bool, max_attempts: Optional[int] = None) -> bool:
+        """Finished, or failed and not to be retried: retries are off or max_attempts is used up."""
+        item = self.items.get(file_hash, {})
+        status = item.get("status")
+        if status == "failed" and max_attempts is not None and item.get("attempts", 0) >= max_attempts:
+            return True
+        return status == "ok" or (status == "failed" and not retry_failed)
+
+    def checkpoint(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "job_description_sha256": self.jd_hash,
+                "sink_bytes": self.sink_bytes,
+                "updated_at": time.time(),
+                "items": self.items,
+            }, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+class CheckpointedBatchRunner:
+    """
+    Runs resumes through a ResumeOrchestrator, appending each result to results.jsonl
+    as it completes and checkpointing the manifest every checkpoint_every results.
+    A resume that fails is written as a `failed` line with its error; the batch goes on.
+    Failed resumes are retried on the next run unless retry_failed is False, up to
+    max_attempts attempts in all, so a resume that keeps failing (or keeps killing its
+    worker process in parallel mode) stops being retried.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        orchestrator=None,
+        parallel: bool = False,
+        retry_failed: bool = True,
+        max_attempts: int = 3,
+        checkpoint_every: int = 25
+    ):
+        if orchestrator is None:
+            from src.orchestrator.pipeline import ResumeOrchestrator
+            orchestrator = ResumeOrchestrator()
+        self.output_dir = output_dir
+        self.orchestrator = orchestrator
+        self.parallel = parallel
+        self.retry_failed = retry_failed
+        self.max_attempts = max(1, max_attempts)
+        self.checkpoint_every = max(1, checkpoint_every)
+
+    def _pending(self, paths: List[str], manifest: BatchManifest, stats: Dict) -> List[Tuple[str, str]]:
+        pending: Dict[str, str] = {}
+        for path in paths:
+            try:
+                file_hash = content_hash(path)
+            except OSError as e:
+                logger.warning(f"Skipping unreadable resume {path}: {e}")
+                stats["unreadable"] += 1
+                continue
+            if manifest.is_done(file_hash, self.retry_failed, self.max_attempts):
+                stats["skipped"] += 1
+            elif file_hash in pending:
+                stats["duplicates"] += 1  # same bytes under another name: processed once
+            else:
+                pending[file_hash] = path
+        return [(path, file_hash) for file_hash, path in pending.items()]
+
+    def _results(self, pending: List[Tuple[str, str]], job_description: str) -> Iterator[Tuple[int, Dict]]:
+        paths = [path for path, _ in pending]
+        if self.parallel:
+            yield from self.orchestrator.iter_resume_batch(paths, job_description)
+            return
+        from src.orchestrator.pipeline import LookupSession
+
+        session = LookupSession(self.orchestrator.tenant)
+        for index, path in enumerate(paths):
+            try:
+                yield index, self.orchestrator.process_single_resume(path, job_description, session)
+            except Exception as e:
+                logger.warning(f"Resume {path} failed: {e}")
+                yield index, {"error": f"{type(e).__name__}: {e}"}
+
+    def run(self, paths: List[str], job_description: str) -> Dict:
+        manifest = BatchManifest(self.output_dir, job_description)
+        manifest.load()
+        stats = {"total": len(paths), "completed": 0, "failed": 0, "skipped": 0, "duplicates": 0, "unreadable": 0}
+        pending = self._pending(paths, manifest, stats)
+        logger.info(f"Batch run in {self.output_dir}: {len(pending)} to process, {stats['skipped']} already done")
+
+        since_checkpoint = 0
+        try:
+            with open(manifest.sink_path, "ab") as sink:
+                for index, result in self._results(pending, job_description):
+                    path, file_hash = pending[index]
+                    entry = {"file_sha256": file_hash, "path": path, "finished_at": time.time()}
+                    if "error" in result:
+                        entry.update(status="failed", error=result["error"])
+                        stats["failed"] += 1
+                    else:
+                        entry.update(status="ok", result=result)
+                        stats["completed"] += 1
+                    line = (json.dumps(entry, default=json_default) + "\n").encode("utf-8")
+                    sink.write(line)
+                    sink.flush()
+                    manifest.sink_bytes += len(line)
+                    manifest.record(entry)
+                    since_checkpoint += 1
+                    if since_checkpoint >= self.checkpoint_every:
+                        os.fsync(sink.fileno())
+                        manifest.checkpoint()
+                        since_checkpoint = 0
+        finally:
+            # Also on the way out of a crash, so the next run skips everything finished so far
+            manifest.checkpoint()
+        logger.info(f"Batch run finished: {stats}")
+        return stats
+
+
+def _collect_paths(inputs: List[str]) -> List[str]:
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, filenames in os.walk(item):
+                paths.extend(os.path.join(root, name) for name in sorted(filenames) if name.lower().endswith(".pdf"))
+        else:
+            paths.append(item)
+    return paths
+
+
+def main():
+    from src.core.log import configure_logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Resume PDFs or directories of them.")
+    parser.add_argument("--jd-file", required=True, help="Text file with the job description.")
+    parser.add_argument("--output", required=True, help="Run directory for results.jsonl and manifest.json.")
+    parser.add_argument("--parallel", action="store_true", help="Use the process/thread pool batch mode.")
+    parser.add_argument("--no-retry-failed", action="store_true", help="Skip resumes that failed in an earlier run.")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Stop retrying a resume after this many failed attempts.")
+    parser.add_argument("--checkpoint-every", type=int, default=25)
+    args = parser.parse_args()
+
+    configure_logging(fmt="text")
+    with open(args.jd_file, encoding="utf-8") as f:
+        job_description = f.read()
+    runner = CheckpointedBatchRunner(
+        args.output,
+        parallel=args.parallel,
+        retry_failed=not args.no_retry_failed,
+        max_attempts=args.max_attempts,
+        checkpoint_every=args.checkpoint_every
+    )
+    stats = runner.run(_collect_paths(args.inputs), job_description)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
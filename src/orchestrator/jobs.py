@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.core.deadline import Deadline
+from src.core.models import CandidateProfile, SourceStatus, TalentSearchResponse
+from src.core.tracing import span
+from src.orchestrator.talent_search import run_talent_search
+
+logger = logging.getLogger(__name__)
+
+# Job states; the last two are terminal
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+TERMINAL_STATES = {SUCCEEDED, FAILED}
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue has reached its pending-job limit."""
+    pass
+
+
+class TalentSearchJob(BaseModel):
+    job_id: str
+    query: str
+    sources: Optional[List[str]] = None
+    tenant: Optional[str] = None # Pays for the job's paid lookups; None for the default tenant
+    dedup_key: str
+    status: str = QUEUED
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    events: List[Dict] = [] # Progress events, in order: {"seq", "event", "at", "data"}
+    result: Optional[TalentSearchResponse] = None
+    error: Optional[str] = None
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    attached: bool = False # True when the submission joined an identical in-flight job
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    last_event: Optional[Dict] = None
+    candidate_count: Optional[int] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: TalentSearchJob, attached: bool = False) -> "JobStatusResponse":
+        return cls(
+            job_id=job.job_id,
+            status=job.status,
+            attached=attached,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            last_event=job.events[-1] if job.events else None,
+            candidate_count=len(job.result.candidates) if job.result else None,
+            error=job.error
+        )
+
+
+class JobResultsPage(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    offset: int
+    limit: int
+    candidates: List[CandidateProfile] = []
+    sources: List[SourceStatus] = []
+    truncated_stages: List[str] = []
+
+
+def dedup_key_for(query: str, sources: Optional[List[str]], tenant: Optional[str] = None) -> str:
+    """Identical queries (modulo case/whitespace) against the same sources, for the same tenant, share a key."""
+    normalized_query = " ".join(query.lower().split())
+    normalized_sources = ",".join(sorted(sources)) if sources else "*"
+    key = f"{normalized_query}|{normalized_sources}"
+    # A tenant never attaches to (and so never gets billed for) another tenant's job
+    if tenant is not None:
+        key += f"|{tenant}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """
+    One JSON file per job in a local directory; writes are atomic (write + rename).
+    A save carries the job's version (its event count), and a save older than the last
+    one written for that job is dropped, so concurrent writers can't regress a file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._versions: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def save(self, job_id: str, payload: str, version: int):
+        path = self._path(job_id)
+        with self._write_lock:
+            if version < self._versions.get(job_id, -1):
+                return
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._versions[job_id] = version
+
+    def delete(self, job_id: str):
+        with self._write_lock:
+            self._versions.pop(job_id, None)
+            try:
+                os.remove(self._path(job_id))
+            except FileNotFoundError:
+                pass
+
+    def load_all(self) -> List[TalentSearchJob]:
+        jobs = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    jobs.append(TalentSearchJob(**json.load(f)))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable job file {filename}: {e}")
+        return jobs
+
+
+class JobManager:
+    """
+    Runs talent searches in a bounded worker pool, decoupled from the HTTP request.
+
+    Jobs are persisted after every state change, so queued or interrupted jobs are
+    picked up again when the process restarts. Submitting a query that is already
+    queued or running attaches to the existing job instead of starting a new crawl.
+    Finished jobs are kept for retention_seconds, then dropped from memory and disk.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        max_workers: int = 2,
+        max_pending: int = 100,
+        deadline_seconds: float = 600.0,
+        retention_seconds: float = 24 * 3600.0
+    ):
+        self.store = JobStore(store_dir)
+        self.max_pending = max_pending
+        self.deadline_seconds = deadline_seconds
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talent-job")
+        self._jobs: Dict[str, TalentSearchJob] = {}
+        self._in_flight: Dict[str, str] = {} # dedup_key -> job_id
+        self._pending = 0 # Jobs not yet in a terminal state
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def recover(self):
+        """Loads persisted jobs and re-queues any that hadn't finished."""
+        resumed = 0
+        for job in self.store.load_all():
+            if self._expired(job, time.time()):
+                self.store.delete(job.job_id)
+                continue
+            with self._lock:
+                self._jobs[job.job_id] = job
+            if job.status not in TERMINAL_STATES:
+                with self._lock:
+                    job.status = QUEUED
+                    self._in_flight[job.dedup_key] = job.job_id
+                    self._pending += 1
+                self._record(job, "requeued", {})
+                self._executor.submit(self._run, job.job_id)
+                resumed += 1
+        if resumed:
+            logger.info(f"Re-queued {resumed} unfinished talent search jobs.")
+
+    def _expired(self, job: TalentSearchJob, now: float) -> bool:
+        return job.status in TERMINAL_STATES and (job.finished_at or job.created_at) + self.retention_seconds < now
+
+    def sweep(self) -> int:
+        """Drops finished jobs older than the retention period; returns how many."""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+            for job_id in expired:
+                del self._jobs[job_id]
+        for job_id in expired:
+            self.store.delete(job_id)
+        if expired:
+            logger.info(f"Dropped {len(expired)} finished talent search jobs past retention.")
+        return len(expired)
+
+    def _maybe_sweep(self):
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + min(self.retention_seconds, 300.0)
+        self.sweep()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, query: str, sources: Optional[List[str]] = None, tenant: Optional[str] = None) -> Tuple[TalentSearchJob, bool]:
+        """Returns (job, attached); attached is True when an identical in-flight job was reused."""
+        self._maybe_sweep()
+        key = dedup_key_for(query, sources, tenant)
+        with self._lock:
+            existing_id = self._in_flight.get(key)
+            if existing_id:
+                return self._jobs[existing_id], True
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"{self._pending} talent search jobs are already pending")
+            job = TalentSearchJob(
+                job_id=uuid.uuid4().hex,
+                query=query,
+                sources=sources,
+                tenant=tenant,
+                dedup_key=key,
+                created_at=time.time()
+            )
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job.job_id
+            self._pending += 1
+        self._record(job, "queued", {})
+        self._executor.submit(self._run, job.job_id)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[TalentSearchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def events_since(self, job_id: str, seq: int) -> Tuple[List[Dict], Optional[str]]:
+        """Progress events with sequence number >= seq, plus the job's current status (None once it's been dropped)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return [], None
+            return [event for event in job.events if event["seq"] >= seq], job.status
+
+    def _record(self, job: TalentSearchJob, event: str, data: Dict):
+        with self._lock:
+            job.events.append({"seq": len(job.events), "event": event, "at": time.time(), "data": data})
+            payload, version = job.json(), len(job.events)
+        # Disk I/O happens outside the lock, so status polls never wait on it
+        self.store.save(job.job_id, payload, version)
+
+    def _run(self, job_id: str):
+        job = self.get(job_id)
+        if job is None or job.status != QUEUED:
+            return
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+        self._record(job, "started", {})
+
+        result, error = None, None
+        try:
+            with span("talent_search_job", job_id=job.job_id):
+                result = asyncio.run(run_talent_search(
+                    job.query,
+                    sources=job.sources,
+                    deadline=Deadline(self.deadline_seconds),
+                    progress=lambda event, data: self._record(job, event, data),
+                    tenant=job.tenant
+                ))
+        except Exception as e:
+            error = str(e)
+
+        # Status and final event change together, so event streams never miss the last event
+        with self._lock:
+            job.finished_at = time.time()
+            if result is not None:
+                job.result, job.status = result, SUCCEEDED
+                summary = {"candidates": len(result.candidates), "truncated_stages": result.truncated_stages}
+            else:
+                job.error, job.status = error, FAILED
+                summary = {"error": error}
+            if self._in_flight.get(job.dedup_key) == job.job_id:
+                del self._in_flight[job.dedup_key]
+            self._pending -= 1
+            job.events.append({"seq": len(job.events), "event": job.status, "at": time.time(), "data": summary})
+            payload, version = job.json(), len(job.events)
+        self.store.save(job.job_id, payload, version)
@@ -0,0 +1,121 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from scipy import sparse
+
+
+@lru_cache(maxsize=64)
+def jd_keywords(job_description: str) -> frozenset:
+    """Keywords of a job description: lowercased words longer than two characters, trailing punctuation stripped."""
+    return frozenset(w.strip('.,') for w in job_description.lower().split() if len(w) > 2)
+
+
+def candidate_skills(*sources) -> Set[str]:
+    """Lowercased skills across resume data and lookup profiles (dicts or CandidateProfiles; None is skipped)."""
+    skills = set()
+    for source in sources:
+        if source is not None and not isinstance(source, dict):
+            source = source.dict()  # CandidateProfile from the lookups
+        if source and source.get("skills"):
+            skills.update(s.lower() for s in source["skills"])
+    return skills
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, best first; ties keep index order."""
+    k = min(k, len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-values, k - 1)[:k] if k < len(values) else np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+class MatchingEngine:
+    """
+    Scores many resumes against many job descriptions at once.
+
+    Each JD is tokenized once into a keyword index (a sparse term x JD matrix over the
+    shared vocabulary of all JD keywords). Resumes become sparse binary term vectors over
+    the same vocabulary, so a single sparse product gives the matched-keyword counts for
+    every resume x JD pair. Fit scores are the same as analyze_jd's: matched / JD keywords.
+    """
+
+    def __init__(self, job_descriptions: Sequence[str], jd_ids: Optional[Sequence] = None):
+        self.jd_ids = list(jd_ids) if jd_ids is not None else list(range(len(job_descriptions)))
+        if len(self.jd_ids) != len(job_descriptions):
+            raise ValueError("jd_ids must have one id per job description")
+        keyword_sets = [jd_keywords(jd) for jd in job_descriptions]
+        self.vocabulary: List[str] = sorted(set().union(*keyword_sets))
+        self.term_index: Dict[str, int] = {term: index for index, term in enumerate(self.vocabulary)}
+
+        rows, cols = [], []
+        for jd_index, keywords in enumerate(keyword_sets):
+            for keyword in keywords:
+                rows.append(self.term_index[keyword])
+                cols.append(jd_index)
+        self.jd_terms = sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(self.vocabulary), len(keyword_sets))
+        )
+        self.jd_sizes = np.diff(self.jd_terms.indptr).astype(np.float64)
+        # Sorted term ids per JD, for listing matches and gaps of individual pairs
+        self.jd_term_ids: List[List[int]] = [sorted(self.term_index[k] for k in keywords) for keywords in keyword_sets]
+
+    def resume_vectors(self, skill_sets: Iterable[Iterable[str]]) -> sparse.csr_matrix:
+        """Binary resume x term matrix; skills outside the JD vocabulary can't match and are dropped."""
+        indptr, indices = [0], []
+        for skills in skill_sets:
+            indices.extend(sorted({self.term_index[s] for s in skills if s in self.term_index}))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), indices, indptr),
+            shape=(len(indptr) - 1, len(self.vocabulary))
+        )
+
+    def score(self, skill_sets: Iterable[Iterable[str]]) -> "MatchResult":
+        resumes = self.resume_vectors(skill_sets)
+        matched = (resumes @ self.jd_terms).toarray()
+        scores = matched / np.maximum(self.jd_sizes, 1)
+        return MatchResult(self, resumes, scores)
+
+
+class MatchResult:
+    """The resume x JD fit-score matrix, with per-resume and per-JD views."""
+
+    def __init__(self, engine: MatchingEngine, resumes: sparse.csr_matrix, scores: np.ndarray):
+        self.engine = engine
+        self.resumes = resumes
+        self.scores = scores
+
+    def analysis(self, resume_index: int, jd_index: int) -> Dict:
+        """analyze_jd's result for one pair: matched keywords, gaps and fit score."""
+        vocabulary = self.engine.vocabulary
+        resume_terms = set(self.resumes.indices[self.resumes.indptr[resume_index]:self.resumes.indptr[resume_index + 1]].tolist())
+        jd_terms = self.engine.jd_term_ids[jd_index]
+        return {
+            "matches": [vocabulary[t] for t in jd_terms if t in resume_terms],
+            "gaps": [vocabulary[t] for t in jd_terms if t not in resume_terms],
+            "fit_score": float(self.scores[resume_index, jd_index]),
+        }
+
+    def top_jds(self, resume_index: int, top_k: int = 3) -> List[Dict]:
+        """Best-fitting JDs for a resume, each with its matches and gaps."""
+        return [
+            {"jd_id": self.engine.jd_ids[jd_index], **self.analysis(resume_index, jd_index)}
+            for jd_index in _top_k(self.scores[resume_index], top_k)
+        ]
+
+    def top_resumes(self, jd_index: int, top_k: int = 10) -> List[Dict]:
+        """Highest-scoring resumes for a JD, as resume index and fit score."""
+        column = self.scores[:, jd_index]
+        return [{"resume_index": int(i), "fit_score": float(column[i])} for i in _top_k(column, top_k)]
+
+    def summary(self, top_jds: int = 3, top_resumes: int = 10) -> Dict:
+        return {
+            "resumes": [self.top_jds(i, top_jds) for i in range(self.scores.shape[0])],
+            "jobs": {
+                self.engine.jd_ids[j]: self.top_resumes(j, top_resumes)
+                for j in range(self.scores.shape[1])
+            },
+        }
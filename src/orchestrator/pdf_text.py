@@ -0,0 +1,247 @@
+import contextlib
+import io
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Limits per resume, so one oversized PDF can't exhaust a worker's memory
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "50"))
+RESUME_MAX_TEXT_BYTES = int(os.getenv("RESUME_MAX_TEXT_BYTES", str(1024 * 1024)))
+# Stop reading once contact details and a skills section have been seen (off by default:
+# the ATS check looks for sections that may come later in the document)
+RESUME_STOP_EARLY = os.getenv("RESUME_STOP_EARLY", "0") == "1"
+# Text extraction backend: fast (pdfminer text stream), layout (pdfplumber) or auto (probe the first page)
+RESUME_PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "auto")
+PDF_BACKENDS = ("auto", "fast", "layout")
+
+# Probe thresholds: a first page failing any of them is read with the layout backend
+PROBE_MIN_CHARS = 40
+PROBE_MAX_UNMAPPED_RATIO = 0.05
+PROBE_MAX_UPWARD_JUMP_RATIO = 0.2
+
+
+def _open_binary(resume_file):
+    if isinstance(resume_file, (str, os.PathLike)):
+        return open(resume_file, "rb")
+    if isinstance(resume_file, bytes):
+        return io.BytesIO(resume_file)
+    return contextlib.nullcontext(resume_file)
+
+
+def _rewind(resume_file):
+    if hasattr(resume_file, "seek"):
+        resume_file.seek(0)
+
+
+def iter_layout_pages(resume_file, max_pages: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Layout backend: pdfplumber's character-level extraction, which orders text by position
+    on the page. Yields (page_count, page_text) for each of the first max_pages pages
+    ("" for pages without a text layer). Each page's parsed layout is released as soon
+    as its text has been extracted, so memory doesn't grow with the page count.
+    """
+    import pdfplumber  # Deferred: heavy import, only needed for resume processing
+
+    max_pages = max_pages or RESUME_MAX_PAGES
+    with pdfplumber.open(resume_file) as pdf:
+        page_count = len(pdf.pages)
+        for page in pdf.pages[:max_pages]:
+            try:
+                yield page_count, page.extract_text() or ""
+            finally:
+                page.close()
+
+
+def _text_stream_device_class():
+    from pdfminer.pdfdevice import PDFDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+
+    class TextStreamDevice(PDFDevice):
+        """
+        Collects a page's text in content-stream order, decoding glyphs directly instead of
+        building pdfminer's per-character layout objects. Line breaks and word gaps are
+        inferred from the text position; the counters feed the auto-backend probe.
+        """
+
+        def __init__(self, rsrcmgr):
+            super().__init__(rsrcmgr)
+            self.parts: List[str] = []
+            self.chars = 0
+            self.unmapped = 0
+            self.line_changes = 0
+            self.upward_jumps = 0
+            self._last: Optional[Tuple[float, float]] = None  # (y, end x) of the previous string
+
+        def text(self) -> str:
+            return "".join(self.parts)
+
+        def _separate(self, x: float, y: float, fontsize: float):
+            if self._last is None:
+                return
+            last_y, last_end = self._last
+            if abs(y - last_y) > fontsize * 0.5:
+                self.line_changes += 1
+                if y > last_y + fontsize:
+                    self.upward_jumps += 1
+                self.parts.append("\n")
+            elif x - last_end > fontsize * 0.15 and self.parts and not self.parts[-1].endswith(" "):
+                self.parts.append(" ")
+
+        def render_string(self, textstate, seq, ncs, graphicstate):
+            font = textstate.font
+            if font is None:
+                return
+            a, _, _, d, e, f = textstate.matrix
+            line_x, line_y = textstate.linematrix
+            fontsize = textstate.fontsize * (abs(d) or 1)
+            scaling = textstate.scaling * 0.01
+            charspace = textstate.charspace * scaling
+            wordspace = 0 if font.is_multibyte() else textstate.wordspace * scaling
+            x = line_x
+            self._separate(e + x * a, f + line_y * d, fontsize)
+            for obj in seq:
+                if isinstance(obj, (int, float)):
+                    shift = obj * 0.001 * textstate.fontsize * scaling
+                    x -= shift
+                    # A wide negative kern in a TJ array stands in for a space
+                    if shift < -0.15 * textstate.fontsize and self.parts and not self.parts[-1].endswith(" "):
+                        self.parts.append(" ")
+                elif isinstance(obj, bytes):
+                    for cid in font.decode(obj):
+                        self.chars += 1
+                        try:
+                            self.parts.append(font.to_unichr(cid))
+                        except PDFUnicodeNotDefined:
+                            self.unmapped += 1
+                        x += font.char_width(cid) * textstate.fontsize * scaling + charspace
+                        if cid == 32:
+                            x += wordspace
+            textstate.linematrix = (x, line_y)
+            self._last = (f + line_y * d, e + x * a)
+
+    return TextStreamDevice
+
+
+def _iter_fast_pages(resume_file, max_pages: Optional[int] = None):
+    """Yields (page_count, page_text, device) per page; see iter_fast_pages."""
+    from itertools import islice
+
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    device_class = _text_stream_device_class()
+    max_pages = max_pages or RESUME_MAX_PAGES
+    with _open_binary(resume_file) as fp:
+        document = PDFDocument(PDFParser(fp))
+        pages_root = resolve1(document.catalog.get("Pages"))
+        page_count = int(resolve1(pages_root.get("Count", 0)) or 0) if isinstance(pages_root, dict) else 0
+        resources = PDFResourceManager(caching=True)
+        for page in islice(PDFPage.create_pages(document), max_pages):
+            device = device_class(resources)
+            PDFPageInterpreter(resources, device).process_page(page)
+            yield page_count, device.text(), device
+
+
+def iter_fast_pages(resume_file, max_pages: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Fast backend: pdfminer's raw text stream, without layout analysis or character objects.
+    Text comes out in content-stream order, which for generated resumes is reading order
+    (including one column after the other, where layout ordering interleaves columns).
+    """
+    for page_count, page_text, _ in _iter_fast_pages(resume_file, max_pages):
+        yield page_count, page_text
+
+
+def needs_layout(device) -> bool:
+    """Probe verdict for a page read by the fast backend."""
+    if len(device.text().strip()) < PROBE_MIN_CHARS:
+        return True  # little or no text: glyphs pdfplumber may still place and map
+    if device.unmapped > PROBE_MAX_UNMAPPED_RATIO * max(device.chars, 1):
+        return True
+    # Text drawn out of reading order jumps back up the page a lot
+    return device.line_changes >= 5 and device.upward_jumps > PROBE_MAX_UPWARD_JUMP_RATIO * device.line_changes
+
+
+def iter_pdf_pages(resume_file, max_pages: Optional[int] = None, backend: Optional[str] = None, used: Optional[Dict] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page_count, page_text) with the chosen backend (RESUME_PDF_BACKEND by default).
+    "auto" reads the first page with the fast backend and keeps going with it unless the probe
+    finds the page needs layout analysis, in which case the document is re-read with pdfplumber.
+    The backend actually used is stored in used["backend"].
+    """
+    backend = backend or RESUME_PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; expected one of {', '.join(PDF_BACKENDS)}")
+    used = used if used is not None else {}
+    if backend == "layout":
+        used["backend"] = "layout"
+        yield from iter_layout_pages(resume_file, max_pages)
+        return
+    if backend == "fast":
+        used["backend"] = "fast"
+        yield from iter_fast_pages(resume_file, max_pages)
+        return
+
+    pages = _iter_fast_pages(resume_file, max_pages)
+    try:
+        first = next(pages, None)
+        if first is not None and needs_layout(first[2]):
+            pages.close()
+            _rewind(resume_file)
+            used["backend"] = "layout"
+            yield from iter_layout_pages(resume_file, max_pages)
+            return
+        used["backend"] = "fast"
+        if first is None:
+            return
+        yield first[0], first[1]
+        for page_count, page_text, _ in pages:
+            yield page_count, page_text
+    finally:
+        pages.close()
+
+
+def extract_pdf_text(
+    resume_file,
+    max_pages: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[Callable[[List[str]], bool]] = None,
+    backend: Optional[str] = None
+) -> Tuple[str, Dict]:
+    """
+    Reads a PDF's text page by page, up to max_pages pages and max_bytes bytes of text,
+    stopping early once stop_when(page_texts) is true.
+    Returns the text (pages joined by newlines) and {"pages_read", "truncated", "stopped_early", "backend"}.
+    """
+    max_bytes = max_bytes or RESUME_MAX_TEXT_BYTES
+    page_texts: List[str] = []
+    total_bytes = 0
+    stats = {"pages_read": 0, "truncated": False, "stopped_early": False}
+
+    page_count = 0
+    used: Dict = {}
+    pages = iter_pdf_pages(resume_file, max_pages, backend, used)
+    try:
+        for page_count, page_text in pages:
+            stats["pages_read"] += 1
+            page_bytes = len(page_text.encode("utf-8"))
+            if total_bytes + page_bytes > max_bytes:
+                remaining = max_bytes - total_bytes
+                page_texts.append(page_text.encode("utf-8")[:remaining].decode("utf-8", "ignore"))
+                stats["truncated"] = True
+                break
+            page_texts.append(page_text)
+            total_bytes += page_bytes
+            if stop_when is not None and stop_when(page_texts):
+                stats["stopped_early"] = True
+                break
+        else:
+            # Hit the page limit with pages left over
+            stats["truncated"] = stats["pages_read"] < page_count
+    finally:
+        pages.close()
+
+    stats["backend"] = used.get("backend")
+    return "\n".join(page_texts), stats
@@ -1,27 +1,319 @@
-import pdfplumber
-import re
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.core.models import SearchParams
+from src.core.result_cache import result_set_key
+from src.orchestrator.matching import MatchingEngine, candidate_skills, jd_keywords
+from src.orchestrator.pdf_text import RESUME_PDF_BACKEND, RESUME_STOP_EARLY, extract_pdf_text
+from src.orchestrator.resume_cache import ResumeCache, content_hash, get_resume_cache
+from src.orchestrator.resume_sections import ATS_REQUIRED_SECTIONS, RequiredFieldsTracker, get_section_scanner
+
+logger = logging.getLogger(__name__)
+
+# Worker counts for the parallel batch mode
+RESUME_PROCESS_WORKERS = int(os.getenv("RESUME_PROCESS_WORKERS", str(os.cpu_count() or 2)))
+RESUME_LOOKUP_WORKERS = int(os.getenv("RESUME_LOOKUP_WORKERS", "8"))
+# Process start method for the extraction pool (spawn/forkserver/fork). Defaults to spawn: the API
+# server is multi-threaded, and forking it can copy a lock another thread holds into the child.
+RESUME_PROCESS_START_METHOD = os.getenv("RESUME_PROCESS_START_METHOD") or "spawn"
+
+
+def _portable_resume_input(resume_file):
+    """Paths pass through; file-like objects are read into bytes so they can cross process boundaries."""
+    if isinstance(resume_file, (str, bytes, os.PathLike)):
+        return resume_file
+    if hasattr(resume_file, "read"):
+        return resume_file.read()
+    raise TypeError(f"Unsupported resume input: {type(resume_file).__name__}")
+
+
+def _analyze_resume_locally(orchestrator_cls, resume_file, pdf_backend: Optional[str] = None) -> Tuple[Dict, Dict, Dict]:
+    """Process-pool stage: CPU-bound extraction plus the ATS check and lookup query."""
+    return orchestrator_cls(pdf_backend=pdf_backend).analyze_resume(resume_file)
+
+
+def lookup_params(nlp_query: Dict) -> SearchParams:
+    """
+    The connector query for a resume: its search fields only. The name is left out, so
+    resumes with the same skills (and title, level, location) share one lookup.
+    """
+    return SearchParams(
+        intent="find_candidates",
+        title=nlp_query.get("title"),
+        skills=nlp_query.get("skills"),
+        experience_level=nlp_query.get("experience_level"),
+        location=nlp_query.get("location"),
+        work_type=nlp_query.get("work_type"),
+    )
+
+
+class LookupSession:
+    """
+    Connector state shared by the resumes of one batch: a single LinkedInFetcher,
+    GitHubFetcher and ProfileCollector, and the result of every distinct lookup so far.
+    Lookups are keyed by the normalized query; a lookup already in progress on another
+    thread is waited for rather than repeated. Proxycurl credits are charged to `tenant`.
+    """
+
+    def __init__(self, tenant: Optional[str] = None):
+        self.tenant = tenant
+        self._lock = threading.Lock()
+        self._results: Dict[str, Future] = {}
+        self._linkedin_fetcher = None
+        self._github_fetcher = None
+        self._profile_collector = None
+        self.stats = {source: {"requested": 0, "executed": 0} for source in ("linkedin", "github")}
+
+    def lookup(self, source: str, params: SearchParams, run: Callable[[SearchParams], object]):
+        key = result_set_key(f"resume_lookup:{source}", params)
+        with self._lock:
+            self.stats[source]["requested"] += 1
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.stats[source]["executed"] += 1
+        if owner:
+            try:
+                future.set_result(run(params))
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+    @property
+    def linkedin_fetcher(self):
+        from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher
+
+        with self._lock:
+            if self._linkedin_fetcher is None:
+                self._linkedin_fetcher = LinkedInFetcher(tenant=self.tenant)
+            return self._linkedin_fetcher
+
+    def github_clients(self):
+        """(GitHubFetcher, ProfileCollector), or (None, None) without GITHUB_TOKEN."""
+        from src.connectors.github_agent.github_fetcher import GitHubFetcher
+        from src.connectors.github_agent.profile_collector import ProfileCollector
+
+        github_token = os.getenv("GITHUB_TOKEN")
+        if not github_token:
+            logger.error("GITHUB_TOKEN environment variable not set. Please set it in your .env file.")
+            return None, None
+        with self._lock:
+            if self._github_fetcher is None:
+                self._github_fetcher = GitHubFetcher(github_token=github_token)
+                self._profile_collector = ProfileCollector(github_fetcher=self._github_fetcher)
+            return self._github_fetcher, self._profile_collector
+
+    def summary(self) -> Dict:
+        saved = sum(counts["requested"] - counts["executed"] for counts in self.stats.values())
+        return {"lookups": {source: dict(counts) for source, counts in self.stats.items()}, "lookups_saved": saved}
+
+
+class _BatchItem:
+    __slots__ = ("index", "resume_data", "ats_result", "nlp_query", "linkedin_profile", "github_profile", "pending_lookups")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.resume_data = self.ats_result = self.nlp_query = None
+        self.linkedin_profile = self.github_profile = None
+        self.pending_lookups = 2
+
 
 class ResumeOrchestrator:
-    def __init__(self):
-        pass
-
-    def process_resume_batch(self, resume_files: list, job_description: str):
-        results = []
-        for resume_file in resume_files:
-            result = self.process_single_resume(resume_file, job_description)
-            results.append(result)
+    def __init__(self, cache: Optional[ResumeCache] = None, pdf_backend: Optional[str] = None, tenant: Optional[str] = None):
+        # Resume analysis cache; defaults to the shared one (None if RESUME_CACHE_ENABLED=0)
+        self.cache = cache if cache is not None else get_resume_cache()
+        # PDF text backend: auto, fast or layout (see pdf_text.iter_pdf_pages)
+        self.pdf_backend = pdf_backend or RESUME_PDF_BACKEND
+        # Tenant charged for the batch's LinkedIn lookups (None for PROXYCURL_DEFAULT_TENANT)
+        self.tenant = tenant
+        # Lookup counts of the most recent batch, including how many duplicate lookups were skipped
+        self.last_batch_stats: Dict = {}
+
+    def process_resume_batch(
+        self,
+        resume_files: list,
+        job_description: str,
+        parallel: bool = False,
+        process_workers: Optional[int] = None,
+        lookup_workers: Optional[int] = None
+    ):
+        """
+        Processes resumes and returns their results in input order.
+        With parallel=True, see iter_resume_batch; a resume that fails there yields {"error": ...}.
+        Resumes with the same lookup query share one LinkedIn and one GitHub lookup.
+        """
+        if not parallel:
+            session = LookupSession(self.tenant)
+            results = []
+            for resume_file in resume_files:
+                result = self.process_single_resume(resume_file, job_description, session)
+                results.append(result)
+            self._finish_batch(session, len(results))
+            return results
+
+        resume_files = list(resume_files)
+        results = [None] * len(resume_files)
+        for index, result in self.iter_resume_batch(resume_files, job_description, process_workers, lookup_workers):
+            results[index] = result
         return results
 
-    def process_single_resume(self, resume_file, job_description):
-        # 1. Extract data from resume
+    def iter_resume_batch(
+        self,
+        resume_files: Iterable,
+        job_description: str,
+        process_workers: Optional[int] = None,
+        lookup_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Parallel batch mode, yielding (input index, result) as each resume completes.
+
+        Extraction, ATS and query building run in a process pool (pdfplumber holds the GIL);
+        the LinkedIn and GitHub lookups for a resume run concurrently on a thread pool as soon
+        as its extraction is done; JD and SWOT analysis run here once both lookups are in (a
+        few set operations, cheaper than shipping the resume to a worker). At most max_in_flight resumes (default 4 per process) are held at once,
+        so arbitrarily long inputs are streamed.
+        """
+        process_workers = max(1, process_workers or RESUME_PROCESS_WORKERS)
+        lookup_workers = max(1, lookup_workers or RESUME_LOOKUP_WORKERS)
+        max_in_flight = max_in_flight or process_workers * 4
+        orchestrator_cls = type(self)
+        session = LookupSession(self.tenant)
+        resume_count = 0
+        inputs = enumerate(resume_files)
+        mp_context = multiprocessing.get_context(RESUME_PROCESS_START_METHOD)
+        processes = ProcessPoolExecutor(max_workers=process_workers, mp_context=mp_context)
+        pool_of: Dict[Future, ProcessPoolExecutor] = {}
+
+        def replace_pool(broken: ProcessPoolExecutor):
+            nonlocal processes
+            if processes is broken:
+                logger.warning("A resume worker process died; starting a new process pool")
+                broken.shutdown(wait=False)
+                processes = ProcessPoolExecutor(max_workers=process_workers, mp_context=mp_context)
+
+        def submit(fn, *args) -> Future:
+            # A worker that dies breaks the whole pool; submit to a fresh one
+            try:
+                future = processes.submit(fn, *args)
+            except BrokenExecutor:
+                replace_pool(processes)
+                future = processes.submit(fn, *args)
+            pool_of[future] = processes
+            return future
+
+        lookups = ThreadPoolExecutor(max_workers=lookup_workers, thread_name_prefix="resume-lookup")
+        try:
+            pending: Dict[Future, Tuple[str, _BatchItem]] = {}
+            in_flight = 0
+            exhausted = False
+
+            def fail(item: _BatchItem, stage: str, error: BaseException) -> Tuple[int, Dict]:
+                logger.warning(f"Resume {item.index} failed during {stage}: {error}")
+                return item.index, {"error": f"{stage}: {error}"}
+
+            while True:
+                while not exhausted and in_flight < max_in_flight:
+                    try:
+                        index, resume_file = next(inputs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    item = _BatchItem(index)
+                    in_flight += 1
+                    resume_count += 1
+                    try:
+                        portable_input = _portable_resume_input(resume_file)
+                    except Exception as e:
+                        in_flight -= 1
+                        yield fail(item, "read", e)
+                        continue
+                    pending[submit(_analyze_resume_locally, orchestrator_cls, portable_input, self.pdf_backend)] = ("local", item)
+
+                if not pending:
+                    self._finish_batch(session, resume_count)
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item = pending.pop(future)
+                    error = future.exception()
+                    owner = pool_of.pop(future, None)
+                    if owner is not None and isinstance(error, BrokenExecutor):
+                        # Every resume in the pool when it broke fails; the rest go to a new pool
+                        replace_pool(owner)
+
+                    if stage == "local":
+                        if error:
+                            in_flight -= 1
+                            yield fail(item, "extraction", error)
+                            continue
+                        item.resume_data, item.ats_result, item.nlp_query = future.result()
+                        pending[lookups.submit(self.fetch_linkedin_profile, item.nlp_query, session)] = ("linkedin", item)
+                        pending[lookups.submit(self.fetch_github_profile, item.nlp_query, session)] = ("github", item)
+
+                    elif stage in ("linkedin", "github"):
+                        if error:
+                            logger.warning(f"Resume {item.index}: {stage} lookup failed: {error}")
+                        setattr(item, f"{stage}_profile", None if error else future.result())
+                        item.pending_lookups -= 1
+                        if item.pending_lookups:
+                            continue
+                        in_flight -= 1
+                        try:
+                            jd_analysis = self.analyze_jd(job_description, item.resume_data, item.linkedin_profile, item.github_profile)
+                            swot_report = self.generate_swot(jd_analysis)
+                        except Exception as e:
+                            yield fail(item, "analysis", e)
+                            continue
+                        yield item.index, {
+                            "resume_data": item.resume_data,
+                            "ats_result": item.ats_result,
+                            "linkedin_profile": item.linkedin_profile,
+                            "github_profile": item.github_profile,
+                            "jd_analysis": jd_analysis,
+                            "swot_report": swot_report,
+                        }
+        finally:
+            lookups.shutdown()
+            processes.shutdown()
+
+    def _finish_batch(self, session: LookupSession, resume_count: int):
+        self.last_batch_stats = {"resumes": resume_count, **session.summary()}
+        logger.info(f"Resume batch: {self.last_batch_stats}")
+
+    def analyze_resume(self, resume_file) -> Tuple[Dict, Dict, Dict]:
+        """
+        The JD-independent part of processing a resume: extracted data, ATS result and lookup query.
+        Cached by the SHA-256 of the file's bytes, so a resume seen before isn't parsed again.
+        """
+        if isinstance(resume_file, bytes):
+            resume_file = io.BytesIO(resume_file)
+        # The backend changes the extracted text, so it is part of the key
+        key = f"{content_hash(resume_file)}-{self.pdf_backend}" if self.cache is not None else None
+        if key:
+            cached = self.cache.get(key)
+            if cached:
+                return cached
         resume_data = self.extract_resume_data(resume_file)
-        # 2. ATS analysis
         ats_result = self.ats_analysis(resume_data)
-        # 3. Generate NLP query
         nlp_query = self.generate_nlp_query(resume_data)
+        if key:
+            self.cache.put(key, resume_data, ats_result, nlp_query)
+        return resume_data, ats_result, nlp_query
+
+    def process_single_resume(self, resume_file, job_description, session: Optional[LookupSession] = None):
+        # 1-3. Extract data, ATS analysis and NLP query (cached per resume)
+        resume_data, ats_result, nlp_query = self.analyze_resume(resume_file)
         # 4. Fetch LinkedIn & GitHub data
-        linkedin_profile = self.fetch_linkedin_profile(nlp_query)
-        github_profile = self.fetch_github_profile(nlp_query)
+        session = session or LookupSession(self.tenant)
+        linkedin_profile = self.fetch_linkedin_profile(nlp_query, session)
+        github_profile = self.fetch_github_profile(nlp_query, session)
         # 5. JD analysis
         jd_analysis = self.analyze_jd(job_description, resume_data, linkedin_profile, github_profile)
         # 6. SWOT analysis
@@ -44,21 +336,24 @@ class ResumeOrchestrator:
         Returns:
             dict: Extracted fields (name, email, phone, etc.)
         """
-        text = ""
-        with pdfplumber.open(resume_file) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        # Simple regex-based extraction
-        email = re.search(r"[\w\.-]+@[\w\.-]+", text)
-        phone = re.search(r"(\+?\d[\d\s\-]{7,}\d)", text)
+        stop_when = RequiredFieldsTracker() if RESUME_STOP_EARLY else None
+        text, extraction = extract_pdf_text(resume_file, stop_when=stop_when, backend=self.pdf_backend)
+        if extraction["truncated"]:
+            logger.warning(f"Resume text truncated after {extraction['pages_read']} pages")
+        # Contact details come from the same single-pass segmentation the ATS check and query use
+        scan = get_section_scanner().scan(text)
         # Name extraction is non-trivial; as a placeholder, use the first non-empty line
         lines = [line.strip() for line in text.splitlines() if line.strip()]
         name = lines[0] if lines else None
         return {
             "raw_text": text,
             "name": name,
-            "email": email.group(0) if email else None,
-            "phone": phone.group(0) if phone else None,
+            "email": scan.email,
+            "phone": scan.phone,
+            "sections": sorted(scan.sections),
+            "pages_read": extraction["pages_read"],
+            "text_truncated": extraction["truncated"],
+            "pdf_backend": extraction["backend"],
             # Add more fields as needed
         }
 
@@ -67,18 +362,19 @@ class ResumeOrchestrator:
         Analyzes resume text for ATS compatibility.
         Returns a dict with a score and a list of issues.
         """
-        text = resume_data.get("raw_text", "").lower()
+        text = resume_data.get("raw_text", "")
+        scanner = get_section_scanner()
+        scan = scanner.scan(text)
         issues = []
         score = 0
-        # Check for key sections
-        for section in ["education", "experience", "skills"]:
-            if section not in text:
+        # Check for key sections (headings found by the section scanner)
+        for section in ATS_REQUIRED_SECTIONS:
+            if section not in scan.sections:
                 issues.append(f"Missing section: {section.title()}")
             else:
                 score += 1
-        # Example: count keyword matches (expandable)
-        keywords = ["python", "machine learning", "project", "leadership"]
-        keyword_matches = sum(1 for kw in keywords if kw in text)
+        # Count configured keyword matches (RESUME_ATS_KEYWORDS)
+        keyword_matches = len(scanner.keyword_hits(text))
         score += keyword_matches
         if keyword_matches < 2:
             issues.append("Few relevant keywords found.")
@@ -97,58 +393,46 @@ class ResumeOrchestrator:
         query = {}
         if resume_data.get("name"):
             query["name"] = resume_data["name"]
-        # Skills extraction can be improved; for now, look for a 'skills' section in raw_text
-        skills = []
-        text = resume_data.get("raw_text", "")
-        skills_section = re.search(r"skills[:\-\s]*([\w,\s]+)", text, re.IGNORECASE)
-        if skills_section:
-            skills = [s.strip() for s in skills_section.group(1).split(",") if s.strip()]
+        # Skills are the items of the resume's skills section
+        skills = get_section_scanner().scan(resume_data.get("raw_text", "")).skills()
         if skills:
             query["skills"] = skills
         # Experience extraction placeholder
         # (Can use NLP or section parsing for more accuracy)
         return query
 
-    def fetch_linkedin_profile(self, nlp_query):
+    def fetch_linkedin_profile(self, nlp_query, session: Optional[LookupSession] = None):
         """
         Uses the LinkedIn agent to fetch and normalize a LinkedIn profile based on the NLP query.
         Returns a CandidateProfile or None.
         """
-        from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher
-        from src.connectors.linkedin_agent.search_query_generator import LinkedInSearchQueryGenerator
-        from src.connectors.linkedin_agent.profile_normalizer import LinkedInProfileNormalizer
-        from src.connectors.linkedin_agent.models import LinkedInRawProfile
-        from src.core.models import SearchParams
-
-        # Build SearchParams from nlp_query (fill with defaults if missing)
-        params = SearchParams(
-            intent="find_candidates",
-            title=nlp_query.get("title"),
-            skills=nlp_query.get("skills"),
-            experience_level=nlp_query.get("experience_level"),
-            location=nlp_query.get("location"),
-            work_type=nlp_query.get("work_type"),
-        )
-        linkedin_query = LinkedInSearchQueryGenerator.generate_linkedin_search_query(params)
-        fetcher = LinkedInFetcher()
-        raw_profile_results = fetcher.search_profiles(linkedin_query)
-        if not raw_profile_results:
-            return None
-        # Get details for the first profile
-        detailed_raw_profile = fetcher.get_profile_details(raw_profile_results[0].get("profile_url"))
-        if not detailed_raw_profile:
-            return None
-        linkedin_raw_profile_model = LinkedInRawProfile(**detailed_raw_profile)
-        normalized_profile = LinkedInProfileNormalizer.normalize_profile(linkedin_raw_profile_model)
-        return normalized_profile
+        session = session or LookupSession(self.tenant)
+        return session.lookup("linkedin", lookup_params(nlp_query), lambda params: self._linkedin_lookup(params, session))
+
+    def _linkedin_lookup(self, params: SearchParams, session: LookupSession):
+        # The best match only: one search page and one profile lookup
+        candidates = session.linkedin_fetcher.search_candidates(params, limit=1)
+        return candidates[0] if candidates else None
 
-    def fetch_github_profile(self, nlp_query):
+    def fetch_github_profile(self, nlp_query, session: Optional[LookupSession] = None):
         """
         Uses the GitHub agent to fetch and normalize a GitHub profile based on the NLP query.
         Returns a CandidateProfile or None.
         """
-        from src.connectors.github_agent.cli import run_github_search
-        candidates = run_github_search(nlp_query)
+        session = session or LookupSession(self.tenant)
+        return session.lookup("github", lookup_params(nlp_query), lambda params: self._github_lookup(params, session))
+
+    def _github_lookup(self, params: SearchParams, session: LookupSession):
+        from src.connectors.github_agent.cli import search_github
+
+        github_fetcher, profile_collector = session.github_clients()
+        if github_fetcher is None:
+            return None
+        try:
+            candidates, _ = search_github(params, github_fetcher, profile_collector)
+        except Exception as e:
+            logger.error(f"Error during GitHub search: {e}")
+            return None
         if not candidates:
             return None
         return candidates[0]
@@ -158,23 +442,38 @@ class ResumeOrchestrator:
         Analyzes the fit between the job description and the candidate's profile.
         Returns a dict with matches, gaps, and a fit score.
         """
-        jd_text = job_description.lower()
-        # Aggregate candidate skills from all sources
-        candidate_skills = set()
-        for source in [resume_data, linkedin_profile, github_profile]:
-            if source and source.get("skills"):
-                candidate_skills.update([s.lower() for s in source["skills"]])
-        # Extract keywords from JD (simple split, can be improved)
-        jd_keywords = set([w.strip('.,') for w in jd_text.split() if len(w) > 2])
-        matches = candidate_skills & jd_keywords
-        gaps = jd_keywords - candidate_skills
-        fit_score = len(matches) / (len(jd_keywords) or 1)
+        candidate_skills_set = candidate_skills(resume_data, linkedin_profile, github_profile)
+        # JD keywords are tokenized once per distinct JD and reused across resumes
+        jd_keyword_set = jd_keywords(job_description)
+        matches = candidate_skills_set & jd_keyword_set
+        gaps = jd_keyword_set - candidate_skills_set
+        fit_score = len(matches) / (len(jd_keyword_set) or 1)
         return {
             "matches": list(matches),
             "gaps": list(gaps),
             "fit_score": fit_score
         }
 
+    def match_resumes(
+        self,
+        resume_results: Sequence[Dict],
+        job_descriptions: Sequence[str],
+        jd_ids: Optional[Sequence] = None,
+        top_jds: int = 3,
+        top_resumes: int = 10
+    ) -> Dict:
+        """
+        Screens processed resumes (results of process_resume_batch) against several JDs at once.
+        Returns, per resume, its best JDs with matches and gaps, and per JD its best resumes.
+        Failed resumes ({"error": ...}) score zero everywhere.
+        """
+        engine = MatchingEngine(job_descriptions, jd_ids)
+        skill_sets = [
+            candidate_skills(result.get("resume_data"), result.get("linkedin_profile"), result.get("github_profile"))
+            for result in resume_results
+        ]
+        return engine.score(skill_sets).summary(top_jds, top_resumes)
+
     def generate_swot(self, jd_analysis):
         """
         Generates a simple SWOT analysis from the JD analysis.
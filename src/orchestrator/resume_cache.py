@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, Optional, Tuple
+
+from src.core.metrics import CACHE_REQUESTS
+from src.orchestrator.pdf_text import RESUME_MAX_PAGES, RESUME_MAX_TEXT_BYTES, RESUME_STOP_EARLY
+from src.orchestrator.resume_sections import get_section_scanner
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extract_resume_data, ats_analysis or generate_nlp_query change their output;
+# entries written under another version are treated as misses and overwritten
+RESUME_ANALYSIS_VERSION = "3"
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def content_hash(resume_file) -> str:
+    """
+    SHA-256 of a resume's bytes. Accepts a path, raw bytes or a seekable file-like object,
+    which is rewound afterwards so it can still be parsed.
+    """
+    digest = hashlib.sha256()
+    if isinstance(resume_file, bytes):
+        digest.update(resume_file)
+    elif isinstance(resume_file, (str, os.PathLike)):
+        with open(resume_file, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    elif hasattr(resume_file, "read"):
+        start = resume_file.tell()
+        for chunk in iter(lambda: resume_file.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        resume_file.seek(start)
+    else:
+        raise TypeError(f"Unsupported resume input: {type(resume_file).__name__}")
+    return digest.hexdigest()
+
+
+class ResumeCache:
+    """
+    Disk cache of the JD-independent resume analysis (extracted data, ATS result, lookup query),
+    one `<sha256>-<pdf backend>.json` file per resume. Reads refresh an entry's mtime; once the files exceed
+    max_bytes the least recently used are deleted. Writes are atomic, so several processes
+    (e.g. the batch process pool) can share a directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, version: str = RESUME_ANALYSIS_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # scanned lazily
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[Dict, Dict, Dict]]:
+        path = self._path(key)
+        entry = None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != self.version:
+                entry = None
+            else:
+                os.utime(path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable resume cache entry {key}: {e}")
+            entry = None
+        with self._lock:
+            self.stats["hits" if entry else "misses"] += 1
+        CACHE_REQUESTS.labels("resume", "hit" if entry else "miss").inc()
+        if entry is None:
+            return None
+        return entry["resume_data"], entry["ats_result"], entry["nlp_query"]
+
+    def put(self, key: str, resume_data: Dict, ats_result: Dict, nlp_query: Dict):
+        payload = json.dumps({
+            "version": self.version,
+            "resume_data": resume_data,
+            "ats_result": ats_result,
+            "nlp_query": nlp_query,
+        }, default=str)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write resume cache entry {key}: {e}")
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += len(payload)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        entries = []
+        total = 0
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, filename))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        # Rescan rather than trust the running total: other processes write here too
+        entries, total = self._scan()
+        entries.sort()
+        # Keep the newest entry even if it alone is over budget
+        for _, size, filename in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.stats["evictions"] += 1
+        self._total_bytes = total
+
+
+_shared_cache: Optional[ResumeCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_resume_cache() -> Optional[ResumeCache]:
+    """
+    Process-wide resume cache, or None when RESUME_CACHE_ENABLED=0.
+    RESUME_CACHE_DIR (.resume_cache) and RESUME_CACHE_MAX_BYTES (256 MiB) configure it.
+    """
+    global _shared_cache
+    if os.getenv("RESUME_CACHE_ENABLED", "1") == "0":
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResumeCache(
+                os.getenv("RESUME_CACHE_DIR", ".resume_cache"),
+                max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+                # The extraction limits and scanner configuration change the results, so they're part of the version
+                version=f"{RESUME_ANALYSIS_VERSION}:{RESUME_MAX_PAGES}:{RESUME_MAX_TEXT_BYTES}:{int(RESUME_STOP_EARLY)}:{get_section_scanner().config_id}"
+            )
+        return _shared_cache
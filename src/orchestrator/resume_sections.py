@@ -0,0 +1,185 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# Section -> headings that start it. A heading is recognised at the start of a line, alone
+# or followed by a colon or dash; the rest of that line ("Skills: Python, SQL") belongs to the section.
+DEFAULT_SECTION_HEADINGS: Dict[str, List[str]] = {
+    "education": ["education", "academic background"],
+    "experience": ["experience", "work experience", "professional experience", "employment history"],
+    "skills": ["skills", "technical skills", "core skills"],
+    "projects": ["projects", "personal projects"],
+}
+# Sections the ATS check requires
+ATS_REQUIRED_SECTIONS = ["education", "experience", "skills"]
+DEFAULT_ATS_KEYWORDS = ["python", "machine learning", "project", "leadership"]
+
+EMAIL_PATTERN = r"[\w\.-]+@[\w\.-]+"
+PHONE_PATTERN = r"\+?\d[\d\s\-]{7,}\d"
+_SKILL_SEPARATORS = re.compile(r"[,;|•\n]+")
+MAX_SKILL_WORDS = 4
+
+
+def parse_section_headings(spec: str) -> Dict[str, List[str]]:
+    """Parses "section=heading|heading,section=heading" (e.g. RESUME_SECTION_HEADINGS)."""
+    headings = {}
+    for part in spec.split(","):
+        if "=" in part:
+            section, aliases = part.split("=", 1)
+            headings[section.strip().lower()] = [a.strip().lower() for a in aliases.split("|") if a.strip()]
+    return headings
+
+
+class ResumeScan:
+    """One resume's text segmented into sections, plus the first email and phone number found."""
+    __slots__ = ("text", "preamble", "sections", "email", "phone")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.preamble = ""  # text before the first heading (name, contact block)
+        self.sections: Dict[str, str] = {}
+        self.email: Optional[str] = None
+        self.phone: Optional[str] = None
+
+    def skills(self) -> List[str]:
+        """Items of the skills section, split on commas, semicolons, bullets and line breaks; prose lines are skipped."""
+        items = (item.strip(" \t-:.") for item in _SKILL_SEPARATORS.split(self.sections.get("skills", "")))
+        return [item for item in items if item and len(item.split()) <= MAX_SKILL_WORDS]
+
+
+class SectionScanner:
+    """
+    Segments resume text in a single pass of one precompiled pattern that matches
+    section headings, email addresses and phone numbers together. ATS keywords are
+    matched with a second precompiled alternation. Patterns are built once per
+    configuration, so longer heading or keyword lists don't add passes over the text.
+    """
+
+    def __init__(self, section_headings: Optional[Dict[str, List[str]]] = None, ats_keywords: Optional[List[str]] = None):
+        self.section_headings = section_headings or DEFAULT_SECTION_HEADINGS
+        self.ats_keywords = [k.lower() for k in (ats_keywords or DEFAULT_ATS_KEYWORDS)]
+        self._heading_sections: Dict[str, str] = {}
+        for section, aliases in self.section_headings.items():
+            for alias in aliases:
+                self._heading_sections[" ".join(alias.lower().split())] = section
+        # Longest alternatives first, so "work experience" wins over "experience"
+        headings = "|".join(
+            r"\s+".join(map(re.escape, alias.split()))
+            for alias in sorted(self._heading_sections, key=len, reverse=True)
+        )
+        self._pattern = re.compile(
+            rf"(?P<heading>^[ \t]*(?:{headings}))[ \t]*(?:[:\-–]|$)"
+            rf"|(?P<email>{EMAIL_PATTERN})"
+            rf"|(?P<phone>{PHONE_PATTERN})",
+            re.IGNORECASE | re.MULTILINE
+        )
+        self._keyword_pattern = re.compile(
+            "|".join(re.escape(k) for k in sorted(set(self.ats_keywords), key=len, reverse=True)) or r"(?!x)x"
+        )
+        self._last: Optional[Tuple[str, ResumeScan]] = None
+        # Identifies the configuration, so cached analyses made with other keywords are invalidated
+        self.config_id = hashlib.sha256(repr((sorted(self._heading_sections.items()), sorted(self.ats_keywords))).encode("utf-8")).hexdigest()[:8]
+
+    def scan(self, text: str) -> ResumeScan:
+        # extract_resume_data, ats_analysis and generate_nlp_query all scan the same
+        # text object in turn; keep the latest result so it is only segmented once
+        last = self._last
+        if last is not None and last[0] is text:
+            return last[1]
+        result = ResumeScan(text)
+        current_section: Optional[str] = None
+        section_start = 0
+        for match in self._pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == "heading":
+                self._close_section(result, current_section, text[section_start:match.start()])
+                current_section = self._heading_sections[" ".join(match.group("heading").lower().split())]
+                section_start = match.end()
+            elif kind == "email":
+                result.email = result.email or match.group()
+            elif result.phone is None:
+                result.phone = match.group()
+        self._close_section(result, current_section, text[section_start:])
+        self._last = (text, result)
+        return result
+
+    @staticmethod
+    def _close_section(result: ResumeScan, section: Optional[str], body: str):
+        if section is None:
+            result.preamble = body
+        elif section in result.sections:
+            result.sections[section] += "\n" + body  # repeated heading: append
+        else:
+            result.sections[section] = body
+
+    def keyword_hits(self, text: str) -> Set[str]:
+        """Configured ATS keywords that occur anywhere in the text (case-insensitive)."""
+        return set(self._keyword_pattern.findall(text.lower()))
+
+
+_scanner: Optional[SectionScanner] = None
+_scanner_lock = threading.Lock()
+
+
+def get_section_scanner() -> SectionScanner:
+    """
+    Process-wide scanner. RESUME_SECTION_HEADINGS (e.g. "skills=skills|tech stack") adds or
+    replaces headings per section; RESUME_ATS_KEYWORDS is a comma-separated keyword list.
+    """
+    global _scanner
+    with _scanner_lock:
+        if _scanner is None:
+            headings = {**DEFAULT_SECTION_HEADINGS, **parse_section_headings(os.getenv("RESUME_SECTION_HEADINGS", ""))}
+            keywords = [k.strip() for k in os.getenv("RESUME_ATS_KEYWORDS", "").split(",") if k.strip()]
+            _scanner = SectionScanner(headings, keywords or None)
+        return _scanner
+
+
+class RequiredFieldsTracker:
+    """
+    Early-stop check for extract_pdf_text: email, phone and a non-empty skills section have
+    all been found. Each call scans only the pages added since the previous call and keeps
+    what it has found, so checking after every page stays linear in the document length.
+    Use one tracker per resume.
+    """
+
+    def __init__(self, scanner: Optional[SectionScanner] = None):
+        self.scanner = scanner or get_section_scanner()
+        self.email = False
+        self.phone = False
+        self.skills = False
+        self._section: Optional[str] = None  # section open at the end of the last page
+        self._pages_seen = 0
+
+    def __call__(self, page_texts: List[str]) -> bool:
+        for page_text in page_texts[self._pages_seen:]:
+            self._scan_page(page_text)
+        self._pages_seen = len(page_texts)
+        return self.email and self.phone and self.skills
+
+    def _scan_page(self, text: str):
+        scanner = self.scanner
+        section_start = 0
+        for match in scanner._pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == "heading":
+                self._close_section(text[section_start:match.start()])
+                self._section = scanner._heading_sections[" ".join(match.group("heading").lower().split())]
+                section_start = match.end()
+            elif kind == "email":
+                self.email = True
+            else:
+                self.phone = True
+        # The open section may continue on the next page
+        self._close_section(text[section_start:])
+
+    def _close_section(self, body: str):
+        if self._section == "skills" and body.strip():
+            self.skills = True
+
+
+def has_required_fields(page_texts: List[str]) -> bool:
+    """One-off form of RequiredFieldsTracker for text that is already complete."""
+    return RequiredFieldsTracker()(page_texts)
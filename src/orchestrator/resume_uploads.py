@@ -0,0 +1,210 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Per-file and per-batch upload limits
+RESUME_UPLOAD_MAX_FILE_BYTES = int(os.getenv("RESUME_UPLOAD_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+RESUME_UPLOAD_MAX_FILES = int(os.getenv("RESUME_UPLOAD_MAX_FILES", "5000"))
+# Where uploads are spooled; unset uses the system temp directory
+RESUME_UPLOAD_DIR = os.getenv("RESUME_UPLOAD_DIR") or None
+# Seconds between progress events on the result stream
+RESUME_BATCH_PROGRESS_SECONDS = float(os.getenv("RESUME_BATCH_PROGRESS_SECONDS", "2"))
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an upload can't be used as a resume batch (no PDFs, bad zip, too many files)."""
+    pass
+
+
+class SpooledBatch:
+    """Uploaded resumes written to a private temporary directory, removed by cleanup()."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="resume-batch-", dir=RESUME_UPLOAD_DIR)
+        self.entries: List[Tuple[str, str]] = []  # (original filename, path on disk)
+        self.skipped: List[Dict] = []
+
+    def _new_path(self) -> str:
+        # Files are named by position, never by the uploaded name, so names can't escape the directory
+        if len(self.entries) >= RESUME_UPLOAD_MAX_FILES:
+            raise UploadRejected(f"Too many resumes; the limit is {RESUME_UPLOAD_MAX_FILES}")
+        return os.path.join(self.directory, f"{len(self.entries):06d}.pdf")
+
+    def add_pdf(self, filename: str, source) -> None:
+        """Copies a PDF from a binary file-like object, in chunks, up to the size limit."""
+        path = self._new_path()
+        copied = 0
+        with open(path, "wb") as out:
+            for chunk in iter(lambda: source.read(_COPY_CHUNK_BYTES), b""):
+                copied += len(chunk)
+                if copied > RESUME_UPLOAD_MAX_FILE_BYTES:
+                    break
+                out.write(chunk)
+        if copied > RESUME_UPLOAD_MAX_FILE_BYTES:
+            os.remove(path)
+            self.skipped.append({"filename": filename, "reason": f"larger than {RESUME_UPLOAD_MAX_FILE_BYTES} bytes"})
+            return
+        self.entries.append((filename, path))
+
+    def add_zip(self, filename: str, path: str) -> None:
+        """Adds every PDF inside a zip archive that was spooled to `path`."""
+        try:
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    if not member.filename.lower().endswith(".pdf"):
+                        self.skipped.append({"filename": f"{filename}/{member.filename}", "reason": "not a PDF"})
+                        continue
+                    with archive.open(member) as source:
+                        self.add_pdf(f"{filename}/{member.filename}", source)
+        except zipfile.BadZipFile as e:
+            raise UploadRejected(f"{filename}: {e}")
+        finally:
+            os.remove(path)
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+async def spool_uploads(uploads) -> SpooledBatch:
+    """
+    Writes uploaded files (FastAPI UploadFile objects) to disk chunk by chunk.
+    PDFs are kept as they are; zip archives are expanded to their PDFs. Raises UploadRejected
+    if nothing usable was uploaded; the spool directory is removed in that case.
+    """
+    batch = SpooledBatch()
+    try:
+        for upload in uploads:
+            filename = upload.filename or "upload"
+            lowered = filename.lower()
+            if lowered.endswith(".zip") or upload.content_type in ("application/zip", "application/x-zip-compressed"):
+                zip_path = os.path.join(batch.directory, f"upload-{len(batch.entries)}.zip")
+                with open(zip_path, "wb") as out:
+                    while chunk := await upload.read(_COPY_CHUNK_BYTES):
+                        out.write(chunk)
+                await asyncio.to_thread(batch.add_zip, filename, zip_path)
+            elif lowered.endswith(".pdf") or upload.content_type == "application/pdf":
+                # UploadFile is itself spooled; copy from its underlying file off the event loop
+                await asyncio.to_thread(batch.add_pdf, filename, upload.file)
+            else:
+                batch.skipped.append({"filename": filename, "reason": "not a PDF or zip"})
+        if not batch.entries:
+            raise UploadRejected("No PDF resumes in the upload")
+    except BaseException:
+        batch.cleanup()
+        raise
+    return batch
+
+
+def json_default(value):
+    if isinstance(value, BaseModel):
+        return value.dict()
+    return str(value)
+
+
+def _event(event: str, **fields) -> str:
+    return json.dumps({"event": event, **fields}, default=json_default) + "\n"
+
+
+async def stream_resume_batch(
+    orchestrator,
+    batch: SpooledBatch,
+    job_description: str,
+    include_text: bool = False,
+    progress_interval: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Runs the batch through orchestrator.iter_resume_batch and yields NDJSON events:
+    `started`, one `result` per resume as it finishes, `progress` every progress_interval
+    seconds whether or not results are arriving (it doubles as a heartbeat), and `finished`.
+    Only a handful of results are buffered between the batch thread and the response, so
+    memory doesn't grow with the batch. The spooled files are removed when the stream ends,
+    including when the client disconnects.
+    """
+    progress_interval = progress_interval or RESUME_BATCH_PROGRESS_SECONDS
+    loop = asyncio.get_running_loop()
+    results: asyncio.Queue = asyncio.Queue(maxsize=8)
+    stop = threading.Event()
+    total = len(batch.entries)
+    done_marker = object()
+
+    def run_batch():
+        batch_results = orchestrator.iter_resume_batch([path for _, path in batch.entries], job_description)
+        try:
+            for item in batch_results:
+                # Wait for room in the queue, so a slow client slows the batch down instead of buffering
+                future = asyncio.run_coroutine_threadsafe(results.put(item), loop)
+                while not stop.is_set():
+                    try:
+                        future.result(timeout=0.5)
+                        break
+                    except concurrent.futures.TimeoutError:
+                        continue
+                if stop.is_set():
+                    future.cancel()
+                    return
+        except Exception as e:
+            logger.exception("Resume batch failed")
+            asyncio.run_coroutine_threadsafe(results.put(e), loop)
+        finally:
+            batch_results.close()
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(results.put(done_marker), loop)
+
+    started = time.perf_counter()
+    next_progress = started + progress_interval
+    completed = failed = 0
+    worker = loop.run_in_executor(None, run_batch)
+    try:
+        yield _event("started", total=total, skipped=batch.skipped)
+        while True:
+            # Wait no longer than the next progress event is due, so it goes out on time
+            # even when results keep arriving
+            try:
+                item = await asyncio.wait_for(results.get(), timeout=max(0.0, next_progress - time.perf_counter()))
+            except asyncio.TimeoutError:
+                item = None
+            now = time.perf_counter()
+            if now >= next_progress:
+                yield _event("progress", completed=completed, failed=failed, total=total,
+                             elapsed_seconds=round(now - started, 2))
+                next_progress = now + progress_interval
+            if item is None:
+                continue
+            if item is done_marker:
+                break
+            if isinstance(item, Exception):
+                yield _event("error", error=str(item))
+                break
+            index, result = item
+            if "error" in result:
+                failed += 1
+            else:
+                completed += 1
+                if not include_text:
+                    result["resume_data"] = {k: v for k, v in result["resume_data"].items() if k != "raw_text"}
+            yield _event("result", index=index, filename=batch.entries[index][0], **result)
+        yield _event("finished", completed=completed, failed=failed, total=total,
+                     elapsed_seconds=round(time.perf_counter() - started, 2),
+                     batch_stats=orchestrator.last_batch_stats)
+    finally:
+        stop.set()
+        try:
+            await worker
+        finally:
+            batch.cleanup()
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.deadline import Deadline, DeadlineExceeded, ensure_deadline
+from src.core.entity_resolution import EntityResolver
+from src.core.models import CandidateProfile, ParseQueryResponse, SearchParams, SourceStatus, TalentSearchResponse
+from src.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Optional progress callback: progress(event_name, data)
+ProgressCallback = Callable[[str, Dict], None]
+
+
+class QueryParseError(Exception):
+    """Raised by run_talent_search when the natural language query couldn't be parsed."""
+    pass
+
+# Per-source timeouts (seconds); a slow connector only drops its own results
+DEFAULT_SOURCE_TIMEOUTS = {
+    "github": float(os.getenv("GITHUB_SOURCE_TIMEOUT_SECONDS", "45")),
+    "linkedin": float(os.getenv("LINKEDIN_SOURCE_TIMEOUT_SECONDS", "20")),
+}
+
+
+class SourceUnavailable(Exception):
+    """Raised by a search source that can't run at all (e.g. its credentials aren't configured)."""
+    pass
+
+
+# Sources call the connectors directly rather than their CLI wrappers, which log errors and
+# return [] for the command line: here a failure must surface, so the source reports "error"
+# and the result set isn't cached as complete.
+def _github_source(nlp_output: dict, deadline: Deadline, tenant: Optional[str] = None) -> List[CandidateProfile]:
+    from src.connectors.github_agent.cli import search_github
+    from src.connectors.github_agent.github_fetcher import GitHubFetcher
+    from src.core.replay import get_service_replay
+
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not github_token and get_service_replay("github") is None:
+        raise SourceUnavailable("GITHUB_TOKEN is not set")
+    candidates, _ = search_github(SearchParams(**nlp_output), GitHubFetcher(github_token=github_token, deadline=deadline))
+    return candidates
+
+
+def _linkedin_source(nlp_output: dict, deadline: Deadline, tenant: Optional[str] = None) -> List[CandidateProfile]:
+    from src.connectors.linkedin_agent.linkedin_fetcher import LinkedInFetcher
+    return LinkedInFetcher(deadline=deadline, tenant=tenant).search_candidates(SearchParams(**nlp_output))
+
+
+# Registered search sources: name -> blocking search function taking the NLP output dict, the
+# deadline and the tenant paying for the search (None for PROXYCURL_DEFAULT_TENANT)
+SEARCH_SOURCES: Dict[str, Callable[[dict, Deadline, Optional[str]], List[CandidateProfile]]] = {
+    "github": _github_source,
+    "linkedin": _linkedin_source,
+}
+
+
+async def _run_source(
+    name: str,
+    search: Callable[[dict, Deadline, Optional[str]], List[CandidateProfile]],
+    nlp_output: dict,
+    timeout: float,
+    deadline: Deadline,
+    progress: Optional[ProgressCallback] = None,
+    tenant: Optional[str] = None
+) -> Tuple[SourceStatus, List[CandidateProfile]]:
+    """Runs one blocking connector in a worker thread and reports its status and timing."""
+    started = time.perf_counter()
+    # The connector also sees the deadline, so it normally stops on its own before this fires
+    timeout = min(timeout, deadline.remaining())
+    with span(f"source.{name}", timeout_seconds=round(timeout, 3)) as source_span:
+        try:
+            candidates = await asyncio.wait_for(asyncio.to_thread(search, nlp_output, deadline, tenant), timeout=timeout)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            # The worker thread keeps running in the background; its results are discarded
+            deadline.mark_truncated(name)
+            candidates, status, error = [], "timeout", f"Timed out after {timeout:.1f}s"
+        except Exception as e:
+            candidates, status, error = [], "error", str(e)
+        source_span.set("status", status)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    candidates = candidates or []
+    logger.info(f"Source {name}: {status} in {elapsed_ms:.0f}ms with {len(candidates)} candidates")
+    source_status = SourceStatus(
+        source=name,
+        status=status,
+        elapsed_ms=round(elapsed_ms, 1),
+        candidate_count=len(candidates),
+        error=error
+    )
+    if progress:
+        progress("source_finished", source_status.dict())
+    return source_status, candidates
+
+
+async def fan_out_search(
+    nlp_output: dict,
+    sources: Optional[List[str]] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    deadline: Optional[Deadline] = None,
+    progress: Optional[ProgressCallback] = None,
+    tenant: Optional[str] = None
+) -> Tuple[List[CandidateProfile], List[SourceStatus]]:
+    """
+    Queries all search sources concurrently.
+    Returns the candidates from every source that finished in time, plus per-source status.
+    Each source gets min(its own timeout, the remaining request deadline).
+    Paid lookups are charged to `tenant` (default PROXYCURL_DEFAULT_TENANT).
+    """
+    deadline = ensure_deadline(deadline)
+    source_names = sources or list(SEARCH_SOURCES.keys())
+    unknown = [name for name in source_names if name not in SEARCH_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown search sources: {', '.join(unknown)}")
+
+    timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(timeouts or {})}
+    results = await asyncio.gather(*[
+        _run_source(name, SEARCH_SOURCES[name], nlp_output, timeouts.get(name, 30.0), deadline, progress, tenant)
+        for name in source_names
+    ])
+
+    candidates: List[CandidateProfile] = []
+    statuses: List[SourceStatus] = []
+    for status, source_candidates in results:
+        statuses.append(status)
+        candidates.extend(source_candidates)
+
+    # The same person often shows up on several sources; merge them into one profile
+    if len(statuses) > 1 and candidates:
+        resolver = EntityResolver()
+        with span("entity_resolution", profiles=len(candidates)):
+            candidates = resolver.resolve(candidates)
+        logger.info(f"Entity resolution: {resolver.last_stats}")
+    return candidates, statuses
+
+
+async def parse_talent_query(
+    query: str,
+    deadline: Optional[Deadline] = None,
+    progress: Optional[ProgressCallback] = None
+) -> ParseQueryResponse:
+    """
+    Parses a natural language query into structured search parameters.
+    Raises QueryParseError (or DeadlineExceeded) if the query can't be parsed in time.
+    """
+    from src.parser.main import parse_nlp_query
+
+    deadline = ensure_deadline(deadline)
+    if progress:
+        progress("parsing", {"query": query})
+    with span("parse_query"):
+        try:
+            parsed_nlp_output = await asyncio.to_thread(parse_nlp_query, query, deadline)
+            logger.info(f"NLP Parser output: {parsed_nlp_output.dict()}")
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            raise QueryParseError(str(e)) from e
+    if progress:
+        progress("parsed", parsed_nlp_output.dict())
+    return ParseQueryResponse(**parsed_nlp_output.dict())
+
+
+async def search_parsed_query(
+    parsed_query: ParseQueryResponse,
+    sources: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+    progress: Optional[ProgressCallback] = None,
+    tenant: Optional[str] = None
+) -> TalentSearchResponse:
+    """Fans an already-parsed query out to the sources, charging paid lookups to `tenant`."""
+    deadline = ensure_deadline(deadline)
+    search_params = SearchParams(**parsed_query.dict())
+    candidates, source_statuses = await fan_out_search(
+        search_params.dict(), sources=sources, deadline=deadline, progress=progress, tenant=tenant
+    )
+
+    logger.info(f"Found {len(candidates)} candidates across {len(source_statuses)} sources.")
+    return TalentSearchResponse(
+        query=parsed_query,
+        candidates=candidates,
+        sources=source_statuses,
+        truncated_stages=deadline.truncated_stages
+    )
+
+
+async def run_talent_search(
+    query: str,
+    sources: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+    progress: Optional[ProgressCallback] = None,
+    tenant: Optional[str] = None
+) -> TalentSearchResponse:
+    """
+    Full natural language talent search: parse the query, then fan out to the sources.
+    Used by the background job workers; the synchronous endpoint runs the two halves
+    itself so it can consult the result-set cache in between.
+    """
+    deadline = ensure_deadline(deadline)
+    parsed_query = await parse_talent_query(query, deadline, progress)
+    return await search_parsed_query(parsed_query, sources, deadline, progress, tenant)
@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from src.orchestrator import pipeline
+from src.orchestrator.batch_runner import BatchManifest, CheckpointedBatchRunner
+from src.orchestrator.pipeline import ResumeOrchestrator
+
+JD = "Senior Python engineer"
+
+
+def entry(file_hash, status="ok", **fields):
+    return {"file_sha256": file_hash, "path": f"{file_hash}.pdf", "status": status, **fields}
+
+
+def write_sink(output_dir, lines):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "results.jsonl"), "wb") as sink:
+        for line in lines:
+            sink.write(line if isinstance(line, bytes) else (json.dumps(line) + "\n").encode("utf-8"))
+
+
+def test_recovery_drops_a_torn_last_line(tmp_path):
+    write_sink(tmp_path, [entry("a"), entry("b", "failed", error="boom"), b'{"file_sha256": "c", "sta'])
+    manifest = BatchManifest(str(tmp_path), JD)
+    manifest.load()
+
+    assert set(manifest.items) == {"a", "b"}
+    assert manifest.is_done("a", retry_failed=True)
+    assert not manifest.is_done("b", retry_failed=True)
+    with open(manifest.sink_path, "rb") as sink:
+        assert sink.read().endswith(b"\n")
+    assert manifest.sink_bytes == os.path.getsize(manifest.sink_path)
+
+
+def test_recovery_replays_lines_after_the_last_checkpoint(tmp_path):
+    write_sink(tmp_path, [entry("a")])
+    manifest = BatchManifest(str(tmp_path), JD)
+    manifest.load()
+    manifest.checkpoint()
+    with open(manifest.sink_path, "ab") as sink:
+        sink.write((json.dumps(entry("b")) + "\n").encode("utf-8"))
+
+    reloaded = BatchManifest(str(tmp_path), JD)
+    reloaded.load()
+    assert set(reloaded.items) == {"a", "b"}
+    assert reloaded.items["a"]["attempts"] == 1
+
+
+def test_recovery_skips_a_complete_line_that_does_not_parse(tmp_path):
+    write_sink(tmp_path, [entry("a"), b"not json\n", b'{"no": "hash"}\n', entry("b")])
+    manifest = BatchManifest(str(tmp_path), JD)
+    manifest.load()
+
+    assert set(manifest.items) == {"a", "b"}
+    assert manifest.sink_bytes == os.path.getsize(manifest.sink_path)
+
+
+def test_failed_resume_stops_being_retried_after_max_attempts(tmp_path):
+    write_sink(tmp_path, [entry("a", "failed", error="boom")] * 2)
+    manifest = BatchManifest(str(tmp_path), JD)
+    manifest.load()
+
+    assert manifest.items["a"]["attempts"] == 2
+    assert not manifest.is_done("a", retry_failed=True, max_attempts=3)
+    assert manifest.is_done("a", retry_failed=True, max_attempts=2)
+
+
+def test_run_directory_is_tied_to_its_job_description(tmp_path):
+    manifest = BatchManifest(str(tmp_path), JD)
+    manifest.load()
+    manifest.checkpoint()
+    with pytest.raises(ValueError):
+        BatchManifest(str(tmp_path), "Another job").load()
+
+
+class CrashingOrchestrator(ResumeOrchestrator):
+    """Kills its worker process on resumes named crash*.pdf; no PDF parsing or lookups."""
+
+    def analyze_resume(self, resume_file):
+        if os.path.basename(resume_file).startswith("crash"):
+            os._exit(1)
+        return {"raw_text": "", "skills": ["python"]}, {"score": 1}, {"skills": ["python"]}
+
+    def fetch_linkedin_profile(self, nlp_query, session=None):
+        return None
+
+    def fetch_github_profile(self, nlp_query, session=None):
+        return None
+
+
+@pytest.fixture
+def resume_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "RESUME_PROCESS_WORKERS", 1)
+    paths = []
+    for name in ["crash.pdf", "ok.pdf"]:
+        path = tmp_path / name
+        path.write_bytes(name.encode("utf-8"))
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_continues_on_a_new_pool_after_a_worker_crash(resume_paths):
+    results = dict(CrashingOrchestrator().iter_resume_batch(resume_paths, JD, max_in_flight=1))
+
+    assert "error" in results[0]
+    assert results[1]["jd_analysis"]["matches"] == ["python"]
+
+
+def test_resume_that_keeps_crashing_is_skipped_after_max_attempts(tmp_path, resume_paths):
+    runner = CheckpointedBatchRunner(str(tmp_path / "run"), CrashingOrchestrator(), parallel=True, max_attempts=2)
+
+    assert runner.run(resume_paths[:1], JD)["failed"] == 1
+    assert runner.run(resume_paths[:1], JD)["failed"] == 1
+    assert runner.run(resume_paths[:1], JD)["skipped"] == 1
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.core.models import TalentSearchResponse
+from src.orchestrator import jobs
+from src.orchestrator.jobs import JobManager, JobQueueFull, SUCCEEDED
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    async def run_talent_search(query, sources=None, deadline=None, progress=None, tenant=None):
+        progress("parsing", {"query": query})
+        await asyncio.sleep(0.05)
+        return TalentSearchResponse()
+
+    monkeypatch.setattr(jobs, "run_talent_search", run_talent_search)
+
+
+def wait_until(predicate, timeout=5.0):
+    end = time.time() + timeout
+    while not predicate():
+        assert time.time() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_pending_limit_and_dedup(tmp_path, fake_search):
+    manager = JobManager(str(tmp_path), max_pending=2)
+    first, attached = manager.submit("python engineers")
+    assert not attached
+    assert manager.submit("Python   Engineers")[0].job_id == first.job_id
+    manager.submit("go engineers")
+    with pytest.raises(JobQueueFull):
+        manager.submit("rust engineers")
+    wait_until(lambda: manager.get(first.job_id).status == SUCCEEDED)
+    wait_until(lambda: manager._pending == 0)
+    manager.submit("rust engineers")
+    manager.shutdown()
+
+
+def test_finished_jobs_are_swept_after_retention(tmp_path, fake_search):
+    manager = JobManager(str(tmp_path), retention_seconds=0.1)
+    job, _ = manager.submit("python engineers")
+    wait_until(lambda: manager.get(job.job_id).status == SUCCEEDED)
+    assert os.listdir(tmp_path) == [f"{job.job_id}.json"]
+    time.sleep(0.15)
+    assert manager.sweep() == 1
+    assert manager.get(job.job_id) is None
+    assert manager.events_since(job.job_id, 0) == ([], None)
+    assert os.listdir(tmp_path) == []
+    manager.shutdown()
+
+
+def test_recover_requeues_unfinished_and_drops_expired(tmp_path, fake_search):
+    store = jobs.JobStore(str(tmp_path))
+    unfinished = jobs.TalentSearchJob(job_id="a", query="q1", dedup_key="k1", status=jobs.RUNNING, created_at=time.time())
+    old = jobs.TalentSearchJob(job_id="b", query="q2", dedup_key="k2", status=SUCCEEDED, created_at=0, finished_at=1)
+    for job in (unfinished, old):
+        store.save(job.job_id, job.json(), 0)
+
+    manager = JobManager(str(tmp_path), retention_seconds=60)
+    manager.recover()
+    assert manager.get("b") is None
+    wait_until(lambda: manager.get("a").status == SUCCEEDED)
+    assert sorted(os.listdir(tmp_path)) == ["a.json"]
+    manager.shutdown()
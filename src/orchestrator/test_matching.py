@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from src.orchestrator.matching import MatchingEngine, candidate_skills
+from src.orchestrator.pipeline import ResumeOrchestrator
+
+JOB_DESCRIPTIONS = [
+    "Senior Python engineer with Django, PostgreSQL and AWS.",
+    "Data scientist: python, pandas, machine learning, SQL.",
+    "Frontend developer, React, TypeScript, CSS.",
+    "Go or Rust backend, kubernetes, docker, aws.",
+    "",
+]
+SKILL_POOL = ["python", "django", "postgresql", "aws", "pandas", "sql", "react", "typescript", "css", "go", "rust",
+              "docker", "kubernetes", "java", "spark", "engineer", "backend"]
+
+
+def reference_analyze_jd(job_description, resume_data, linkedin_profile, github_profile):
+    """The original analyze_jd body, kept verbatim as the oracle (it takes dict sources only)."""
+    jd_text = job_description.lower()
+    # Aggregate candidate skills from all sources
+    candidate_skills = set()
+    for source in [resume_data, linkedin_profile, github_profile]:
+        if source and source.get("skills"):
+            candidate_skills.update([s.lower() for s in source["skills"]])
+    # Extract keywords from JD (simple split, can be improved)
+    jd_keywords = set([w.strip('.,') for w in jd_text.split() if len(w) > 2])
+    matches = candidate_skills & jd_keywords
+    gaps = jd_keywords - candidate_skills
+    fit_score = len(matches) / (len(jd_keywords) or 1)
+    return {
+        "matches": list(matches),
+        "gaps": list(gaps),
+        "fit_score": fit_score
+    }
+
+
+@pytest.fixture(scope="module")
+def resumes():
+    rng = random.Random(7)
+    return [
+        ({"skills": rng.sample(SKILL_POOL, rng.randint(0, 6))}, {"skills": [s.upper() for s in rng.sample(SKILL_POOL, 2)]}, None)
+        for _ in range(40)
+    ]
+
+
+def test_engine_matches_reference_for_every_pair(resumes):
+    result = MatchingEngine(JOB_DESCRIPTIONS).score(candidate_skills(*sources) for sources in resumes)
+
+    for resume_index, sources in enumerate(resumes):
+        for jd_index, job_description in enumerate(JOB_DESCRIPTIONS):
+            expected = reference_analyze_jd(job_description, *sources)
+            actual = result.analysis(resume_index, jd_index)
+            assert set(actual["matches"]) == set(expected["matches"])
+            assert set(actual["gaps"]) == set(expected["gaps"])
+            assert actual["fit_score"] == pytest.approx(expected["fit_score"])
+
+
+def test_analyze_jd_matches_reference(resumes):
+    orchestrator = ResumeOrchestrator()
+    for sources in resumes[:10]:
+        for job_description in JOB_DESCRIPTIONS:
+            actual = orchestrator.analyze_jd(job_description, *sources)
+            expected = reference_analyze_jd(job_description, *sources)
+            assert set(actual["matches"]) == set(expected["matches"])
+            assert set(actual["gaps"]) == set(expected["gaps"])
+            assert actual["fit_score"] == pytest.approx(expected["fit_score"])
+
+
+def test_top_jds_are_best_first_and_ties_keep_input_order():
+    engine = MatchingEngine(["python sql", "python java", "rust"], jd_ids=["a", "b", "c"])
+    top = engine.score([{"python"}]).top_jds(0, top_k=3)
+
+    assert [entry["jd_id"] for entry in top] == ["a", "b", "c"]
+    assert [entry["fit_score"] for entry in top] == [0.5, 0.5, 0.0]
+
+
+def test_jd_ids_must_line_up():
+    with pytest.raises(ValueError):
+        MatchingEngine(["python"], jd_ids=["a", "b"])
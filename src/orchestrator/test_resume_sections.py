@@ -0,0 +1,98 @@
+import re
+
+import pytest
+
+from src.orchestrator.resume_sections import ATS_REQUIRED_SECTIONS, RequiredFieldsTracker, SectionScanner, has_required_fields
+
+
+def test_tracker_stops_once_all_fields_are_seen():
+    tracker = RequiredFieldsTracker(SectionScanner())
+    pages = ["Jane Doe\njane@example.com"]
+    assert not tracker(pages)
+    pages.append("Phone: +1 555 123 4567\nExperience\nAcme")
+    assert not tracker(pages)
+    pages.append("Skills: Python, SQL")
+    assert tracker(pages)
+
+
+def test_tracker_only_scans_new_pages(monkeypatch):
+    scanner = SectionScanner()
+    tracker = RequiredFieldsTracker(scanner)
+    scanned = []
+    original = tracker._scan_page
+    monkeypatch.setattr(tracker, "_scan_page", lambda text: (scanned.append(text), original(text)))
+
+    pages = []
+    for page in ["one", "two", "three"]:
+        pages.append(page)
+        tracker(pages)
+
+    assert scanned == ["one", "two", "three"]
+
+
+def test_skills_section_continuing_on_the_next_page():
+    tracker = RequiredFieldsTracker(SectionScanner())
+    pages = ["jane@example.com +1 555 123 4567\nSkills\n"]
+    assert not tracker(pages)
+    pages.append("Python, SQL")
+    assert tracker(pages)
+
+
+def test_empty_skills_section_does_not_count():
+    assert not has_required_fields(["jane@example.com +1 555 123 4567\nSkills:\nEducation\nMIT"])
+
+
+# The regexes and checks SectionScanner replaced, kept as the oracle
+OLD_EMAIL = re.compile(r"[\w\.-]+@[\w\.-]+")
+OLD_PHONE = re.compile(r"(\+?\d[\d\s\-]{7,}\d)")
+OLD_SKILLS = re.compile(r"skills[:\-\s]*([\w,\s]+)", re.IGNORECASE)
+
+WELL_FORMED_RESUMES = [
+    "Jane Doe\njane.doe@example.com\n+1 555-123-4567\n\nExperience\nAcme Corp, engineer\n\n"
+    "Education\nMIT\n\nSkills: Python, SQL, Docker\n",
+    "John Smith\nPhone: 0044 20 7946 0958\njohn@mail.example.org\nEducation\nOxford\n"
+    "Work Experience\nGlobex\nSkills - Go, Rust, Kubernetes",
+    "No contact details here\nSkills: leadership, project management",
+]
+
+
+def old_scan(text):
+    email, phone, skills = OLD_EMAIL.search(text), OLD_PHONE.search(text), OLD_SKILLS.search(text)
+    return {
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None,
+        "skills": [s.strip() for s in skills.group(1).split(",") if s.strip()] if skills else [],
+        "sections": {s for s in ATS_REQUIRED_SECTIONS if s in text.lower()},
+    }
+
+
+@pytest.mark.parametrize("text", WELL_FORMED_RESUMES)
+def test_scanner_agrees_with_old_regexes_on_well_formed_resumes(text):
+    expected = old_scan(text)
+    scan = SectionScanner().scan(text)
+
+    assert scan.email == expected["email"]
+    assert scan.phone == expected["phone"]
+    assert scan.skills() == expected["skills"]
+    assert set(scan.sections) & set(ATS_REQUIRED_SECTIONS) == expected["sections"]
+
+
+def test_section_words_inside_sentences_are_not_headings():
+    text = "Jane Doe\nI gained experience in education technology.\nSkills: Python"
+    scan = SectionScanner().scan(text)
+
+    assert old_scan(text)["sections"] == {"education", "experience", "skills"}
+    assert set(scan.sections) == {"skills"}
+
+
+def test_skills_split_on_bullets_and_lines():
+    scan = SectionScanner().scan("Skills\n• Python\n• Machine Learning\nSQL; Spark\nEducation\nMIT")
+
+    assert scan.skills() == ["Python", "Machine Learning", "SQL", "Spark"]
+
+
+def test_keyword_hits_match_substring_checks():
+    keywords = ["python", "machine learning", "project", "leadership"]
+    text = "Led a Machine Learning PROJECT in python"
+
+    assert SectionScanner(ats_keywords=keywords).keyword_hits(text) == {kw for kw in keywords if kw in text.lower()}
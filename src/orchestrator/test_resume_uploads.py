@@ -0,0 +1,46 @@
+import asyncio
+import json
+import time
+
+from src.orchestrator.resume_uploads import SpooledBatch, stream_resume_batch
+
+
+class SteadyOrchestrator:
+    """Finishes one resume every `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.last_batch_stats = {}
+
+    def iter_resume_batch(self, paths, job_description):
+        for index, _ in enumerate(paths):
+            time.sleep(self.delay)
+            yield index, {"resume_data": {"raw_text": "text", "name": "x"}}
+
+
+def collect(orchestrator, count, progress_interval):
+    batch = SpooledBatch()
+    batch.entries = [(f"{i}.pdf", f"/unused/{i}.pdf") for i in range(count)]
+
+    async def run():
+        return [json.loads(line) async for line in stream_resume_batch(orchestrator, batch, "jd", progress_interval=progress_interval)]
+
+    return asyncio.run(run())
+
+
+def test_progress_is_sent_while_results_keep_arriving():
+    events = collect(SteadyOrchestrator(0.02), count=15, progress_interval=0.1)
+    kinds = [event["event"] for event in events]
+
+    assert kinds[0] == "started" and kinds[-1] == "finished"
+    assert kinds.count("result") == 15
+    # Results arrive every 20ms, well inside the interval, yet progress still goes out
+    assert kinds.count("progress") >= 2
+
+
+def test_raw_text_is_dropped_unless_requested():
+    events = collect(SteadyOrchestrator(0), count=2, progress_interval=5)
+    results = [event for event in events if event["event"] == "result"]
+
+    assert [r["filename"] for r in results] == ["0.pdf", "1.pdf"]
+    assert all("raw_text" not in r["resume_data"] for r in results)
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main_app
+from src.core import tenants
+from src.core.models import CandidateProfile, ParseQueryResponse
+from src.core.result_cache import ResultSetCache
+from src.orchestrator import talent_search
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def parse(query, deadline=None, progress=None):
+        return ParseQueryResponse(intent="find_candidates", title="Backend Engineer", skills=["Python"])
+
+    cache = ResultSetCache(ttl_seconds=900, max_bytes=1024 * 1024)
+    monkeypatch.setattr(main_app, "parse_talent_query", parse)
+    monkeypatch.setattr(main_app, "get_result_cache", lambda: cache)
+    return TestClient(main_app.app)
+
+
+def test_failing_source_is_reported_and_not_cached_as_complete(client, monkeypatch):
+    calls = []
+
+    def broken(nlp_output, deadline, tenant=None):
+        calls.append("linkedin")
+        raise RuntimeError("Proxycurl unavailable")
+
+    def working(nlp_output, deadline, tenant=None):
+        calls.append("github")
+        return [CandidateProfile(name="Jane Doe", github_username="jane")]
+
+    monkeypatch.setitem(talent_search.SEARCH_SOURCES, "github", working)
+    monkeypatch.setitem(talent_search.SEARCH_SOURCES, "linkedin", broken)
+
+    body = client.post("/talent_search", json={"query": "python engineers"}).json()
+    statuses = {source["source"]: source for source in body["sources"]}
+    assert statuses["linkedin"]["status"] == "error"
+    assert "Proxycurl unavailable" in statuses["linkedin"]["error"]
+    assert statuses["github"]["status"] == "ok"
+
+    # Not a complete result set: the same query runs the sources again
+    client.post("/talent_search", json={"query": "python engineers"})
+    assert calls.count("linkedin") == 2
+
+
+def test_searches_are_charged_to_the_api_keys_tenant(client, monkeypatch):
+    charged = []
+
+    def source(nlp_output, deadline, tenant=None):
+        charged.append(tenant)
+        return []
+
+    monkeypatch.setattr(tenants, "TENANT_API_KEYS", {"k1": "acme"})
+    monkeypatch.setitem(talent_search.SEARCH_SOURCES, "linkedin", source)
+
+    # The tenant comes from the key, never from a header the caller can set freely
+    response = client.post("/talent_search?sources=linkedin", json={"query": "q"}, headers={"X-Tenant-Id": "acme"})
+    assert response.status_code == 401
+    assert client.post("/talent_search?sources=linkedin", json={"query": "q"}, headers={"X-Api-Key": "k1"}).status_code == 200
+    assert charged == ["acme"]
+
+
+def test_missing_github_token_is_an_error(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setattr("src.core.replay.get_service_replay", lambda service: None)
+
+    with pytest.raises(talent_search.SourceUnavailable):
+        talent_search._github_source({"intent": "find_candidates"}, deadline=None)
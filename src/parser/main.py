@@ -1,4 +1,8 @@
+from functools import lru_cache
+from typing import Optional
 from fastapi import FastAPI, HTTPException
+from src.core.deadline import Deadline
+from src.core.metrics import LLM_PARSES
 from src.parser.models import ParseQueryRequest, ParseQueryResponse
 from src.parser.parsing_agent.llm_parser import LLMParserAgent
 from src.parser.parsing_agent.groq_client import OpenRouterClient
@@ -10,14 +14,30 @@ load_dotenv()
 
 app = FastAPI()
 
-openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
-llm_agent = LLMParserAgent(OpenRouterClient(api_key=openrouter_api_key))
+@lru_cache(maxsize=None)
+def get_llm_agent() -> LLMParserAgent:
+    """The parser agent, built on first use rather than at import time."""
+    openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+    structured_output = os.getenv("NLP_STRUCTURED_OUTPUT", "true").lower() != "false"
+    return LLMParserAgent(OpenRouterClient(api_key=openrouter_api_key), structured_output=structured_output)
+
+def parse_nlp_query(query: str, deadline: Optional[Deadline] = None) -> ParseQueryResponse:
+    """Parses and validates a natural language query, bounded by an optional request deadline."""
+    parsed = get_llm_agent().parse(query, deadline=deadline)
+    validated = Validator.validate(parsed)
+    return ParseQueryResponse(**validated)
 
 @app.post("/parse-query", response_model=ParseQueryResponse)
 def parse_query(request: ParseQueryRequest):
     try:
-        parsed = llm_agent.parse(request.query)
-        validated = Validator.validate(parsed)
-        return ParseQueryResponse(**validated)
+        return parse_nlp_query(request.query)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/stats")
+def parse_stats():
+    """Parse outcome counters (from the hireai_llm_parse_total metric), including how often JSON repair was needed."""
+    stats = {outcome: int(LLM_PARSES.labels(outcome).value) for outcome in ("clean", "repaired", "failed")}
+    stats["parses"] = sum(stats.values())
+    stats["repair_rate"] = stats["repaired"] / stats["parses"] if stats["parses"] else 0.0
+    return stats
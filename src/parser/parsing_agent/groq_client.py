@@ -1,28 +1,81 @@
+import logging
 import os
-from openai import OpenAI
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
 
 class OpenRouterClient:
+    DEFAULT_TIMEOUT = 30.0  # seconds
+
     def __init__(self, api_key: str, model: str = "google/gemma-3-4b-it:free"):
         self.api_key = api_key
         self.model = model
-        self.base_url = "https://openrouter.ai/api/v1"
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key,
-        )
+        self.base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        self._client = None
+        # Flipped off the first time the model rejects response_format
+        self.supports_response_format = True
+
+    @property
+    def client(self):
+        """The OpenAI SDK client, built on first use (importing the SDK dominates cold start)."""
+        if self._client is None:
+            from openai import OpenAI
+            from src.core.replay import get_service_replay, httpx_transport
+            options = {}
+            api_key = self.api_key
+            if get_service_replay("openrouter") is not None:
+                # Recorded or replayed through the HTTP replay transport; replay needs no real key
+                import httpx
+                options["http_client"] = httpx.Client(transport=httpx_transport("openrouter"))
+                api_key = api_key or "replay"
+            self._client = OpenAI(
+                base_url=self.base_url,
+                api_key=api_key,
+                timeout=self.DEFAULT_TIMEOUT,
+                **options
+            )
+        return self._client
 
-    def complete(self, prompt: str) -> str:
+    def complete(
+        self,
+        prompt: str,
+        response_format: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        started = time.monotonic()
         messages = [
             {"role": "user", "content": prompt}
         ]
+        kwargs = {}
+        if response_format and self.supports_response_format:
+            kwargs["response_format"] = response_format
+        client = self.client
+        if timeout is not None:
+            # The SDK's own retries would overrun a caller deadline
+            client = self.client.with_options(timeout=timeout, max_retries=0)
         try:
-            completion = self.client.chat.completions.create(
+            completion = client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=0.0,
-                max_tokens=512
+                max_tokens=512,
+                **kwargs
             )
             return completion.choices[0].message.content
         except Exception as e:
-            print(f"OpenRouter API error: {e}")
+            from openai import BadRequestError
+            if isinstance(e, BadRequestError) and "response_format" in kwargs:
+                # Model doesn't support structured output; remember and fall back to plain prompting
+                logger.warning(f"Model {self.model} rejected response_format, falling back to plain JSON prompting: {e}")
+                self.supports_response_format = False
+                if timeout is None:
+                    return self.complete(prompt)
+                # The retry gets only what is left of the caller's timeout
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    from src.core.deadline import DeadlineExceeded
+                    raise DeadlineExceeded("No time left to retry without response_format") from e
+                return self.complete(prompt, timeout=remaining)
+            logger.error(f"OpenRouter API error: {e}")
             raise
@@ -0,0 +1,114 @@
+import json
+import re
+from typing import Optional
+
+# Precompiled patterns used by repair_json
+_FENCED_BLOCK = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+# A double-quoted string (kept as is) or a bare Python literal outside one
+_BARE_LITERAL = re.compile(r'"(?:\\.|[^"\\])*"|\b(True|False|None)\b')
+
+
+def extract_json_block(text: str) -> str:
+    """
+    Pulls the JSON object out of an LLM response.
+    Handles markdown code fences and prose before/after the object.
+    """
+    fenced = _FENCED_BLOCK.search(text)
+    if fenced:
+        text = fenced.group(1)
+    text = text.strip()
+
+    # Cut away any prose around the outermost object
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end > start:
+        return text[start:end + 1]
+    if start != -1:
+        # Truncated response: keep what we have and let the balancer close it
+        return text[start:]
+    return text
+
+
+def _swap_single_quotes(text: str) -> str:
+    """Converts single-quoted strings to double-quoted ones, leaving apostrophes inside double quotes alone."""
+    out = []
+    in_double = False
+    in_single = False
+    escaped = False
+    for ch in text:
+        if escaped:
+            out.append(ch)
+            escaped = False
+            continue
+        if ch == "\\":
+            out.append(ch)
+            escaped = True
+            continue
+        if ch == '"' and not in_single:
+            in_double = not in_double
+            out.append(ch)
+        elif ch == "'" and not in_double:
+            in_single = not in_single
+            out.append('"')
+        elif ch == '"' and in_single:
+            out.append('\\"')
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _balance_brackets(text: str) -> str:
+    """Closes any strings, arrays or objects left open by a truncated response."""
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if escaped:
+            escaped = False
+            continue
+        if ch == "\\":
+            escaped = True
+            continue
+        if ch == '"':
+            in_string = not in_string
+        elif not in_string:
+            if ch in "{[":
+                stack.append("}" if ch == "{" else "]")
+            elif ch in "}]" and stack:
+                stack.pop()
+    if in_string:
+        text += '"'
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    Applies cheap, local fixes to a malformed JSON string.
+    Returns the repaired string, or None if nothing could be salvaged.
+    """
+    candidate = extract_json_block(text)
+    if not candidate:
+        return None
+
+    if "'" in candidate:
+        candidate = _swap_single_quotes(candidate)
+    candidate = _BARE_LITERAL.sub(lambda m: _PYTHON_LITERALS[m.group(1)] if m.group(1) else m.group(0), candidate)
+    candidate = _balance_brackets(candidate)
+    candidate = _TRAILING_COMMA.sub(r"\1", candidate)
+    return candidate
+
+
+def loads_with_repair(text: str):
+    """
+    Parses JSON, falling back to repair_json on failure.
+    Returns a (value, repaired) tuple and raises json.JSONDecodeError if repair fails too.
+    """
+    try:
+        return json.loads(extract_json_block(text)), False
+    except json.JSONDecodeError as original_error:
+        repaired = repair_json(text)
+        if repaired is None:
+            raise original_error
+        return json.loads(repaired), True
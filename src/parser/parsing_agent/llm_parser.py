@@ -1,28 +1,65 @@
 import json
-import re
+import logging
+from typing import Optional
+
+from src.core.deadline import Deadline
+from src.core.metrics import LLM_PARSES, STAGE_LATENCY
+from src.core.tracing import span
+from src.parser.models import ParseQueryResponse
+from src.parser.parsing_agent.json_repair import loads_with_repair
+
+logger = logging.getLogger(__name__)
 
 class LLMParserAgent:
-    def __init__(self, groq_client):
+    def __init__(self, groq_client, structured_output: bool = True):
         self.groq_client = groq_client
+        self.structured_output = structured_output
+
+    def _count(self, outcome: str):
+        LLM_PARSES.labels(outcome).inc()
+
+    @staticmethod
+    def build_response_format() -> dict:
+        """JSON schema response_format derived from ParseQueryResponse."""
+        schema = ParseQueryResponse.schema()
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "parse_query_response",
+                "strict": False,
+                "schema": schema,
+            },
+        }
 
     def build_prompt(self, query: str) -> str:
         return f"""You are an AI recruiter assistant. Convert the following user query into structured hiring parameters.\n\nInput:\n\"{query}\"\n\nReturn a JSON object with the following fields:\n- intent\n- title\n- skills\n- experience_level\n- location\n- work_type\n\nBe strict about formatting. Only return valid JSON.\n\nOutput:"""
 
-    def parse(self, query: str) -> dict:
+    def parse(self, query: str, deadline: Optional[Deadline] = None) -> dict:
+        with STAGE_LATENCY.labels("llm_parse").time(), span("llm_parser.parse"):
+            return self._parse(query, deadline)
+
+    def _parse(self, query: str, deadline: Optional[Deadline]) -> dict:
         prompt = self.build_prompt(query)
-        llm_response = self.groq_client.complete(prompt)
-        
-        # Attempt to extract JSON from a markdown code block first
-        json_match = re.search(r"```json\n(.*?)```", llm_response, re.DOTALL)
-        if json_match:
-            json_string = json_match.group(1)
-        else:
-            # If no markdown block, assume the whole response is JSON
-            json_string = llm_response.strip()
+        kwargs = {}
+        if self.structured_output:
+            kwargs["response_format"] = self.build_response_format()
+        if deadline is not None:
+            deadline.check("nlp_parse")
+            kwargs["timeout"] = deadline.timeout(getattr(self.groq_client, "DEFAULT_TIMEOUT", 30.0))
+        with span("llm.complete", model=getattr(self.groq_client, "model", None), structured=self.structured_output) as llm_span:
+            llm_response = self.groq_client.complete(prompt, **kwargs)
+            llm_span.set("response_chars", len(llm_response or ""))
 
         try:
-            return json.loads(json_string)
+            parsed, repaired = loads_with_repair(llm_response or "")
         except json.JSONDecodeError as e:
-            print(f"Error parsing JSON from LLM response: {e}")
-            print(f"Problematic JSON string: \n---\n{json_string}\n---")
-            raise ValueError(f"Failed to parse LLM response as JSON: {e}") 
\ No newline at end of file
+            self._count("failed")
+            logger.error(f"Error parsing JSON from LLM response: {e}", extra={"llm_response": llm_response})
+            raise ValueError(f"Failed to parse LLM response as JSON: {e}")
+
+        if not isinstance(parsed, dict):
+            self._count("failed")
+            raise ValueError(f"LLM response is not a JSON object: {type(parsed).__name__}")
+
+        self._count("repaired" if repaired else "clean")
+        return parsed
@@ -0,0 +1,70 @@
+import httpx
+import pytest
+from openai import BadRequestError
+
+from src.core.deadline import DeadlineExceeded
+from src.parser.parsing_agent import groq_client
+from src.parser.parsing_agent.groq_client import OpenRouterClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeCompletions:
+    """Rejects response_format after `cost` seconds; answers plain prompts."""
+
+    def __init__(self, clock, cost):
+        self.clock = clock
+        self.cost = cost
+        self.timeouts = []
+
+    def create(self, response_format=None, **kwargs):
+        if response_format is not None:
+            self.clock.now += self.cost
+            response = httpx.Response(400, request=httpx.Request("POST", "https://openrouter.test"))
+            raise BadRequestError("response_format not supported", response=response, body=None)
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": type("Message", (), {"content": "{}"})})]})
+
+
+class FakeClient:
+    def __init__(self, completions):
+        self.completions = completions
+        self.chat = self
+
+    def with_options(self, timeout, max_retries):
+        self.completions.timeouts.append(timeout)
+        return self
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(groq_client.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def make_client(clock, cost):
+    client = OpenRouterClient(api_key="test")
+    client._client = FakeClient(FakeCompletions(clock, cost))
+    return client
+
+
+def test_fallback_gets_only_the_remaining_timeout(clock):
+    client = make_client(clock, cost=7)
+
+    assert client.complete("prompt", response_format={"type": "json_object"}, timeout=10) == "{}"
+    assert client._client.completions.timeouts == [10, pytest.approx(3)]
+    assert not client.supports_response_format
+
+
+def test_fallback_is_skipped_once_the_timeout_is_spent(clock):
+    client = make_client(clock, cost=12)
+
+    with pytest.raises(DeadlineExceeded):
+        client.complete("prompt", response_format={"type": "json_object"}, timeout=10)
+    assert client._client.completions.timeouts == [10]
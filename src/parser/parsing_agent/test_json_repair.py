@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from src.parser.parsing_agent.json_repair import extract_json_block, loads_with_repair, repair_json
+
+
+def test_clean_json_is_not_repaired():
+    assert loads_with_repair('{"intent": "find_candidates"}') == ({"intent": "find_candidates"}, False)
+
+
+def test_extracts_object_from_fence_and_prose():
+    text = 'Here you go:\n```json\n{"title": "Data Engineer"}\n```\nLet me know!'
+    assert extract_json_block(text) == '{"title": "Data Engineer"}'
+    assert loads_with_repair(text) == ({"title": "Data Engineer"}, False)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"skills": ["Python", "SQL",],}', {"skills": ["Python", "SQL"]}),
+    ("{'title': 'ML Engineer', 'location': 'Berlin'}", {"title": "ML Engineer", "location": "Berlin"}),
+    ('{"remote": True, "visa": False, "level": None}', {"remote": True, "visa": False, "level": None}),
+    ('{"skills": ["Python", "Go"', {"skills": ["Python", "Go"]}),
+    ('{"title": "Data Sci', {"title": "Data Sci"}),
+])
+def test_repairs(text, expected):
+    assert loads_with_repair(text) == (expected, True)
+
+
+def test_literals_inside_strings_are_left_alone():
+    parsed, repaired = loads_with_repair('{"title": "None of the above", "note": "True North", "remote": True,}')
+    assert repaired
+    assert parsed == {"title": "None of the above", "note": "True North", "remote": True}
+
+
+def test_apostrophes_inside_double_quotes_survive():
+    parsed, _ = loads_with_repair('{"title": "Engineer\'s lead", "x": 1,}')
+    assert parsed["title"] == "Engineer's lead"
+
+
+def test_unsalvageable_input_raises():
+    assert repair_json("") is None
+    with pytest.raises(json.JSONDecodeError):
+        loads_with_repair("no json here")
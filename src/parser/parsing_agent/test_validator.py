@@ -0,0 +1,32 @@
+from src.parser.parsing_agent.validator import DEFAULT_INTENT, Validator
+
+
+def test_missing_intent_gets_the_default():
+    assert DEFAULT_INTENT == "find_candidates"
+    assert Validator.validate({"title": "SRE"})["intent"] == "find_candidates"
+    assert Validator.validate("not a dict")["intent"] == "find_candidates"
+
+
+def test_comma_separated_string_becomes_a_list():
+    assert Validator.validate({"intent": "find_candidates", "skills": "LangChain, RAG; Python"})["skills"] == ["LangChain", "RAG", "Python"]
+
+
+def test_scalars_and_lists_are_coerced_to_the_schema():
+    validated = Validator.validate({
+        "intent": "find_candidates",
+        "title": ["Data", "Engineer"],
+        "skills": "Python",
+        "experience_level": 5,
+        "location": {"city": "Berlin"},
+    })
+    assert validated["title"] == "Data, Engineer"
+    assert validated["skills"] == ["Python"]
+    assert validated["experience_level"] == "5"
+    assert validated["location"] == "Berlin"
+
+
+def test_blank_values_and_unknown_keys_are_dropped():
+    validated = Validator.validate({"intent": "find_candidates", "title": "  ", "skills": [None, " "], "salary": 100})
+    assert validated["title"] is None
+    assert validated["skills"] is None
+    assert "salary" not in validated
@@ -1,13 +1,89 @@
-from typing import Dict
+import re
+from typing import Any, Dict, Set
+
+from src.parser.models import ParseQueryResponse
 
 REQUIRED_FIELDS = ["intent"]
+DEFAULT_INTENT = "find_candidates"
+
+_LIST_SEPARATORS = re.compile(r"\s*[,;]\s*")
+
+
+def _allowed_types(property_schema: Dict) -> Set[str]:
+    """Collects the JSON types a schema property accepts (handles anyOf/Optional)."""
+    if "anyOf" in property_schema:
+        types = set()
+        for option in property_schema["anyOf"]:
+            types |= _allowed_types(option)
+        return types
+    schema_type = property_schema.get("type")
+    if isinstance(schema_type, list):
+        return set(schema_type)
+    return {schema_type} if schema_type else set()
+
+
+# Allowed JSON types per response field, derived once from the response model
+FIELD_TYPES: Dict[str, Set[str]] = {
+    name: _allowed_types(prop)
+    for name, prop in ParseQueryResponse.schema()["properties"].items()
+}
+
 
 class Validator:
+    @staticmethod
+    def _coerce_value(value: Any, allowed: Set[str]) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                return None
+            if "string" in allowed:
+                return value
+            if "array" in allowed:
+                # e.g. "LangChain, RAG" where a list was expected
+                return [part for part in _LIST_SEPARATORS.split(value) if part]
+            return value
+        if isinstance(value, (list, tuple)):
+            items = [str(item).strip() for item in value if item is not None and str(item).strip()]
+            if "array" in allowed:
+                return items or None
+            if "string" in allowed:
+                return ", ".join(items) or None
+            return items
+        if isinstance(value, (int, float, bool)):
+            if "string" in allowed:
+                return str(value)
+            if "array" in allowed:
+                return [str(value)]
+        if isinstance(value, dict) and "string" in allowed:
+            # Nested objects like {"city": "Berlin"}: keep the first scalar
+            for nested in value.values():
+                if isinstance(nested, str) and nested.strip():
+                    return nested.strip()
+            return None
+        return value
+
+    @staticmethod
+    def coerce(parsed: Dict) -> Dict:
+        """
+        Type-coerces LLM output against the ParseQueryResponse schema.
+        Unknown keys are dropped so the response model never rejects them.
+        """
+        coerced = {}
+        for field, allowed in FIELD_TYPES.items():
+            coerced[field] = Validator._coerce_value(parsed.get(field), allowed)
+        return coerced
+
     @staticmethod
     def validate(parsed: Dict) -> Dict:
+        if not isinstance(parsed, dict):
+            parsed = {}
+        parsed = Validator.coerce(parsed)
         # Ensure required fields are present
         for field in REQUIRED_FIELDS:
             if field not in parsed or not parsed[field]:
                 parsed[field] = None
-        # Optionally, add more checks here
-        return parsed 
\ No newline at end of file
+        if parsed["intent"] is None:
+            parsed["intent"] = DEFAULT_INTENT
+        return parsed